@@ -0,0 +1,109 @@
+"""
+audio_cache.py — In-memory LRU cache of synthesized audio.
+
+Agents repeat many short phrases ("Done.", "All tests pass."). The synthesis
+stage looks each sentence up here before resolving an engine; a hit skips
+synthesis entirely and the cached clip goes straight to playback.
+
+KEY:
+(engine, model, voice, speed, text) — everything that changes the synthesized
+samples. Volume is NOT part of the key; it is applied at playback time.
+
+EVICTION:
+Bounded by total sample bytes, not entry count — one long paragraph can
+outweigh hundreds of one-word clips. Least recently used entries are evicted
+first until the total fits max_bytes. A max_bytes of 0 disables the cache.
+
+Cached arrays are marked read-only so a consumer cannot corrupt the entry
+in place; playback scaling (samples * volume) already produces a new array.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+CacheKey = tuple  # (engine, model, voice, speed, text)
+
+
+class AudioCache:
+    """
+    Thread-safe byte-bounded LRU cache of (samples, sample_rate) clips.
+
+    Args:
+        max_bytes: Upper bound on the summed nbytes of cached sample arrays.
+    """
+
+    def __init__(self, max_bytes: int):
+        self._entries: OrderedDict[CacheKey, tuple[np.ndarray, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_bytes = max(0, int(max_bytes))
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    def resize(self, max_bytes: int) -> None:
+        """Change the byte limit, evicting LRU entries if the cache no longer fits."""
+        with self._lock:
+            self._max_bytes = max(0, int(max_bytes))
+            self._evict_locked()
+
+    def get(self, key: CacheKey) -> tuple[np.ndarray, int] | None:
+        """Return the cached (samples, rate) for key and mark it recently used, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: CacheKey, samples: np.ndarray, rate: int) -> None:
+        """Insert or refresh a clip. Clips larger than max_bytes are not cached."""
+        samples = np.asarray(samples)
+        if samples.nbytes > self._max_bytes:
+            return
+        samples = samples.view()
+        samples.setflags(write=False)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[0].nbytes
+            self._entries[key] = (samples, int(rate))
+            self._bytes += samples.nbytes
+            self._evict_locked()
+
+    def __contains__(self, key: CacheKey) -> bool:
+        """Membership test that does not touch LRU order or hit/miss counters."""
+        with self._lock:
+            return key in self._entries
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _evict_locked(self) -> None:
+        while self._bytes > self._max_bytes and self._entries:
+            _key, (samples, _rate) = self._entries.popitem(last=False)
+            self._bytes -= samples.nbytes
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        """Counters and occupancy for GET /stats."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self._max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
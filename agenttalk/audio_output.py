@@ -0,0 +1,248 @@
+"""
+audio_output.py — Long-lived PortAudio output stream fed from a ring buffer.
+
+Replaces per-sentence sd.play()/sd.wait() calls, each of which opened and tore
+down a PortAudio stream (tens of milliseconds per sentence, plus an audible
+click at every sentence boundary). One sd.OutputStream stays open across
+utterances; its callback pulls mono float32 frames from a _RingBuffer that the
+playback stage writes into.
+
+SAMPLE RATE:
+The stream runs at the rate of the audio being played. Kokoro (24000 Hz) and
+Piper (22050 Hz) differ, so play() drains and reopens the stream when the rate
+changes — this only happens on an engine switch, never between sentences.
+
+UNDERRUNS:
+An underrun is counted when the callback runs short of frames while a clip is
+still being written (audible gap mid-utterance), or when PortAudio reports
+output_underflow. Silence between utterances is not an underrun.
+
+sounddevice is imported lazily in _open() so the ring buffer logic can be
+exercised without a PortAudio installation.
+"""
+import logging
+import threading
+
+import numpy as np
+
+
+class _RingBuffer:
+    """
+    Fixed-capacity single-channel float32 ring buffer.
+
+    write() blocks while the buffer is full; read_into() never blocks (it runs
+    inside the PortAudio callback). clear() discards buffered audio and wakes
+    any blocked writer so an in-progress write can be abandoned.
+    """
+
+    def __init__(self, capacity: int):
+        self._buf = np.zeros(capacity, dtype=np.float32)
+        self._capacity = capacity
+        self._read = 0
+        self._size = 0
+        self._generation = 0  # bumped by clear() to abort in-progress writes
+        self._cond = threading.Condition()
+
+    @property
+    def buffered(self) -> int:
+        """Frames currently buffered and not yet consumed by the callback."""
+        with self._cond:
+            return self._size
+
+    def write(self, data: np.ndarray) -> bool:
+        """
+        Append all of data, blocking while the buffer is full.
+
+        Returns False if clear() was called before the write finished
+        (the remainder is discarded), True otherwise.
+        """
+        data = np.asarray(data, dtype=np.float32).reshape(-1)
+        offset = 0
+        with self._cond:
+            generation = self._generation
+            while offset < len(data):
+                while self._size == self._capacity:
+                    self._cond.wait()
+                    if self._generation != generation:
+                        return False
+                if self._generation != generation:
+                    return False
+                n = min(len(data) - offset, self._capacity - self._size)
+                start = (self._read + self._size) % self._capacity
+                first = min(n, self._capacity - start)
+                self._buf[start:start + first] = data[offset:offset + first]
+                if first < n:
+                    self._buf[:n - first] = data[offset + first:offset + n]
+                self._size += n
+                offset += n
+        return True
+
+    def read_into(self, out: np.ndarray) -> int:
+        """Copy up to len(out) frames into out; return the number copied."""
+        with self._cond:
+            n = min(len(out), self._size)
+            if n:
+                first = min(n, self._capacity - self._read)
+                out[:first] = self._buf[self._read:self._read + first]
+                if first < n:
+                    out[first:n] = self._buf[:n - first]
+                self._read = (self._read + n) % self._capacity
+                self._size -= n
+                self._cond.notify_all()
+            return n
+
+    def wait_below(self, frames: int, timeout: float | None = None) -> bool:
+        """Block until at most `frames` frames remain buffered. Returns False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._size <= frames, timeout=timeout)
+
+    def clear(self) -> None:
+        """Discard all buffered frames and abort blocked writers."""
+        with self._cond:
+            self._read = 0
+            self._size = 0
+            self._generation += 1
+            self._cond.notify_all()
+
+
+class AudioOutput:
+    """
+    Persistent mono output stream with gapless back-to-back playback.
+
+    Args:
+        blocksize: Frames per PortAudio callback (0 lets PortAudio choose).
+        latency:   PortAudio suggested latency — 'low', 'high', or seconds.
+        buffer_seconds: Ring buffer capacity. Writers block once it is full,
+                        so this bounds memory, not clip length.
+    """
+
+    def __init__(
+        self,
+        blocksize: int = 1024,
+        latency: str | float = "low",
+        buffer_seconds: float = 2.0,
+    ):
+        self.blocksize = int(blocksize)
+        self.latency = latency
+        self._buffer_seconds = buffer_seconds
+        self._ring: _RingBuffer | None = None
+        self._stream = None
+        self._rate: int | None = None
+        self._lock = threading.Lock()  # serialises open/close against play()
+        self._writing = False
+        self.underruns = 0
+        self.stream_opens = 0
+
+    # ------------------------------------------------------------------
+    # Stream lifecycle
+    # ------------------------------------------------------------------
+
+    def _open(self, rate: int) -> None:
+        """Open (or reopen at a new rate) the output stream. Caller holds _lock."""
+        import sounddevice as sd  # deferred — keeps _RingBuffer importable without PortAudio
+
+        self._close_stream()
+        self._ring = _RingBuffer(max(int(rate * self._buffer_seconds), self.blocksize * 4, 1024))
+        self._stream = sd.OutputStream(
+            samplerate=rate,
+            channels=1,
+            dtype="float32",
+            blocksize=self.blocksize,
+            latency=self.latency,
+            callback=self._callback,
+        )
+        self._stream.start()
+        self._rate = rate
+        self.stream_opens += 1
+        logging.info(
+            "Audio output stream opened (rate=%d, blocksize=%d, latency=%s).",
+            rate, self.blocksize, self.latency,
+        )
+
+    def _close_stream(self) -> None:
+        if self._stream is None:
+            return
+        try:
+            self._stream.stop()
+            self._stream.close()
+        except Exception:
+            logging.warning("Closing audio output stream failed.", exc_info=True)
+        self._stream = None
+        self._rate = None
+
+    def close(self) -> None:
+        """Stop and close the stream. The next play() reopens it."""
+        with self._lock:
+            if self._ring is not None:
+                self._ring.clear()
+            self._close_stream()
+
+    def _callback(self, outdata, frames, time_info, status) -> None:
+        """PortAudio callback — runs on the audio thread; must never block."""
+        if status.output_underflow:
+            self.underruns += 1
+        ring = self._ring
+        out = outdata[:, 0]
+        n = ring.read_into(out) if ring is not None else 0
+        if n < frames:
+            out[n:] = 0.0
+            if self._writing:
+                self.underruns += 1
+
+    # ------------------------------------------------------------------
+    # Playback
+    # ------------------------------------------------------------------
+
+    def play(self, samples: np.ndarray, rate: int) -> bool:
+        """
+        Queue samples for playback, blocking only while the ring buffer is full.
+
+        Returns once every frame is buffered — the tail is still playing.
+        Call wait() to block until it has been heard. Returns False if stop()
+        interrupted the write.
+        """
+        with self._lock:
+            if self._stream is None or self._rate != rate:
+                if self._ring is not None and self._stream is not None:
+                    self._ring.wait_below(0, timeout=self._buffer_seconds + 1.0)
+                self._open(rate)
+            ring = self._ring
+        self._writing = True
+        try:
+            return ring.write(samples)
+        finally:
+            self._writing = False
+
+    def write_silence(self, seconds: float) -> None:
+        """Append `seconds` of silence at the current rate (inter-sentence gap)."""
+        if seconds <= 0 or self._ring is None or self._rate is None:
+            return
+        self._ring.write(np.zeros(int(self._rate * seconds), dtype=np.float32))
+
+    def wait(self, remaining_seconds: float = 0.0) -> None:
+        """
+        Block until at most `remaining_seconds` of audio is still buffered.
+
+        remaining_seconds=0 waits for the buffer to drain completely; the
+        playback stage passes a small tail so the next clip can be written
+        before the current one runs out.
+        """
+        ring, rate = self._ring, self._rate
+        if ring is None or rate is None:
+            return
+        ring.wait_below(int(rate * remaining_seconds))
+
+    def stop(self) -> None:
+        """Silence output immediately and abort any in-progress play()."""
+        if self._ring is not None:
+            self._ring.clear()
+
+    def stats(self) -> dict:
+        """Counters and settings for GET /stats."""
+        return {
+            "underruns": self.underruns,
+            "stream_opens": self.stream_opens,
+            "rate": self._rate,
+            "blocksize": self.blocksize,
+            "latency": self.latency,
+        }
@@ -9,6 +9,7 @@ Subcommands:
     agenttalk setup --opencode    — Also register opencode hooks
     agenttalk setup --antigravity — Also install Antigravity skill and workflow files
     agenttalk setup --no-autostart — Skip auto-start registration
+    agenttalk setup --precision int8 — Download only the int8 (or fp32) Kokoro weights
 
 Requirements: INST-01 (CLI entry point), INST-02, INST-03, INST-04
 """
@@ -47,6 +48,12 @@ def main() -> None:
         action="store_true",
         help="Also install Antigravity skill and workflow files to ~/.gemini/antigravity/",
     )
+    setup_parser.add_argument(
+        "--precision",
+        choices=("all", "fp32", "int8"),
+        default="all",
+        help="Kokoro weights to download: fp32 (~310MB), int8 (~88MB, faster on modest CPUs) or both (default)",
+    )
     setup_parser.set_defaults(func=_cmd_setup)
 
     args = parser.parse_args()
@@ -70,14 +77,15 @@ def _cmd_setup(args: argparse.Namespace) -> None:
     no_autostart = getattr(args, "no_autostart", False)
     register_opencode = getattr(args, "opencode", False)
     register_antigravity = getattr(args, "antigravity", False)
+    precision = getattr(args, "precision", "all")
 
     print("=== AgentTalk Setup ===\n")
 
-    # Step 1: Download Kokoro ONNX model (~310MB total)
+    # Step 1: Download Kokoro ONNX model (~310MB fp32 + ~88MB int8 by default)
     print("Step 1/5: Downloading Kokoro model files...")
     try:
-        from agenttalk.installer import download_model
-        download_model()
+        from agenttalk.installer import KOKORO_MODELS, download_model
+        download_model(tuple(KOKORO_MODELS) if precision == "all" else (precision,))
     except Exception as exc:
         print(f"\nERROR in model download: {exc}")
         print("Fix the error and re-run `agenttalk setup`.")
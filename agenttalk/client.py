@@ -0,0 +1,144 @@
+"""
+agenttalk.client — Minimal-import client for the local AgentTalk service.
+
+Hooks, agenttalk.pipe and the integrations all talk to the service through
+request()/speak(). The service listens on TCP 127.0.0.1:5050 and, where the
+platform has Unix domain sockets, also on agenttalk.sock in the config
+directory. The client prefers the socket: it skips TCP connection setup on the
+loopback stack, and a stale socket file simply fails over to TCP. The socket
+belongs to the service on DEFAULT_PORT; requests for any other port (a
+benchmark or test instance) go over TCP only.
+
+COLD START:
+A hook is a fresh interpreter per event, so this module's import time is paid
+on every assistant response. It speaks HTTP/1.1 over a raw socket and imports
+only os, sys, socket and json — urllib.request alone pulls in http.client,
+email, ssl and more, and costs more than everything else the hook does.
+tests/test_client.py enforces an -X importtime budget; keep new imports out of
+module level.
+
+Every call opens one connection (Connection: close) and closes it — hook
+processes make a single request and exit.
+"""
+import json
+import os
+import socket
+import sys
+
+DEFAULT_PORT = 5050
+SOCKET_NAME = "agenttalk.sock"
+TIMEOUT_SECS = 3.0
+
+
+def config_dir() -> str:
+    """
+    Return the platform-appropriate AgentTalk config directory.
+
+    Same locations as config_loader._config_dir(), without pathlib/platform.
+    """
+    if sys.platform == "win32":
+        base = os.environ.get("APPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Roaming")
+    elif sys.platform == "darwin":
+        base = os.path.join(os.path.expanduser("~"), "Library", "Application Support")
+    else:  # Linux + anything else
+        base = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    return os.path.join(base, "AgentTalk")
+
+
+def socket_path() -> str:
+    """Path of the service's Unix domain socket."""
+    return os.path.join(config_dir(), SOCKET_NAME)
+
+
+def _addresses(port: int):
+    """(family, address) pairs to try, in order of preference."""
+    if port == DEFAULT_PORT and hasattr(socket, "AF_UNIX"):
+        path = socket_path()
+        if os.path.exists(path):
+            yield socket.AF_UNIX, str(path)
+    yield socket.AF_INET, ("127.0.0.1", port)
+
+
+def _recv_all(sock: socket.socket) -> bytes:
+    chunks = []
+    while True:
+        data = sock.recv(65536)
+        if not data:
+            return b"".join(chunks)
+        chunks.append(data)
+
+
+def _dechunk(body: bytes) -> bytes:
+    """Decode a Transfer-Encoding: chunked body."""
+    out = []
+    pos = 0
+    while True:
+        eol = body.index(b"\r\n", pos)
+        size = int(body[pos:eol].split(b";", 1)[0], 16)
+        if size == 0:
+            return b"".join(out)
+        out.append(body[eol + 2:eol + 2 + size])
+        pos = eol + 2 + size + 2
+
+
+def _parse_response(raw: bytes) -> tuple[int, dict]:
+    head, _sep, body = raw.partition(b"\r\n\r\n")
+    lines = head.split(b"\r\n")
+    try:
+        status = int(lines[0].split(b" ", 2)[1])
+    except (IndexError, ValueError):
+        raise ConnectionError(f"Malformed HTTP response: {lines[0][:80]!r}") from None
+    headers = {}
+    for line in lines[1:]:
+        name, _colon, value = line.partition(b":")
+        headers[name.strip().lower()] = value.strip().lower()
+    if headers.get(b"transfer-encoding") == b"chunked":
+        body = _dechunk(body)
+    try:
+        data = json.loads(body.decode("utf-8")) if body else {}
+    except ValueError:
+        data = {}
+    return status, data if isinstance(data, dict) else {}
+
+
+def request(
+    method: str,
+    path: str,
+    payload: dict | None = None,
+    port: int = DEFAULT_PORT,
+    timeout: float = TIMEOUT_SECS,
+) -> tuple[int, dict]:
+    """
+    Send one request to the service and return (status, decoded JSON body).
+
+    HTTP error statuses are returned, not raised. Raises OSError when the
+    service is not reachable on any transport.
+    """
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    head = f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\nContent-Length: {len(body)}\r\n"
+    if payload is not None:
+        head += "Content-Type: application/json; charset=utf-8\r\n"
+    message = head.encode("ascii") + b"\r\n" + body
+
+    error: OSError | None = None
+    for family, address in _addresses(port):
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(timeout)
+            try:
+                sock.connect(address)
+            except (ConnectionRefusedError, FileNotFoundError) as exc:
+                error = exc  # nothing listening on this transport — try the next
+                continue
+            sock.sendall(message)
+            raw = _recv_all(sock)
+        finally:
+            sock.close()
+        return _parse_response(raw)
+    raise error or ConnectionRefusedError("AgentTalk service not reachable")
+
+
+def speak(text: str, port: int = DEFAULT_PORT, timeout: float = TIMEOUT_SECS, **fields) -> int:
+    """POST text (plus optional /speak fields such as session_id) and return the HTTP status."""
+    status, _body = request("POST", "/speak", {"text": text, **fields}, port=port, timeout=timeout)
+    return status
@@ -15,6 +15,8 @@ import platform
 import threading
 from pathlib import Path
 
+from agenttalk.ort_session import DEFAULTS as ORT_DEFAULTS
+
 
 def _config_dir() -> Path:
     """Return the platform-appropriate AgentTalk config directory.
@@ -93,11 +95,36 @@ def save_config(state: dict) -> None:
         "speed":            state.get("speed", 1.0),
         "volume":           state.get("volume", 1.0),
         "model":            state.get("model", "kokoro"),
+        "kokoro_precision": state.get("kokoro_precision", "fp32"),
         "muted":            state.get("muted", False),
         "pre_cue_path":     state.get("pre_cue_path"),
         "post_cue_path":    state.get("post_cue_path"),
         "piper_model_path": state.get("piper_model_path"),
         "speech_mode":      state.get("speech_mode", "auto"),
+        "lookahead":        state.get("lookahead", 2),
+        "output_blocksize": state.get("output_blocksize", 1024),
+        "output_latency":   state.get("output_latency", "low"),
+        "sentence_gap_ms":  state.get("sentence_gap_ms", 50),
+        "audio_cache_mb":   state.get("audio_cache_mb", 32),
+        "disk_cache_mb":    state.get("disk_cache_mb", 256),
+        "clause_max_chars":      state.get("clause_max_chars", 160),
+        "first_chunk_max_chars": state.get("first_chunk_max_chars", 60),
+        "first_chunk_target_ms": state.get("first_chunk_target_ms", 300),
+        "streaming":        state.get("streaming", False),
+        "synth_workers":    state.get("synth_workers", "auto"),
+        "synth_isolation":  state.get("synth_isolation", "thread"),
+        "warmup_buffer_size":      state.get("warmup_buffer_size", 20),
+        "warmup_buffer_max_age_s": state.get("warmup_buffer_max_age_s", 120),
+        "transcript_watch":        state.get("transcript_watch", False),
+        "transcript_poll_ms":      state.get("transcript_poll_ms", 500),
+        "dedup_ttl_s":             state.get("dedup_ttl_s", 300),
+        "speculative":             state.get("speculative", True),
+        "idle_exit_s":             state.get("idle_exit_s", 1800),
+        "engine_idle_unload_s":    state.get("engine_idle_unload_s", 900),
+        "engine_memory_budget_mb": state.get("engine_memory_budget_mb", 0),
+        "piper_pool_size":         state.get("piper_pool_size", 3),
+        "piper_pool_mb":           state.get("piper_pool_mb", 0),
+        **{key: state.get(key, default) for key, default in ORT_DEFAULTS.items()},
     }
 
     tmp = path.with_suffix(".json.tmp")
@@ -0,0 +1,96 @@
+"""
+dedup.py — Per-session index of recently spoken sentences.
+
+The same assistant text often reaches /speak twice: an intermediate message is
+spoken between tool calls (transcript watcher or PostToolUse hook) and the Stop
+hook then sends last_assistant_message, which repeats or extends it. /speak
+claims each preprocessed sentence here before anything is queued; sentences
+already spoken in the same session within the TTL are dropped, so a Stop
+message that extends a spoken partial only synthesizes its new sentences.
+
+KEYS:
+Sentences are normalized (Unicode NFKC, case-folded, punctuation dropped,
+whitespace collapsed) and hashed, so "Done." and "done!" match. Entries are
+scoped by session ID — requests without one are never deduplicated, so a
+deliberate repeat from a script or slash command is still spoken.
+"""
+import collections
+import hashlib
+import re
+import threading
+import time
+import unicodedata
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def sentence_key(sentence: str) -> bytes:
+    """Hash of the normalized sentence."""
+    norm = _NON_WORD.sub(" ", unicodedata.normalize("NFKC", sentence).casefold()).strip()
+    return hashlib.blake2b(norm.encode("utf-8"), digest_size=16).digest()
+
+
+class SentenceDedup:
+    """
+    Thread-safe TTL index of (session, sentence hash) pairs.
+
+    Args:
+        ttl:         Seconds a spoken sentence suppresses repeats. 0 disables dedup.
+        max_entries: Cap on remembered sentences across all sessions (oldest evicted).
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 4096):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._seen: collections.OrderedDict[tuple[str, bytes], float] = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.suppressed = 0
+
+    def claim(self, session_id: str | None, sentences: list[str]) -> list[str]:
+        """
+        Return the sentences not spoken recently in this session and record them.
+
+        Repeats within one call are all kept — only earlier requests suppress.
+        """
+        if not session_id or self.ttl <= 0:
+            return list(sentences)
+        keys = [(session_id, sentence_key(s)) for s in sentences]
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            fresh = [s for s, k in zip(sentences, keys) if k not in self._seen]
+            self.suppressed += len(sentences) - len(fresh)
+            for k in keys:
+                self._seen[k] = now
+                self._seen.move_to_end(k)
+            while len(self._seen) > self.max_entries:
+                self._seen.popitem(last=False)
+        return fresh
+
+    def peek(self, session_id: str | None, sentences: list[str]) -> list[str]:
+        """The sentences claim() would return, without recording anything."""
+        if not session_id or self.ttl <= 0:
+            return list(sentences)
+        with self._lock:
+            self._expire(time.monotonic())
+            return [s for s in sentences if (session_id, sentence_key(s)) not in self._seen]
+
+    def release(self, session_id: str | None, sentences: list[str]) -> None:
+        """Forget sentences claimed but never queued (e.g. dropped on a full queue)."""
+        if not session_id:
+            return
+        with self._lock:
+            for s in sentences:
+                self._seen.pop((session_id, sentence_key(s)), None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._seen), "suppressed": self.suppressed}
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.ttl
+        while self._seen:
+            key, stamp = next(iter(self._seen.items()))
+            if stamp >= cutoff:
+                break
+            del self._seen[key]
@@ -0,0 +1,290 @@
+"""
+disk_cache.py — Persistent on-disk cache of synthesized audio.
+
+Second tier behind the in-memory AudioCache: survives service restarts and
+engine reloads, so frequently repeated status sentences play instantly on
+the first request after a restart.
+
+LAYOUT (under _config_dir()/cache/):
+    <model12>-<digest>.pcm  One entry: 16-byte header + int16 little-endian PCM
+    index.json              Model fingerprints (see model_fingerprint.py)
+    .lock                   Cross-process lock for index updates and eviction
+
+Entries are compact int16 PCM (half the size of float32) and are read back
+through mmap, so a lookup maps the file and converts straight to float32
+instead of reading it into an intermediate bytes object first.
+
+INVALIDATION:
+Cache keys include the sha256 of the model file, so a replaced model can
+never produce a stale hit. When a model path's hash changes, entries
+written for the previous hash are deleted to free their space.
+
+LRU AND SIZE CAP:
+Each entry's mtime is bumped on every hit. When the tracked total exceeds
+max_bytes, the directory is rescanned under the lock and the oldest entries
+are deleted until the total is below 90% of the cap.
+
+CONCURRENCY:
+Several service processes may share the directory. Entry files are written
+to a per-process temp name and published with os.replace() (atomic), the
+index and eviction run under an OS file lock, and a reader that loses a race
+with eviction (file vanished) simply reports a miss.
+"""
+import contextlib
+import hashlib
+import json
+import logging
+import mmap
+import os
+import platform
+import struct
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from agenttalk.model_fingerprint import FingerprintIndex
+
+_MAGIC = b"ATPC"
+_HEADER = struct.Struct("<4sIII")  # magic, version, sample_rate, frames
+_VERSION = 1
+_SUFFIX = ".pcm"
+
+
+@contextlib.contextmanager
+def _file_lock(path: Path):
+    """Hold an exclusive OS-level lock on path for the duration of the block."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as fh:
+        if platform.system() == "Windows":
+            import msvcrt
+            fh.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue  # LK_LOCK gives up after ~10 s; keep waiting
+            try:
+                yield
+            finally:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+class DiskAudioCache:
+    """
+    Cross-process persistent cache of (samples, sample_rate) clips.
+
+    Uses the same (engine, model_path, voice, speed, text) keys as AudioCache;
+    key[1] is resolved to the model file's sha256 before hashing.
+
+    Args:
+        directory: Cache directory (created on first write).
+        max_bytes: Size cap for entry files. 0 disables the cache.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = Path(directory)
+        self._lock_path = self.directory / ".lock"
+        self._max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+        self._fingerprints = FingerprintIndex(
+            self.directory / "index.json", lock=lambda: _file_lock(self._lock_path),
+        )
+        self._total_bytes: int | None = None  # lazily initialised by a directory scan
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.invalidated = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    def resize(self, max_bytes: int) -> None:
+        """Change the size cap; the next put() evicts down to it."""
+        self._max_bytes = max(0, int(max_bytes))
+
+    # ------------------------------------------------------------------
+    # Model fingerprints
+    # ------------------------------------------------------------------
+
+    def _model_hash(self, model_path: str | None) -> str:
+        """
+        Return the sha256 of the model file at model_path ('none' if unknown).
+
+        Hashes are memoised in index.json by size and mtime (see
+        model_fingerprint.py): every lookup stats the file, and a model
+        replaced while the service runs is re-hashed on the next lookup. When
+        the hash recorded for a path changes, that path's old entries are purged.
+        """
+        if not model_path:
+            return "none"
+        try:
+            digest, replaced = self._fingerprints.digest(model_path)
+        except OSError:
+            return "missing"
+        if replaced is not None:
+            with _file_lock(self._lock_path):
+                self._purge_model_locked(replaced)
+        return digest
+
+    def prepare_model(self, model_path: str | None) -> None:
+        """
+        Fingerprint model_path ahead of the first lookup.
+
+        Called from a background thread at worker start and from every engine
+        load, so the first sentence does not pay for hashing the model. A no-op
+        while the file's size and mtime match the memoised hash.
+        """
+        if model_path:
+            self._model_hash(model_path)
+
+    def _purge_model_locked(self, old_hash: str) -> None:
+        """Delete every entry written for a model hash. Caller holds the file lock."""
+        removed = 0
+        for entry in self.directory.glob(f"{old_hash[:12]}-*{_SUFFIX}"):
+            try:
+                size = entry.stat().st_size
+                entry.unlink()
+            except OSError:
+                continue
+            removed += 1
+            if self._total_bytes is not None:
+                self._total_bytes -= size
+        if removed:
+            self.invalidated += removed
+            logging.info("Disk cache: model changed — removed %d stale entries.", removed)
+
+    # ------------------------------------------------------------------
+    # Entries
+    # ------------------------------------------------------------------
+
+    def _entry_path(self, key: tuple) -> Path:
+        engine, model_path, voice, speed, text = key
+        model_hash = self._model_hash(model_path)
+        digest = hashlib.sha256(
+            json.dumps([engine, model_hash, voice, speed, text]).encode("utf-8")
+        ).hexdigest()
+        return self.directory / f"{model_hash[:12]}-{digest[:32]}{_SUFFIX}"
+
+    def get(self, key: tuple) -> tuple[np.ndarray, int] | None:
+        """Return the cached (float32 samples, rate) for key, or None."""
+        if self._max_bytes == 0:
+            return None
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                magic, version, rate, frames = _HEADER.unpack_from(mm, 0)
+                if magic != _MAGIC or version != _VERSION:
+                    raise ValueError("bad header")
+                pcm = np.frombuffer(mm, dtype="<i2", count=frames, offset=_HEADER.size)
+                samples = pcm * np.float32(1.0 / 32768.0)  # single int16 -> float32 copy
+                del pcm  # release the buffer export before the mmap closes
+        except (OSError, ValueError, struct.error):
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path)  # LRU recency
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return samples, rate
+
+    def put(self, key: tuple, samples: np.ndarray, rate: int) -> None:
+        """Write a clip as int16 PCM, then evict LRU entries if over the cap."""
+        if self._max_bytes == 0:
+            return
+        pcm = (np.clip(np.asarray(samples, dtype=np.float32), -1.0, 1.0) * 32767).astype("<i2")
+        size = _HEADER.size + pcm.nbytes
+        if size > self._max_bytes:
+            return
+        path = self._entry_path(key)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp, "wb") as fh:
+                fh.write(_HEADER.pack(_MAGIC, _VERSION, int(rate), len(pcm)))
+                fh.write(pcm.tobytes())
+            os.replace(tmp, path)
+        except OSError:
+            logging.warning("Disk cache write failed for %s.", path.name, exc_info=True)
+            with contextlib.suppress(OSError):
+                tmp.unlink()
+            return
+        with self._lock:
+            self.writes += 1
+            if self._total_bytes is None:
+                self._total_bytes = self._scan()[1]
+            else:
+                self._total_bytes += size
+            over = self._total_bytes > self._max_bytes
+        if over:
+            self._evict()
+
+    def _scan(self) -> tuple[list[tuple[float, int, Path]], int]:
+        """Return ([(mtime, size, path)], total_bytes) for all entry files."""
+        entries = []
+        total = 0
+        try:
+            with os.scandir(self.directory) as it:
+                for de in it:
+                    if not de.name.endswith(_SUFFIX):
+                        continue
+                    try:
+                        st = de.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, Path(de.path)))
+                    total += st.st_size
+        except OSError:
+            pass
+        return entries, total
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until under 90% of the cap."""
+        with _file_lock(self._lock_path):
+            entries, total = self._scan()  # rescan: other processes write here too
+            target = int(self._max_bytes * 0.9)
+            evicted = 0
+            for _mtime, size, path in sorted(entries):
+                if total <= target:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                total -= size
+                evicted += 1
+        with self._lock:
+            self._total_bytes = total
+            self.evictions += evicted
+        if evicted:
+            logging.debug("Disk cache: evicted %d entries (now %d bytes).", evicted, total)
+
+    def stats(self) -> dict:
+        """Counters and occupancy for GET /stats."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "bytes": self._total_bytes,
+                "max_bytes": self._max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "invalidated": self.invalidated,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "directory": str(self.directory),
+            }
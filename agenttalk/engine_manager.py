@@ -0,0 +1,347 @@
+"""
+engine_manager.py — Load, track and unload TTS engines on demand.
+
+A loaded Kokoro or Piper engine holds hundreds of MB of ONNX Runtime state.
+Synthesis leases the engine it needs from an EngineManager; the manager loads
+(and warms) it on first use and unloads it again when it has not been leased
+for idle_timeout seconds, or when the engines together exceed
+memory_budget_mb. The next lease — or a preload() issued as soon as a request
+arrives — loads it again.
+
+KEYS:
+Engines are keyed by tuples starting with (kind, model path), e.g.
+("kokoro", ".../kokoro-v1.0.onnx", <session settings>).
+Several engines of one kind — Piper voices — form a pool: max_per_kind caps how
+many stay loaded and kind_budget_mb their summed resident size. Loading past
+either evicts the least recently used unleased engines of that kind, so
+switching back to a recently used voice needs no load.
+
+MEMORY:
+An engine's resident size is the process RSS growth across its load, so it
+is approximate when other threads allocate at the same time. After an unload
+the freed heap is handed back to the OS where the C library allows it
+(glibc malloc_trim); elsewhere RSS may stay near its peak until reused.
+
+An engine is never unloaded while leased; a lease in progress keeps it alive.
+"""
+import contextlib
+import ctypes
+import gc
+import logging
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Hashable, Iterator
+
+import psutil
+
+SWEEP_INTERVAL_S = 5.0  # how often the reaper thread checks idle time and the budget
+
+EngineKey = tuple  # (kind, model path, ...)
+
+
+def process_rss() -> int:
+    """Resident set size of this process, in bytes."""
+    return psutil.Process().memory_info().rss
+
+
+def _trim_heap() -> None:
+    """Return freed heap pages to the OS (glibc only — a no-op elsewhere)."""
+    if not sys.platform.startswith("linux"):
+        return
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass  # musl or another libc without malloc_trim
+
+
+@dataclass
+class _Slot:
+    key: EngineKey
+    engine: object = None
+    loading: threading.Event | None = None  # set when the load in flight finishes
+    load_started: float = 0.0                # monotonic start of the load in flight
+    error: BaseException | None = None       # why the last load failed
+    in_use: int = 0
+    last_used: float = 0.0
+    loads: int = 0
+    last_load_s: float = 0.0
+    total_load_s: float = 0.0
+    rss_bytes: int = 0
+    idle_unloads: int = 0
+    budget_unloads: int = 0  # memory budget and pool-limit evictions
+
+
+class EngineManager:
+    """
+    Thread-safe registry of loaded engines with idle and memory-budget unloading.
+
+    Args:
+        idle_timeout:     Seconds without a lease before an engine is unloaded. 0 keeps engines loaded.
+        memory_budget_mb: Cap on the summed resident size of loaded engines. 0 disables it.
+                          The most recently used engine is never evicted for the budget.
+        max_per_kind:     Optional {kind: max loaded engines of that kind}.
+        kind_budget_mb:   Optional {kind: cap on the summed resident size of that kind}; 0 = none.
+        rss:              Returns the process RSS in bytes (injectable for tests).
+    """
+
+    def __init__(
+        self,
+        idle_timeout: float = 0.0,
+        memory_budget_mb: float = 0.0,
+        max_per_kind: dict[Hashable, int] | None = None,
+        kind_budget_mb: dict[Hashable, float] | None = None,
+        rss: Callable[[], int] = process_rss,
+    ):
+        self.idle_timeout = idle_timeout
+        self.memory_budget_mb = memory_budget_mb
+        self.max_per_kind = dict(max_per_kind or {})
+        self.kind_budget_mb = dict(kind_budget_mb or {})
+        self._rss = rss
+        self._slots: dict[EngineKey, _Slot] = {}
+        self._lock = threading.Lock()
+        self._reaper: threading.Thread | None = None
+
+    @contextlib.contextmanager
+    def lease(self, key: EngineKey, loader: Callable[[], object]) -> Iterator[object]:
+        """
+        Yield the engine for key, loading it with loader() first if needed.
+
+        Concurrent leases of an engine that is still loading wait for that load
+        instead of starting another. Raises whatever loader() raised.
+        """
+        engine = self._acquire(key, loader)
+        try:
+            yield engine
+        finally:
+            with self._lock:
+                slot = self._slots[key]
+                slot.in_use -= 1
+                slot.last_used = time.monotonic()
+
+    def preload(self, key: EngineKey, loader: Callable[[], object]) -> bool:
+        """Start loading key on a background thread. Returns False if it is already loaded or loading."""
+        with self._lock:
+            slot = self._slots.setdefault(key, _Slot(key))
+            if slot.engine is not None or slot.loading is not None:
+                return False
+            slot.loading = threading.Event()
+            slot.load_started = time.monotonic()
+        threading.Thread(
+            target=self._load_logged, args=(slot, loader), daemon=True, name="engine-load",
+        ).start()
+        return True
+
+    def is_loaded(self, key: EngineKey) -> bool:
+        with self._lock:
+            slot = self._slots.get(key)
+            return slot is not None and slot.engine is not None
+
+    def status(self, key: EngineKey) -> dict:
+        """
+        Load state of one engine: loaded / loading, seconds the load in flight
+        has run (loading_s) next to how long the previous one took
+        (last_load_s, 0 before the first), and the last load error.
+        """
+        with self._lock:
+            slot = self._slots.get(key) or _Slot(key)
+            return {
+                "loaded":      slot.engine is not None,
+                "loading":     slot.loading is not None,
+                "loading_s":   round(time.monotonic() - slot.load_started, 1) if slot.loading is not None else None,
+                "last_load_s": round(slot.last_load_s, 3),
+                "error":       str(slot.error) if slot.error is not None else None,
+            }
+
+    def unload(self, key: EngineKey) -> bool:
+        """Unload key now unless it is leased. Returns True if an engine was unloaded."""
+        return self._unload(key, None)
+
+    def sweep(self) -> list[EngineKey]:
+        """Unload idle engines, then enforce the pool limits and memory budget. Returns the keys unloaded."""
+        unloaded = []
+        if self.idle_timeout > 0:
+            cutoff = time.monotonic() - self.idle_timeout
+            with self._lock:
+                idle = [
+                    s.key for s in self._slots.values()
+                    if s.engine is not None and s.in_use == 0 and s.last_used <= cutoff
+                ]
+            unloaded += [key for key in idle if self._unload(key, "idle")]
+        for kind in set(self.max_per_kind) | set(self.kind_budget_mb):
+            unloaded += self._enforce_kind_limit(kind)
+        return unloaded + self._enforce_budget()
+
+    def stats(self) -> dict:
+        """Per-engine load counts, load times and resident size for GET /stats."""
+        now = time.monotonic()
+        with self._lock:
+            engines = [
+                {
+                    "kind":          s.key[0],
+                    "model":         os.path.basename(str(s.key[1])) if len(s.key) > 1 else None,
+                    "loaded":        s.engine is not None,
+                    "loading":       s.loading is not None,
+                    "in_use":        s.in_use,
+                    "loads":         s.loads,
+                    "last_load_s":   round(s.last_load_s, 3),
+                    "total_load_s":  round(s.total_load_s, 3),
+                    "rss_mb":        round(s.rss_bytes / (1024 * 1024), 1),
+                    "idle_s":        round(now - s.last_used, 1) if s.engine is not None else None,
+                    "idle_unloads":  s.idle_unloads,
+                    "budget_unloads": s.budget_unloads,
+                }
+                for s in self._slots.values()
+            ]
+            loaded = sum(s.rss_bytes for s in self._slots.values() if s.engine is not None)
+        return {
+            "loaded_mb":        round(loaded / (1024 * 1024), 1),
+            "memory_budget_mb": self.memory_budget_mb,
+            "idle_timeout_s":   self.idle_timeout,
+            "max_per_kind":     dict(self.max_per_kind),
+            "kind_budget_mb":   dict(self.kind_budget_mb),
+            "engines":          engines,
+        }
+
+    # ------------------------------------------------------------------
+
+    def _acquire(self, key: EngineKey, loader: Callable[[], object]) -> object:
+        while True:
+            with self._lock:
+                slot = self._slots.setdefault(key, _Slot(key))
+                if slot.engine is not None:
+                    slot.in_use += 1
+                    slot.last_used = time.monotonic()
+                    return slot.engine
+                waiting = slot.loading
+                if waiting is None:
+                    slot.loading = threading.Event()
+                    slot.load_started = time.monotonic()
+            if waiting is None:
+                self._load(slot, loader)
+                continue
+            waiting.wait()
+            with self._lock:
+                if slot.engine is None and slot.error is not None:
+                    raise slot.error
+
+    def _load(self, slot: _Slot, loader: Callable[[], object]) -> None:
+        """Run loader() for slot, whose loading event the caller has set up."""
+        rss_before = self._rss()
+        t0 = time.perf_counter()
+        try:
+            engine = loader()
+        except BaseException as exc:
+            with self._lock:
+                slot.error = exc
+                done, slot.loading = slot.loading, None
+            done.set()
+            raise
+        elapsed = time.perf_counter() - t0
+        rss_grown = max(0, self._rss() - rss_before)
+        with self._lock:
+            slot.engine = engine
+            slot.error = None
+            slot.loads += 1
+            slot.last_load_s = elapsed
+            slot.total_load_s += elapsed
+            slot.rss_bytes = rss_grown
+            slot.last_used = time.monotonic()
+            done, slot.loading = slot.loading, None
+            if self._reaper is None:
+                self._reaper = threading.Thread(target=self._reap, daemon=True, name="engine-reaper")
+                self._reaper.start()
+        done.set()
+        logging.info(
+            "Engine %s loaded in %.2f s (load #%d, +%.0f MB resident).",
+            slot.key[0], elapsed, slot.loads, rss_grown / (1024 * 1024),
+        )
+        self._enforce_kind_limit(slot.key[0])
+        self._enforce_budget()
+
+    def _load_logged(self, slot: _Slot, loader: Callable[[], object]) -> None:
+        try:
+            self._load(slot, loader)
+        except Exception:
+            logging.exception("Background load of engine %s failed.", slot.key[0])
+
+    def _unload(self, key: EngineKey, reason: str | None) -> bool:
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None or slot.engine is None or slot.in_use:
+                return False
+            engine, slot.engine = slot.engine, None
+            idle_s = time.monotonic() - slot.last_used
+            if reason == "idle":
+                slot.idle_unloads += 1
+            elif reason in ("memory", "limit"):
+                slot.budget_unloads += 1
+        del engine
+        gc.collect()
+        _trim_heap()
+        logging.info(
+            "Engine %s unloaded (%s, idle %.0f s, ~%.0f MB).",
+            key[0], reason or "requested", idle_s, slot.rss_bytes / (1024 * 1024),
+        )
+        return True
+
+    def _lru_unleased(self, exclude: EngineKey | None, kind: Hashable | None = None) -> list[_Slot]:
+        """Loaded, unleased slots (optionally of one kind), least recently used first. Caller holds the lock."""
+        return sorted(
+            (
+                s for s in self._slots.values()
+                if s.engine is not None and s.in_use == 0 and s.key != exclude
+                and (kind is None or s.key[0] == kind)
+            ),
+            key=lambda s: s.last_used,
+        )
+
+    def _enforce_kind_limit(self, kind: Hashable) -> list[EngineKey]:
+        """
+        Evict least recently used engines of kind beyond its count and memory
+        caps. The most recently used one (the engine just loaded) always stays.
+        """
+        cap = int(self.max_per_kind.get(kind) or 0)
+        budget = (self.kind_budget_mb.get(kind) or 0) * 1024 * 1024
+        if not cap and not budget:
+            return []
+        with self._lock:
+            pool = [s for s in self._slots.values() if s.engine is not None and s.key[0] == kind]
+            if not pool:
+                return []
+            count, total = len(pool), sum(s.rss_bytes for s in pool)
+            newest = max(pool, key=lambda s: s.last_used).key
+            victims = []
+            for slot in self._lru_unleased(newest, kind):
+                if (not cap or count <= cap) and (not budget or total <= budget):
+                    break
+                victims.append(slot.key)
+                count -= 1
+                total -= slot.rss_bytes
+        return [key for key in victims if self._unload(key, "limit")]
+
+    def _enforce_budget(self) -> list[EngineKey]:
+        budget = self.memory_budget_mb * 1024 * 1024
+        if budget <= 0:
+            return []
+        with self._lock:
+            loaded = [s for s in self._slots.values() if s.engine is not None]
+            total = sum(s.rss_bytes for s in loaded)
+            newest = max(loaded, key=lambda s: s.last_used).key if loaded else None
+            victims = []
+            for slot in self._lru_unleased(newest):
+                if total <= budget:
+                    break
+                victims.append(slot.key)
+                total -= slot.rss_bytes
+        return [key for key in victims if self._unload(key, "memory")]
+
+    def _reap(self) -> None:
+        while True:
+            time.sleep(SWEEP_INTERVAL_S)
+            try:
+                self.sweep()
+            except Exception:
+                logging.exception("Engine sweep failed.")
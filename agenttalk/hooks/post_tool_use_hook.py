@@ -10,54 +10,128 @@ Registered in ~/.claude/settings.json with async: true by agenttalk setup.
 Key differences from stop_hook.py:
   - No stop_hook_active guard (that guard is Stop-hook specific)
   - Reads transcript_path from payload (PostToolUse has no last_assistant_message field)
-  - Calls _extract_assistant_text() to parse the JSONL transcript
-  - Applies _is_substantial() filter before POSTing to avoid speaking one-liners
-    like "Reading file..." during rapid tool use
+  - Calls _extract_assistant_text() to tail-read the JSONL transcript (see its
+    docstring — cost is independent of transcript size)
+  - Applies _is_substantial() filter to avoid speaking one-liners like
+    "Reading file..." during rapid tool use; rejected text is POSTed with
+    speculative=true so the service only pre-synthesizes it
+
+Sessions registered by the SessionStart hook are followed inside the service
+(agenttalk/transcript_watcher.py) instead, with the same filter; this hook
+remains for setups that wire PostToolUse up by hand.
 """
 import sys
 import json
 import os
-import urllib.request
-import urllib.error
-from pathlib import Path
+import time
+
+from agenttalk import client
 
-SERVICE_URL = 'http://localhost:5050/speak'
 TIMEOUT_SECS = 3  # POST completes in <1s; 3s gives headroom without long block
 MIN_CHARS = 80
+READ_BLOCK = 64 * 1024  # transcript bytes read per backwards step
+OFFSET_CACHE_ENTRIES = 16  # transcripts remembered in transcript_offsets.json
 
 
-def _config_path() -> Path:
-    appdata = os.environ.get('APPDATA') or Path.home() / 'AppData' / 'Roaming'
-    return Path(appdata) / 'AgentTalk' / 'config.json'
+def _offset_cache_path() -> str:
+    return os.path.join(client.config_dir(), 'transcript_offsets.json')
 
 
-def _read_speech_mode() -> str:
-    """Return speech_mode from local config file, or 'auto' on any failure."""
+def _load_offset_cache() -> dict:
     try:
-        data = json.loads(_config_path().read_text(encoding='utf-8'))
-        return data.get('speech_mode', 'auto')
-    except FileNotFoundError:
-        return 'auto'  # config not yet written — benign on first run
-    except Exception as exc:
-        print(
-            f"[agenttalk post_tool_use_hook] WARNING: could not read speech_mode "
-            f"({type(exc).__name__}: {exc}) — defaulting to 'auto'.",
-            file=sys.stderr,
-        )
-        return 'auto'
+        with open(_offset_cache_path(), 'rb') as fh:
+            data = json.loads(fh.read().decode('utf-8'))
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_offset_cache(cache: dict) -> None:
+    """Persist the cache atomically, keeping only the most recently used entries."""
+    newest = sorted(cache.items(), key=lambda kv: kv[1].get('used', 0), reverse=True)
+    path = _offset_cache_path()
+    tmp = f'{path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, 'w', encoding='utf-8') as fh:
+            fh.write(json.dumps(dict(newest[:OFFSET_CACHE_ENTRIES])))
+        os.replace(tmp, path)
+    except OSError:
+        pass  # cache is an optimisation — never fail the hook over it
+
+
+def _iter_lines_reversed(fh, start: int, end: int):
+    """
+    Yield the lines in fh[start:end] last-first, reading READ_BLOCK bytes at a time
+    from the end. start must be a line boundary (0 or a cached offset).
+    """
+    pos = end
+    tail = b''
+    while pos > start:
+        size = min(READ_BLOCK, pos - start)
+        pos -= size
+        fh.seek(pos)
+        lines = (fh.read(size) + tail).split(b'\n')
+        tail = lines[0]  # may continue in the previous block
+        yield from reversed(lines[1:])
+    if tail:
+        yield tail
+
+
+def _complete_end(fh, start: int, end: int) -> int:
+    """Offset just past the last newline in fh[start:end] (start if none in the last block)."""
+    size = min(READ_BLOCK, end - start)
+    fh.seek(end - size)
+    idx = fh.read(size).rfind(b'\n')
+    return end - size + idx + 1 if idx >= 0 else start
+
+
+def _assistant_text(raw_line: bytes) -> str | None:
+    """Return the text of a JSONL line if it is an assistant message, else None."""
+    stripped = raw_line.strip()
+    if not stripped:
+        return None
+    try:
+        msg = json.loads(stripped)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None  # includes a final line still being written
+    if not isinstance(msg, dict):
+        return None
+    # Unwrap message envelope if present
+    if msg.get('type') == 'message':
+        msg = msg.get('message', msg)
+    if msg.get('role') != 'assistant':
+        return None
+    content = msg.get('content', '')
+    if isinstance(content, str):
+        return content.strip()
+    if isinstance(content, list):
+        parts = [
+            block['text']
+            for block in content
+            if isinstance(block, dict) and block.get('type') == 'text'
+        ]
+        return ' '.join(parts).strip()
+    return None
 
 
 def _extract_assistant_text(transcript_path: str) -> str:
     """
-    Read the JSONL transcript and return the most recent assistant message text.
+    Return the most recent assistant message text from the JSONL transcript.
+
+    Reads backwards from the end of the file in READ_BLOCK chunks and stops at
+    the first role=assistant entry, so the cost is the size of the tail, not
+    the whole transcript. A per-transcript offset cache (transcript_offsets.json
+    next to config.json) records how far the file had been scanned and the
+    answer found; a repeat call only scans bytes appended since. A file that
+    shrank or was replaced (different inode) is rescanned from the end.
 
-    Walks lines in reverse to find the most recent role=assistant entry.
     Unwraps message envelope if msg['type'] == 'message'.
     Extracts text from str content or list of type=text blocks.
     Returns empty string on any error (fail-open).
     """
     try:
-        lines = Path(transcript_path).read_text(encoding='utf-8').splitlines()
+        fh = open(transcript_path, 'rb')
     except OSError as exc:
         print(
             f"[agenttalk post_tool_use_hook] WARNING: cannot read transcript "
@@ -65,30 +139,34 @@ def _extract_assistant_text(transcript_path: str) -> str:
             file=sys.stderr,
         )
         return ''
-    for raw_line in reversed(lines):
-        stripped = raw_line.strip()
-        if not stripped:
-            continue
-        try:
-            msg = json.loads(stripped)
-        except json.JSONDecodeError:
-            continue
-        # Unwrap message envelope if present
-        if msg.get('type') == 'message':
-            msg = msg.get('message', msg)
-        if msg.get('role') != 'assistant':
-            continue
-        content = msg.get('content', '')
-        if isinstance(content, str):
-            return content.strip()
-        if isinstance(content, list):
-            parts = [
-                block['text']
-                for block in content
-                if isinstance(block, dict) and block.get('type') == 'text'
-            ]
-            return ' '.join(parts).strip()
-    return ''
+    with fh:
+        st = os.fstat(fh.fileno())
+        end = st.st_size
+        key = os.path.abspath(transcript_path)
+        cache = _load_offset_cache()
+        entry = cache.get(key)
+        start = 0
+        if entry and entry.get('ino') == st.st_ino and entry.get('offset', end + 1) <= end:
+            start = entry['offset']
+            if start == end:
+                return entry.get('text', '')
+
+        text = None
+        for raw_line in _iter_lines_reversed(fh, start, end):
+            text = _assistant_text(raw_line)
+            if text is not None:
+                break
+        if text is None:
+            text = entry.get('text', '') if start else ''
+
+        cache[key] = {
+            'ino': st.st_ino,
+            'offset': _complete_end(fh, start, end),
+            'text': text,
+            'used': time.time(),
+        }
+    _save_offset_cache(cache)
+    return text
 
 
 def _is_substantial(text: str) -> bool:
@@ -112,10 +190,6 @@ def main() -> None:
     except (json.JSONDecodeError, UnicodeDecodeError):
         sys.exit(0)  # Malformed input — never block
 
-    # Semi-auto guard: read speech_mode directly from config file (no HTTP round-trip).
-    if _read_speech_mode() == 'semi-auto':
-        sys.exit(0)
-
     transcript_path = payload.get('transcript_path', '')
     if not transcript_path:
         sys.exit(0)
@@ -124,29 +198,27 @@ def main() -> None:
     if not text:
         sys.exit(0)
 
-    if not _is_substantial(text):
-        sys.exit(0)
-
     # POST text to /speak endpoint.
-    # 202 = queued, 200 = skipped (alpha filter), 503 = warmup — all acceptable.
-    body = json.dumps({'text': text}).encode('utf-8')
-    req = urllib.request.Request(
-        SERVICE_URL,
-        data=body,
-        headers={'Content-Type': 'application/json'},
-        method='POST',
-    )
+    # 202 = queued (or held while the engine warms up), 200 = skipped (alpha filter),
+    # 503 = engine failed to start — all acceptable.
+    # source='auto-hook' lets the service apply the semi-auto guard (200 "skipped").
+    # session_id scopes the service's sentence dedup (Stop repeats PostToolUse text).
+    fields = {'source': 'auto-hook'}
+    if not _is_substantial(text):
+        # Too short to speak now, but it usually reappears in the Stop message:
+        # let the service pre-synthesize it into its cache without playing it.
+        fields['speculative'] = True
+    if payload.get('session_id'):
+        fields['session_id'] = payload['session_id']
     try:
-        with urllib.request.urlopen(req, timeout=TIMEOUT_SECS) as _:
-            pass
-    except urllib.error.HTTPError as exc:
-        # 503 = warmup, 200/202 never reach here; anything else is unexpected
-        if exc.code not in (200, 202, 503):
+        status = client.speak(text, timeout=TIMEOUT_SECS, **fields)
+        # 429 = queue full (dropped by design); anything else is unexpected
+        if status not in (200, 202, 429, 503):
             print(
-                f"[agenttalk post_tool_use_hook] WARNING: /speak returned HTTP {exc.code}",
+                f"[agenttalk post_tool_use_hook] WARNING: /speak returned HTTP {status}",
                 file=sys.stderr,
             )
-    except urllib.error.URLError:
+    except OSError:
         pass  # Service not running — acceptable; hook runs asynchronously
     except Exception as exc:
         print(f"[agenttalk post_tool_use_hook] Unexpected error: {exc}", file=sys.stderr)
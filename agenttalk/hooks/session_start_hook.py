@@ -1,6 +1,9 @@
 """
 AgentTalk SessionStart hook.
-Checks PID file and launches service if not running.
+Checks PID file and launches service if not running, then registers the
+session's transcript with the service (POST /sessions) so intermediate
+assistant messages are spoken without a hook process per tool call. The
+service only follows it when transcript_watch is enabled in config.json.
 
 Requirements: HOOK-02, HOOK-03, HOOK-04
 Called by Claude Code on new session startup.
@@ -11,17 +14,18 @@ import json
 import os
 import platform
 import subprocess
+import time
 from pathlib import Path
 
-# Import _config_dir for cross-platform config directory resolution.
+# Import config_dir for cross-platform config directory resolution.
 # This module is executed directly by Claude Code as a hook, so it must be
 # importable without the full agenttalk package installed in some edge cases.
 # Using try/except with a fallback ensures the hook still works correctly.
 try:
-    from agenttalk.config_loader import _config_dir
-    CONFIG_DIR = _config_dir()
+    from agenttalk.client import config_dir
+    CONFIG_DIR = Path(config_dir())
 except Exception:
-    # Fallback: use platform-appropriate path without importing config_loader
+    # Fallback: use platform-appropriate path without importing agenttalk.client
     _system = platform.system()
     if _system == "Windows":
         _appdata = os.environ.get("APPDATA") or str(Path.home() / "AppData" / "Roaming")
@@ -33,18 +37,27 @@ except Exception:
         CONFIG_DIR = Path(_xdg) / "AgentTalk"
 
 PID_FILE = CONFIG_DIR / "service.pid"
+# Written by agenttalk.launcher, which owns the sockets and starts the service on demand.
+LAUNCHER_PID_FILE = CONFIG_DIR / "launcher.pid"
 # These two files are written by `agenttalk setup` (Plan 02).
 # They contain absolute paths so the hook works regardless of cwd.
 SERVICE_PATH_FILE = CONFIG_DIR / "service_path.txt"
 PYTHONW_PATH_FILE = CONFIG_DIR / "pythonw_path.txt"
 
+TIMEOUT_SECS = 3
+# A freshly launched service needs a few seconds of imports before it listens;
+# keep retrying the registration for this long — below the 10 s timeout
+# agenttalk setup gives the hook, after which Claude Code kills it.
+REGISTER_WAIT_SECS = 8
+REGISTER_RETRY_SECS = 0.5
 
-def _service_is_running() -> bool:
-    """Return True if the service PID file points to a live process."""
-    if not PID_FILE.exists():
+
+def _pid_file_is_live(pid_file: Path) -> bool:
+    """Return True if pid_file points to a live process."""
+    if not pid_file.exists():
         return False
     try:
-        pid_text = PID_FILE.read_text(encoding='utf-8').strip()
+        pid_text = pid_file.read_text(encoding='utf-8').strip()
         if not pid_text:
             return False
         pid = int(pid_text)
@@ -65,36 +78,51 @@ def _service_is_running() -> bool:
         return False
 
 
-def main() -> None:
-    # HOOK-04: Binary read + explicit UTF-8 decode — CP1252 safe.
-    raw = sys.stdin.buffer.read()
-    try:
-        payload = json.loads(raw.decode('utf-8'))
-    except (json.JSONDecodeError, UnicodeDecodeError) as exc:
-        print(f"[agenttalk session_start_hook] Failed to parse stdin: {exc}", file=sys.stderr)
-        sys.exit(0)
+def _service_is_running() -> bool:
+    """Return True if the service, or the launcher that starts it on demand, is running."""
+    return _pid_file_is_live(PID_FILE) or _pid_file_is_live(LAUNCHER_PID_FILE)
 
-    # HOOK-02: Only auto-launch on fresh sessions.
-    # source values: 'startup' (new session), 'resume', 'clear', 'compact'.
-    # Service may already be running for resume/clear — PID check handles that,
-    # but filtering here avoids the overhead for non-startup events.
-    source = payload.get('source', '')
-    if source != 'startup':
-        sys.exit(0)
 
-    if _service_is_running():
-        sys.exit(0)
+def _register_session(session_id: str, transcript_path: str, wait_secs: float) -> None:
+    """POST the transcript to /sessions, retrying while the service starts up."""
+    try:
+        from agenttalk import client
+    except ImportError as exc:
+        print(f"[agenttalk session_start_hook] Cannot register session: {exc}", file=sys.stderr)
+        return
+    payload = {'session_id': session_id, 'transcript_path': transcript_path}
+    deadline = time.monotonic() + wait_secs
+    while True:
+        # Retries never run past the deadline, so the hook finishes within its timeout.
+        timeout = min(TIMEOUT_SECS, max(deadline - time.monotonic(), 0.5)) if wait_secs else TIMEOUT_SECS
+        try:
+            status, _body = client.request('POST', '/sessions', payload, timeout=timeout)
+        except OSError:
+            if time.monotonic() >= deadline:
+                return  # service not running — nothing to register with
+            time.sleep(REGISTER_RETRY_SECS)
+            continue
+        if status >= 400:
+            print(f"[agenttalk session_start_hook] Session registration rejected: {status}", file=sys.stderr)
+        return
 
-    # Launch service as a fully detached subprocess.
+
+def _launch_service() -> bool:
+    """Launch the service as a fully detached subprocess. Returns True on success."""
     # Windows: DETACHED_PROCESS + CREATE_NEW_PROCESS_GROUP fully separates the child.
     # macOS/Linux: start_new_session=True creates a new session (equivalent detach).
     try:
         pythonw = Path(PYTHONW_PATH_FILE.read_text(encoding='utf-8').strip())
         service_py = Path(SERVICE_PATH_FILE.read_text(encoding='utf-8').strip())
+        # Prefer the launcher: it starts the service on the first request and lets
+        # it exit when idle. Older installs without launcher.py start it directly.
+        target = service_py.with_name('launcher.py')
+        if not target.exists():
+            target = service_py
 
         if platform.system() == "Windows":
             subprocess.Popen(
-                [str(pythonw), str(service_py)],
+                [str(pythonw), str(target)],
                 creationflags=(
                     subprocess.DETACHED_PROCESS |
                     subprocess.CREATE_NEW_PROCESS_GROUP
@@ -107,17 +135,41 @@ def main() -> None:
         else:
             # macOS / Linux: start_new_session=True replaces Windows creationflags
             subprocess.Popen(
-                [str(pythonw), str(service_py)],
+                [str(pythonw), str(target)],
                 start_new_session=True,
                 close_fds=True,
                 stdin=subprocess.DEVNULL,
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
             )
+        return True
     except FileNotFoundError as exc:
         print(f"[agenttalk session_start_hook] Setup files missing — run 'agenttalk setup': {exc}", file=sys.stderr)
     except Exception as exc:
         print(f"[agenttalk session_start_hook] Failed to launch service: {exc}", file=sys.stderr)
+    return False
+
+
+def main() -> None:
+    # HOOK-04: Binary read + explicit UTF-8 decode — CP1252 safe.
+    raw = sys.stdin.buffer.read()
+    try:
+        payload = json.loads(raw.decode('utf-8'))
+    except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+        print(f"[agenttalk session_start_hook] Failed to parse stdin: {exc}", file=sys.stderr)
+        sys.exit(0)
+
+    # HOOK-02: Only auto-launch on fresh sessions.
+    # source values: 'startup' (new session), 'resume', 'clear', 'compact'.
+    # Service may already be running for resume/clear — PID check handles that.
+    source = payload.get('source', '')
+    launched = source == 'startup' and not _service_is_running() and _launch_service()
+
+    # Every source registers: resume/clear/compact may hand over a new transcript.
+    session_id = payload.get('session_id')
+    transcript_path = payload.get('transcript_path')
+    if session_id and transcript_path:
+        _register_session(session_id, transcript_path, REGISTER_WAIT_SECS if launched else 0)
 
     sys.exit(0)
 
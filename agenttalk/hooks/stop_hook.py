@@ -8,32 +8,10 @@ Registered in ~/.claude/settings.json with async: true by agenttalk setup.
 """
 import sys
 import json
-import os
-import urllib.request
-import urllib.error
-from pathlib import Path
 
-SERVICE_URL = 'http://localhost:5050/speak'
-TIMEOUT_SECS = 3  # POST completes in <1s; 3s gives headroom without long block
-
-def _config_path() -> Path:
-    appdata = os.environ.get('APPDATA') or Path.home() / 'AppData' / 'Roaming'
-    return Path(appdata) / 'AgentTalk' / 'config.json'
+from agenttalk import client
 
-def _read_speech_mode() -> str:
-    """Return speech_mode from local config file, or 'auto' on any failure."""
-    try:
-        data = json.loads(_config_path().read_text(encoding='utf-8'))
-        return data.get('speech_mode', 'auto')
-    except FileNotFoundError:
-        return 'auto'  # config not yet written — benign on first run
-    except Exception as exc:
-        print(
-            f"[agenttalk stop_hook] WARNING: could not read speech_mode "
-            f"({type(exc).__name__}: {exc}) — defaulting to 'auto'.",
-            file=sys.stderr,
-        )
-        return 'auto'
+TIMEOUT_SECS = 3  # POST completes in <1s; 3s gives headroom without long block
 
 
 def main() -> None:
@@ -56,30 +34,20 @@ def main() -> None:
     if not text:
         sys.exit(0)
 
-    # Semi-auto guard: read speech_mode directly from config file (no HTTP round-trip).
-    if _read_speech_mode() == 'semi-auto':
-        sys.exit(0)
-
     # HOOK-01: POST text to /speak endpoint.
-    # 202 = queued, 200 = skipped (alpha filter), 503 = warmup — all acceptable.
-    body = json.dumps({'text': text}).encode('utf-8')
-    req = urllib.request.Request(
-        SERVICE_URL,
-        data=body,
-        headers={'Content-Type': 'application/json'},
-        method='POST',
-    )
+    # 202 = queued (or held while the engine warms up), 200 = skipped (alpha filter),
+    # 503 = engine failed to start — all acceptable.
+    # source='auto-hook' lets the service apply the semi-auto guard (200 "skipped").
+    # session_id scopes the service's sentence dedup (Stop repeats PostToolUse text).
+    fields = {'source': 'auto-hook'}
+    if payload.get('session_id'):
+        fields['session_id'] = payload['session_id']
     try:
-        with urllib.request.urlopen(req, timeout=TIMEOUT_SECS) as _:
-            pass
-    except urllib.error.HTTPError as exc:
-        # 503 = warmup, 200/202 never reach here; anything else is unexpected
-        if exc.code not in (200, 202, 503):
-            print(
-                f"[agenttalk stop_hook] WARNING: /speak returned HTTP {exc.code}",
-                file=sys.stderr,
-            )
-    except urllib.error.URLError:
+        status = client.speak(text, timeout=TIMEOUT_SECS, **fields)
+        # 429 = queue full (dropped by design); anything else is unexpected
+        if status not in (200, 202, 429, 503):
+            print(f"[agenttalk stop_hook] WARNING: /speak returned HTTP {status}", file=sys.stderr)
+    except OSError:
         pass  # Service not running — acceptable; hook runs asynchronously
     except Exception as exc:
         print(f"[agenttalk stop_hook] Unexpected error: {exc}", file=sys.stderr)
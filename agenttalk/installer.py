@@ -2,7 +2,7 @@
 AgentTalk installer module.
 
 Provides:
-  - download_model(): Download Kokoro ONNX model files to the platform config dir
+  - download_model(): Download Kokoro ONNX model files (fp32 and/or int8) to the platform config dir
   - create_shortcut(): Create AgentTalk.lnk on the Windows desktop (Windows-only)
   - register_autostart(): Register the service for auto-start on the current platform
 
@@ -35,15 +35,20 @@ MODELS_DIR = CONFIG_DIR / "models"
 
 # Kokoro v1.0 model files — hosted on GitHub releases under the stable tag
 # model-files-v1.0 tag is the stable v1 release (see Phase 6 research pitfall 6)
+_RELEASE_URL = "https://github.com/thewh1teagle/kokoro-onnx/releases/download/model-files-v1.0/"
+
+# Kokoro weights by precision (STATE['kokoro_precision']). int8 is the
+# dynamically quantized release of the same model: ~88 MB instead of ~310 MB,
+# less memory and usually faster synthesis on CPUs without much headroom, at a
+# small cost in audio quality.
+KOKORO_MODELS: dict[str, str] = {
+    "fp32": "kokoro-v1.0.onnx",
+    "int8": "kokoro-v1.0.int8.onnx",
+}
+VOICES_FILE = "voices-v1.0.bin"
+
 MODEL_FILES: dict[str, str] = {
-    "kokoro-v1.0.onnx": (
-        "https://github.com/thewh1teagle/kokoro-onnx/releases/download/"
-        "model-files-v1.0/kokoro-v1.0.onnx"
-    ),
-    "voices-v1.0.bin": (
-        "https://github.com/thewh1teagle/kokoro-onnx/releases/download/"
-        "model-files-v1.0/voices-v1.0.bin"
-    ),
+    name: _RELEASE_URL + name for name in (*KOKORO_MODELS.values(), VOICES_FILE)
 }
 
 
@@ -51,20 +56,28 @@ MODEL_FILES: dict[str, str] = {
 # Model download
 # ---------------------------------------------------------------------------
 
-def download_model() -> None:
+def download_model(precisions=tuple(KOKORO_MODELS)) -> None:
     """
     Download Kokoro ONNX model files to the platform-appropriate models directory.
 
-    Skips files that already exist (idempotent).
+    Fetches the voices file and the model weights for each of precisions
+    (keys of KOKORO_MODELS; both by default). Skips files that already exist (idempotent).
     Uses streaming HTTP with tqdm progress bar.
     Raises requests.HTTPError on non-200 responses (e.g., HTTP 404 if URL changes).
+    Raises ValueError for an unknown precision.
 
-    INST-02: Downloads kokoro-v1.0.onnx (~310MB) and voices-v1.0.bin to config models dir.
+    INST-02: Downloads kokoro-v1.0.onnx (~310MB), kokoro-v1.0.int8.onnx (~88MB)
+             and voices-v1.0.bin to config models dir.
     INST-06: User-level paths require no admin rights on all platforms.
     """
+    unknown = set(precisions) - set(KOKORO_MODELS)
+    if unknown:
+        raise ValueError(f"Unknown Kokoro precision(s) {sorted(unknown)}; choose from {list(KOKORO_MODELS)}")
     MODELS_DIR.mkdir(parents=True, exist_ok=True)
 
-    for filename, url in MODEL_FILES.items():
+    filenames = [KOKORO_MODELS[p] for p in KOKORO_MODELS if p in precisions] + [VOICES_FILE]
+    for filename in filenames:
+        url = MODEL_FILES[filename]
         dest = MODELS_DIR / filename
         if dest.exists():
             print(f"  {filename}: already present, skipping.")
@@ -168,7 +181,7 @@ _LAUNCHD_PLIST = """\
     <array>
         <string>{python}</string>
         <string>-m</string>
-        <string>agenttalk.service</string>
+        <string>agenttalk.launcher</string>
     </array>
     <key>RunAtLoad</key>
     <true/>
@@ -190,7 +203,7 @@ After=network.target
 
 [Service]
 Type=simple
-ExecStart="{python}" -m agenttalk.service
+ExecStart="{python}" -m agenttalk.launcher
 Restart=on-failure
 RestartSec=5
 
@@ -203,6 +216,9 @@ def register_autostart(no_autostart: bool = False) -> None:
     """
     Register AgentTalk to start automatically when the user logs in.
 
+    Login starts agenttalk.launcher, not the service: it only holds the
+    sockets, and starts the service (model, tray icon) on the first request.
+
     Platform dispatch:
       Windows — schtasks.exe XML task (no admin required, Task Scheduler)
       macOS   — ~/Library/LaunchAgents/ai.agenttalk.plist (launchd)
@@ -246,7 +262,7 @@ def _register_autostart_windows() -> None:
   <Actions Context="Author">
     <Exec>
       <Command>{python_exe_xml}</Command>
-      <Arguments>-m agenttalk.service</Arguments>
+      <Arguments>-m agenttalk.launcher</Arguments>
     </Exec>
   </Actions>
   <Settings>
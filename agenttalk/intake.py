@@ -0,0 +1,88 @@
+"""
+intake.py — Holds /speak requests that arrive before the TTS worker is running.
+
+The service starts listening as soon as uvicorn is up, while Kokoro is still
+loading and warming up in the background. The first Stop hook of a session
+usually lands in that window; instead of answering 503 (which the hook treats
+as "drop it"), /speak preprocesses the text and parks the resulting queue items
+here. Once the worker has started, the loader drains the entries into
+TTS_QUEUE in arrival order and closes the intake; from then on /speak queues
+directly.
+
+LIMITS:
+At most max_entries requests are held (further requests get 429), and an
+entry older than max_age seconds is discarded at drain time — speech for a
+response the user has long since read is worse than silence.
+"""
+import collections
+import threading
+import time
+
+HELD = "held"       # offer(): entry parked until the worker starts
+FULL = "full"       # offer(): intake at max_entries — caller answers 429
+CLOSED = "closed"   # offer(): worker running — caller queues directly
+
+
+class PendingIntake:
+    """
+    Thread-safe FIFO of pre-ready /speak requests.
+
+    Args:
+        max_entries: Maximum number of held requests.
+        max_age:     Seconds after which a held request is dropped unspoken.
+    """
+
+    def __init__(self, max_entries: int, max_age: float):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._entries: collections.deque[tuple[float, list]] = collections.deque()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.expired = 0
+
+    @property
+    def pending(self) -> int:
+        """Requests currently held."""
+        with self._lock:
+            return len(self._entries)
+
+    @property
+    def pending_items(self) -> int:
+        """Queue items (sentences and cues) currently held."""
+        with self._lock:
+            return sum(len(items) for _t, items in self._entries)
+
+    def offer(self, items: list) -> str:
+        """Hold one request's queue items. Returns HELD, FULL, or CLOSED."""
+        with self._lock:
+            if self._closed:
+                return CLOSED
+            if len(self._entries) >= self.max_entries:
+                return FULL
+            self._entries.append((time.monotonic(), items))
+            return HELD
+
+    def pop_or_close(self) -> list | None:
+        """
+        Return the oldest unexpired request's items, or close the intake.
+
+        Closing happens under the same lock as offer(), so a request is either
+        held (and returned by a later call) or sees CLOSED — never lost.
+        """
+        with self._lock:
+            cutoff = time.monotonic() - self.max_age
+            while self._entries and self._entries[0][0] < cutoff:
+                self._entries.popleft()
+                self.expired += 1
+            if self._entries:
+                return self._entries.popleft()[1]
+            self._closed = True
+            return None
+
+    def close(self) -> int:
+        """Close the intake and discard anything held. Returns the number discarded."""
+        with self._lock:
+            self._closed = True
+            dropped = len(self._entries)
+            self._entries.clear()
+            return dropped
@@ -0,0 +1,189 @@
+"""
+agenttalk.launcher — Socket-activated front end for the AgentTalk service.
+
+The full service keeps the TTS model, its ONNX Runtime session, the tray icon
+and uvicorn resident. The launcher is a small process that owns the listening
+sockets instead — TCP 127.0.0.1:5050 and, where the platform has AF_UNIX,
+agenttalk.sock in the config directory — and starts `agenttalk.service` only
+when the first client connects. That connection waits in the socket backlog
+while the service starts; the service inherits the listening sockets, accepts
+it and answers as usual (/speak is held in the warmup intake until the engine
+has loaded).
+
+IDLE EXIT:
+A socket-activated service exits with IDLE_EXIT_CODE once it has seen no
+requests, speech or transcript activity for `idle_exit_s` seconds. The
+launcher holds the sockets throughout, so nothing is refused in between — the
+next connection starts a fresh service. Any other exit (tray Quit, POST /stop,
+a crash) stops the launcher too.
+
+HANDOVER:
+POSIX — the sockets are inherited file descriptors listed in
+$AGENTTALK_LISTEN_FDS. Windows — socket.share() blobs for the child's PID are
+written to its stdin and $AGENTTALK_LISTEN_FDS is "stdin".
+
+Usage:
+    python -m agenttalk.launcher [--port 5050]
+"""
+import argparse
+import atexit
+import logging
+import os
+import select
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+from agenttalk import client
+
+LISTEN_FDS_ENV = "AGENTTALK_LISTEN_FDS"
+IDLE_EXIT_CODE = 75  # EX_TEMPFAIL: exited while idle — start again on the next connection
+SERVICE_MODULE = "agenttalk.service"
+PID_NAME = "launcher.pid"
+LOG_NAME = "launcher.log"
+
+
+def listen_sockets(port: int, socket_path: str | os.PathLike | None) -> list[socket.socket]:
+    """
+    Bind the listening sockets: TCP 127.0.0.1:port, plus a Unix domain socket
+    at socket_path (unless None) where the platform supports AF_UNIX.
+
+    TCP is bound first and doubles as the instance lock: when it fails another
+    launcher or service already owns the port, and its socket file is left
+    alone. A leftover socket file from a crashed instance is replaced. The
+    socket file is owner-only and removed at exit. On Windows, where Python
+    has no AF_UNIX, clients use TCP.
+    """
+    tcp = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        if os.name != "nt":
+            tcp.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        tcp.bind(("127.0.0.1", port))
+        tcp.listen(128)
+    except OSError:
+        tcp.close()
+        raise
+    sockets = [tcp]
+    if socket_path is not None and hasattr(socket, "AF_UNIX"):
+        path = os.fspath(socket_path)
+        uds = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            _unlink(path)
+            uds.bind(path)
+            os.chmod(path, 0o600)
+            uds.listen(128)
+        except OSError:
+            uds.close()
+            logging.warning("Unix socket %s unavailable — TCP only.", path, exc_info=True)
+        else:
+            sockets.append(uds)
+            atexit.register(_unlink, path)
+    return sockets
+
+
+def inherited_sockets() -> list[socket.socket]:
+    """
+    Listening sockets handed over by the launcher; [] when started directly.
+
+    The variable is removed from the environment so processes the service
+    spawns in turn do not look for sockets of their own.
+    """
+    spec = os.environ.pop(LISTEN_FDS_ENV, "")
+    if not spec:
+        return []
+    if spec == "stdin":
+        stream = sys.stdin.buffer
+        sockets = []
+        while line := stream.readline():
+            sockets.append(socket.fromshare(stream.read(int(line))))
+        return sockets
+    return [socket.socket(fileno=int(fd)) for fd in spec.split(",")]
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def _spawn_service(sockets: list[socket.socket]) -> subprocess.Popen:
+    """Start `python -m agenttalk.service` with the listening sockets handed over."""
+    cmd = [sys.executable, "-m", SERVICE_MODULE]
+    env = dict(os.environ)
+    if os.name == "nt":
+        env[LISTEN_FDS_ENV] = "stdin"
+        proc = subprocess.Popen(cmd, env=env, stdin=subprocess.PIPE)
+        for sock in sockets:
+            blob = sock.share(proc.pid)
+            proc.stdin.write(b"%d\n" % len(blob) + blob)
+        proc.stdin.close()
+        return proc
+    fds = [sock.fileno() for sock in sockets]
+    env[LISTEN_FDS_ENV] = ",".join(map(str, fds))
+    return subprocess.Popen(cmd, env=env, pass_fds=fds, stdin=subprocess.DEVNULL)
+
+
+def serve(sockets: list[socket.socket]) -> int:
+    """
+    Start the service on each first connection until it exits for another
+    reason than idleness. Returns that exit code.
+    """
+    while True:
+        select.select(sockets, [], [])  # readable = a connection is waiting in the backlog
+        started = time.monotonic()
+        proc = _spawn_service(sockets)
+        logging.info("Connection pending — started the service (PID %d).", proc.pid)
+        try:
+            code = proc.wait()
+        except BaseException:
+            proc.terminate()
+            proc.wait()
+            raise
+        if code != IDLE_EXIT_CODE:
+            logging.info("Service exited with code %d — launcher stopping.", code)
+            return code
+        logging.info(
+            "Service exited idle after %.0f s — waiting for the next connection.",
+            time.monotonic() - started,
+        )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="agenttalk.launcher",
+        description="Own the AgentTalk sockets and start the service on first use.",
+    )
+    parser.add_argument("--port", type=int, default=client.DEFAULT_PORT, help="TCP port (default: 5050)")
+    args = parser.parse_args(argv)
+
+    config_dir = client.config_dir()
+    os.makedirs(config_dir, exist_ok=True)
+    logging.basicConfig(
+        filename=os.path.join(config_dir, LOG_NAME),
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+        encoding="utf-8",
+    )
+    try:
+        # The socket file is the default instance's (see client._addresses); others are TCP only.
+        socket_path = client.socket_path() if args.port == client.DEFAULT_PORT else None
+        sockets = listen_sockets(args.port, socket_path)
+    except OSError:
+        logging.warning("Port %d is already in use — AgentTalk is already running. Exiting.", args.port)
+        sys.exit(0)
+
+    pid_file = os.path.join(config_dir, PID_NAME)
+    with open(pid_file, "w", encoding="utf-8") as fh:
+        fh.write(str(os.getpid()))
+    atexit.register(_unlink, pid_file)
+    # SIGTERM (systemd stop, kill) unwinds through serve() so the service goes down too.
+    signal.signal(signal.SIGTERM, lambda _signum, _frame: sys.exit(0))
+    logging.info("Launcher listening on 127.0.0.1:%d (PID %d).", args.port, os.getpid())
+    sys.exit(serve(sockets))
+
+
+if __name__ == "__main__":
+    main()
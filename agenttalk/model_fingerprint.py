@@ -0,0 +1,114 @@
+"""
+model_fingerprint.py — sha256 of model files, memoised by size and mtime.
+
+The on-disk audio cache and the optimized-graph cache both key their entries
+by the sha256 of the model file, so a replaced model never produces a stale
+hit. Hashing a ~310 MB Kokoro model takes seconds, so each cache keeps a
+FingerprintIndex: a JSON index {path: {size, mtime_ns, sha256}} in its own
+directory plus an in-memory copy. Every lookup stats the file, and the file is
+hashed only when its size or mtime no longer match — once per model version,
+not once per start, and again on the next lookup when the model is replaced
+while the service runs.
+
+The computed hashes are also shared across all indexes in the process, so a
+new model version is read once even though both caches record it.
+
+Each index reports the digest it recorded before a change (`replaced`), so
+its cache can delete the entries written for the old model.
+"""
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, ContextManager
+
+# Hashes computed in this process: path -> (size, mtime_ns, sha256).
+_hashed: dict[str, tuple[int, int, str]] = {}
+_hash_lock = threading.Lock()  # one full-file hash at a time
+
+
+def sha256_file(path: str | os.PathLike) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _hash(path: str, st: os.stat_result) -> str:
+    """sha256 of path at the version st describes, computed at most once per process."""
+    stamp = (st.st_size, st.st_mtime_ns)
+    with _hash_lock:
+        cached = _hashed.get(path)
+        if cached is not None and cached[:2] == stamp:
+            return cached[2]
+        t0 = time.perf_counter()
+        digest = sha256_file(path)
+        logging.info("Hashed %s in %.2f s.", Path(path).name, time.perf_counter() - t0)
+        _hashed[path] = (*stamp, digest)
+        return digest
+
+
+class FingerprintIndex:
+    """
+    Thread-safe model fingerprints backed by a JSON index file.
+
+    Args:
+        index_path: The JSON index (its directory is created on first write).
+        lock:       Optional factory of a cross-process lock held while the
+                    index is read and rewritten.
+    """
+
+    def __init__(self, index_path: Path, lock: Callable[[], ContextManager] | None = None):
+        self.index_path = Path(index_path)
+        self._file_lock = lock or contextlib.nullcontext
+        self._lock = threading.Lock()
+        self._memo: dict[str, tuple[int, int, str]] = {}  # path -> (size, mtime_ns, sha256)
+
+    def digest(self, model_path: str | os.PathLike) -> tuple[str, str | None]:
+        """
+        Return (sha256, replaced) for the model file at model_path.
+
+        replaced is the sha256 this index recorded for the path before the
+        file changed, and None otherwise. Raises OSError if the file cannot
+        be read.
+        """
+        path = str(model_path)
+        st = os.stat(path)
+        stamp = (st.st_size, st.st_mtime_ns)
+        cached = self._memo.get(path)
+        if cached is not None and cached[:2] == stamp:
+            return cached[2], None
+        with self._lock, self._file_lock():
+            index = self._read()
+            record = index.get(path)
+            if record and (record.get("size"), record.get("mtime_ns")) == stamp:
+                digest, replaced = record["sha256"], None
+            else:
+                digest = _hash(path, st)
+                old = record.get("sha256") if record else cached[2] if cached else None
+                replaced = old if old != digest else None
+                index[path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+                self._write(index)
+            self._memo[path] = (*stamp, digest)
+        return digest, replaced
+
+    def _read(self) -> dict:
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, index: dict) -> None:
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(index, indent=2), encoding="utf-8")
+            os.replace(tmp, self.index_path)
+        except OSError:
+            logging.warning("Could not write %s.", self.index_path, exc_info=True)
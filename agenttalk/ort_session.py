@@ -0,0 +1,217 @@
+"""
+ort_session.py — ONNX Runtime session options for the TTS engines.
+
+Kokoro and Piper both run one onnxruntime.InferenceSession. With default
+options ORT sizes its intra-op thread pool to every physical core, which
+competes with uvicorn, the playback callback and concurrent synthesis workers.
+The ort_* settings in STATE / config.json are turned into SessionOptions here
+and passed to both engines, in-process and in synthesis child processes.
+
+SETTINGS:
+  ort_intra_op_threads    threads inside one operator (0 = ORT default: physical cores)
+  ort_inter_op_threads    threads across independent operators, parallel mode only (0 = default)
+  ort_execution_mode      "sequential" or "parallel"
+  ort_graph_optimization  "disabled", "basic", "extended" or "all"
+  ort_cpu_mem_arena       keep freed CPU tensors in ORT's arena for reuse (faster, holds memory)
+  ort_mem_pattern         pre-plan allocations from the first run's shapes
+  ort_provider            execution provider, e.g. "CPUExecutionProvider"; one that is not
+                          available in the installed onnxruntime falls back to the CPU provider
+  ort_graph_cache         save the optimized graph and reuse it on later loads (see below)
+
+settings_from(STATE) returns a plain, picklable dict, and its fingerprint()
+is part of each engine's key in the engine manager — changing a setting loads
+a fresh session rather than reusing one built with the old options. Functions
+taking settings also accept them as (key, value) pairs, the hashable form used
+in synth_process engine specs.
+
+OPTIMIZED GRAPH CACHE:
+Graph optimization runs on every session creation and is a large part of a
+cold start. With graph_cache_dir and ort_graph_cache on, create_session() saves the optimized graph
+(SessionOptions.optimized_model_filepath) on first load and later loads it
+with optimization disabled. Entries are keyed by the model's sha256, the
+onnxruntime version, the optimization level, the provider and the CPU — an
+"all"-level graph may contain layouts specific to this processor. Hashes are
+memoised in graph_index.json by size and mtime (see model_fingerprint.py), so a
+model is hashed once per version; entries for a replaced model or another
+onnxruntime are deleted. A cached graph that fails to load is discarded and rebuilt.
+"""
+import hashlib
+import logging
+import os
+import platform
+import time
+from pathlib import Path
+
+from agenttalk.model_fingerprint import FingerprintIndex
+
+DEFAULTS: dict = {
+    "ort_intra_op_threads": 0,
+    "ort_inter_op_threads": 0,
+    "ort_execution_mode": "sequential",
+    "ort_graph_optimization": "all",
+    "ort_cpu_mem_arena": True,
+    "ort_mem_pattern": True,
+    "ort_provider": "CPUExecutionProvider",
+    "ort_graph_cache": True,
+}
+
+GRAPH_INDEX = "graph_index.json"
+GRAPH_SUFFIX = ".opt.onnx"
+_graph_indexes: dict[Path, FingerprintIndex] = {}  # one per graph cache directory
+
+EXECUTION_MODES = ("sequential", "parallel")
+GRAPH_OPTIMIZATIONS = ("disabled", "basic", "extended", "all")
+CPU_PROVIDER = "CPUExecutionProvider"
+
+
+def settings_from(state) -> dict:
+    """The ort_* settings from state (a dict or (key, value) pairs), defaults filled in."""
+    state = dict(state)
+    return {key: default if state.get(key) is None else state[key] for key, default in DEFAULTS.items()}
+
+
+def fingerprint(settings: dict) -> tuple:
+    """settings as hashable (key, value) pairs, for engine keys and process specs."""
+    return tuple(settings_from(settings).items())
+
+
+def session_options(settings):
+    """Build onnxruntime.SessionOptions from settings. Raises ValueError on an unknown mode or level."""
+    import onnxruntime as ort  # deferred — heavy, and only needed when an engine loads
+
+    settings = settings_from(settings)
+    mode = settings["ort_execution_mode"]
+    level = settings["ort_graph_optimization"]
+    if mode not in EXECUTION_MODES:
+        raise ValueError(f"ort_execution_mode must be one of {EXECUTION_MODES}, got {mode!r}")
+    if level not in GRAPH_OPTIMIZATIONS:
+        raise ValueError(f"ort_graph_optimization must be one of {GRAPH_OPTIMIZATIONS}, got {level!r}")
+
+    opts = ort.SessionOptions()
+    opts.intra_op_num_threads = max(0, int(settings["ort_intra_op_threads"]))
+    opts.inter_op_num_threads = max(0, int(settings["ort_inter_op_threads"]))
+    opts.execution_mode = {
+        "sequential": ort.ExecutionMode.ORT_SEQUENTIAL,
+        "parallel": ort.ExecutionMode.ORT_PARALLEL,
+    }[mode]
+    opts.graph_optimization_level = {
+        "disabled": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+        "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+        "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+        "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+    }[level]
+    opts.enable_cpu_mem_arena = bool(settings["ort_cpu_mem_arena"])
+    opts.enable_mem_pattern = bool(settings["ort_mem_pattern"])
+    return opts
+
+
+def providers(settings) -> list[str]:
+    """Execution providers for a session: the configured one (if available), then CPU."""
+    import onnxruntime as ort
+
+    wanted = settings_from(settings)["ort_provider"] or CPU_PROVIDER
+    if wanted == CPU_PROVIDER:
+        return [CPU_PROVIDER]
+    if wanted not in ort.get_available_providers():
+        logging.warning(
+            "ONNX Runtime provider %s is not available (have: %s) — using %s.",
+            wanted, ", ".join(ort.get_available_providers()), CPU_PROVIDER,
+        )
+        return [CPU_PROVIDER]
+    return [wanted, CPU_PROVIDER]
+
+
+def create_session(model_path: str, settings, graph_cache_dir: str | os.PathLike | None = None):
+    """
+    Create an InferenceSession for model_path with the ort_* settings applied.
+
+    With graph_cache_dir (and ort_graph_cache on) the optimized graph is saved there on first use and
+    loaded from there afterwards (see OPTIMIZED GRAPH CACHE above).
+    """
+    import onnxruntime as ort
+
+    t0 = time.perf_counter()
+    opts = session_options(settings)
+    provider_list = providers(settings)
+    source, saving, cached = str(model_path), None, None
+    if graph_cache_dir is not None and settings_from(settings)["ort_graph_cache"]:
+        cached = _graph_path(Path(model_path), settings_from(settings), provider_list[0], Path(graph_cache_dir))
+    if cached is not None and cached.exists():
+        source = str(cached)
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+    elif cached is not None:
+        saving = cached.with_name(f"{cached.name}.{os.getpid()}.tmp")
+        opts.optimized_model_filepath = str(saving)
+
+    try:
+        session = ort.InferenceSession(source, sess_options=opts, providers=provider_list)
+    except Exception:
+        if source == str(model_path):
+            raise
+        logging.warning("Optimized graph %s failed to load — rebuilding it.", cached.name, exc_info=True)
+        _unlink(cached)
+        return create_session(model_path, settings, graph_cache_dir)
+
+    if saving is not None:
+        try:
+            os.replace(saving, cached)
+        except OSError:
+            logging.warning("Could not save optimized graph %s.", cached, exc_info=True)
+            _unlink(saving)
+    logging.info(
+        "ONNX Runtime session for %s created in %.2f s (optimized graph: %s).",
+        Path(model_path).name, time.perf_counter() - t0,
+        "off" if cached is None else "saved" if saving is not None else "cached",
+    )
+    return session
+
+
+def _graph_path(model_path: Path, settings: dict, provider: str, cache_dir: Path) -> Path | None:
+    """Cache file for model_path's optimized graph, or None when optimization is disabled."""
+    import onnxruntime as ort
+
+    level = settings["ort_graph_optimization"]
+    if level == "disabled":
+        return None
+    digest = _model_digest(model_path, cache_dir)[:16]
+    cpu = hashlib.sha256(f"{platform.machine()}|{platform.processor()}".encode("utf-8")).hexdigest()[:8]
+    ort_tag = f"ort{ort.__version__}"
+    for entry in cache_dir.glob(f"{digest}-*{GRAPH_SUFFIX}"):
+        if f"-{ort_tag}-" not in entry.name:
+            _unlink(entry)  # written by another onnxruntime release
+    provider_tag = provider.removesuffix("ExecutionProvider").lower()
+    return cache_dir / f"{digest}-{model_path.stem}-{ort_tag}-{level}-{provider_tag}-{cpu}{GRAPH_SUFFIX}"
+
+
+def _model_digest(model_path: Path, cache_dir: Path) -> str:
+    """sha256 of model_path, memoised in cache_dir's graph_index.json (see model_fingerprint.py)."""
+    index = _graph_indexes.get(cache_dir)
+    if index is None:
+        index = _graph_indexes.setdefault(cache_dir, FingerprintIndex(cache_dir / GRAPH_INDEX))
+    digest, replaced = index.digest(model_path)
+    if replaced is not None:
+        for entry in cache_dir.glob(f"{replaced[:16]}-*{GRAPH_SUFFIX}"):
+            _unlink(entry)  # graphs optimized from the replaced model
+    return digest
+
+
+def _unlink(path: Path) -> None:
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+    except OSError:
+        logging.warning("Could not remove %s.", path, exc_info=True)
+
+
+def load_kokoro(model_path: str, voices_path: str, settings=None, graph_cache_dir=None):
+    """
+    Construct kokoro_onnx.Kokoro on a session built from settings.
+
+    Also the engine factory for synthesis child processes (see synth_process.EngineSpec).
+    """
+    from kokoro_onnx import Kokoro  # deferred import — heavy
+
+    if settings is None:
+        return Kokoro(str(model_path), str(voices_path))
+    return Kokoro.from_session(create_session(model_path, settings, graph_cache_dir), str(voices_path))
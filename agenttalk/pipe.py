@@ -13,29 +13,19 @@ Options:
     --batch         Read all stdin then speak (default: line-by-line)
     --quiet         Suppress progress output
 
-Design: Zero TTS logic — this script is a thin pipe to localhost:5050/speak.
+Design: Zero TTS logic — this script is a thin pipe to /speak (see agenttalk.client).
 """
 import argparse
-import json
 import sys
-import urllib.request
-import urllib.error
 
+from agenttalk import client
 
-def _post_speak(text: str, port: int = 5050) -> bool:
+
+def _post_speak(text: str, port: int = client.DEFAULT_PORT) -> bool:
     """POST text to AgentTalk /speak. Returns True on success."""
-    url = f"http://localhost:{port}/speak"
-    body = json.dumps({"text": text}).encode("utf-8")
-    req = urllib.request.Request(
-        url,
-        data=body,
-        headers={"Content-Type": "application/json"},
-        method="POST",
-    )
     try:
-        with urllib.request.urlopen(req, timeout=3) as resp:
-            return resp.status in (200, 202)
-    except urllib.error.URLError:
+        return client.speak(text, port=port, source='pipe') in (200, 202)
+    except OSError:
         print(
             f"[agenttalk pipe] Service not reachable on port {port}. "
             "Is AgentTalk running? Start with: python -m agenttalk.service",
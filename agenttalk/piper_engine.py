@@ -3,8 +3,9 @@ piper_engine.py — Thin wrapper around piper-tts (OHF-Voice/piper1-gpl) that
 exposes the same interface as Kokoro:
 
     create(text, voice, speed, lang) -> (np.ndarray[float32], int sample_rate)
+    stream(text, voice, speed, lang) -> iterator of (np.ndarray, int sample_rate)
 
-This allows tts_worker._get_active_engine() to return either Kokoro or PiperEngine
+This allows tts_worker to lease either Kokoro or PiperEngine from its engine manager
 and call create() without branching on the engine type.
 
 TTS-04: Piper TTS available as alternate engine, switchable at runtime via /agenttalk:model.
@@ -15,14 +16,28 @@ only when PiperEngine is first instantiated (triggered by STATE['model'] == 'pip
 This prevents the 2-5s Piper init cost from affecting startup when Kokoro is the
 active engine.
 
+SESSION OPTIONS:
+With ort_settings (see ort_session.py) the voice is built on an InferenceSession
+with those options — the same construction PiperVoice.load() performs with
+default options: the .onnx.json config beside the model plus the session.
+graph_cache_dir is where that session keeps its optimized graph between loads.
+
 VOICE PARAMETER:
 Piper uses the voice model baked into the .onnx file. The 'voice' parameter accepted
 by create() is ignored — it exists only to match the Kokoro interface.
 
+STREAMING:
+stream() iterates PiperVoice.synthesize(), which yields one AudioChunk per sentence
+as soon as it is synthesized. Each chunk's float32 (or int16) array is passed through
+as-is — no WAV container, no re-read of the buffer, no extra int16 -> float32 copy.
+create() is built on stream() and concatenates the chunks for callers that need the
+whole buffer; with a single chunk (the usual case for one sentence) it returns that
+array directly.
+
 SAMPLE RATE:
-Piper outputs 22050 Hz by default. The actual framerate is read from the synthesized
-WAV buffer and returned as the second element of the create() tuple so that
-sounddevice receives the correct sample rate automatically.
+Piper outputs 22050 Hz by default. The actual rate is taken from each AudioChunk
+and returned alongside the samples so that sounddevice receives the correct sample
+rate automatically.
 
 SPEED MAPPING:
 Piper's SynthesisConfig.length_scale is the inverse of speech speed:
@@ -31,9 +46,9 @@ A speed of 1.5 -> length_scale = 0.67 (faster).
 A speed of 0.5 -> length_scale = 2.0 (slower).
 Minimum speed is clamped to 0.1 to prevent division-by-zero.
 """
-import io
+import json
 import logging
-import wave
+from collections.abc import Iterator
 
 import numpy as np
 
@@ -47,19 +62,67 @@ class PiperEngine:
                     (e.g., %APPDATA%\\AgentTalk\\models\\piper\\en_US-lessac-medium.onnx).
                     The corresponding .json config file must exist at the same path
                     with a .json extension (piper-tts loads it automatically).
+        ort_settings: Optional ort_* settings (dict or (key, value) pairs) for the
+                    ONNX Runtime session; None uses piper-tts defaults.
+        graph_cache_dir: Optional directory for the optimized-graph cache (with ort_settings only).
 
     Raises:
         FileNotFoundError: If model_path does not exist.
         ImportError: If piper-tts package is not installed (pip install piper-tts installs as 'piper' module).
     """
 
-    def __init__(self, model_path: str):
+    def __init__(self, model_path: str, ort_settings=None, graph_cache_dir=None):
         from piper import PiperVoice  # deferred import — lazy load
         logging.info("Loading Piper model from %s ...", model_path)
-        self._voice = PiperVoice.load(model_path)
-        self._sample_rate = 22050  # Piper default; updated from actual WAV framerate after first synthesis
+        if ort_settings is None:
+            self._voice = PiperVoice.load(model_path)
+        else:
+            from piper import PiperConfig
+            from agenttalk.ort_session import create_session
+            with open(f"{model_path}.json", encoding="utf-8") as fh:
+                config = PiperConfig.from_dict(json.load(fh))
+            self._voice = PiperVoice(session=create_session(model_path, ort_settings, graph_cache_dir), config=config)
+        self._sample_rate = 22050  # Piper default; updated from each synthesized chunk
         logging.info("Piper model loaded.")
 
+    def stream(
+        self,
+        text: str,
+        voice: str | None = None,
+        speed: float = 1.0,
+        lang: str = "en-us",
+        dtype: str = "float32",
+    ) -> Iterator[tuple[np.ndarray, int]]:
+        """
+        Yield audio chunk by chunk as Piper synthesizes it (one chunk per sentence
+        Piper finds in text).
+
+        Args:
+            text:  Text to synthesize.
+            voice: Ignored — Piper uses the model's built-in voice.
+            speed: Speech speed multiplier (0.1-2.0). Mapped to length_scale = 1/speed.
+            lang:  Ignored — Piper language is determined by the model.
+            dtype: "float32" (range [-1.0, 1.0]) or "int16" PCM.
+
+        Yields:
+            (samples, sample_rate) for each chunk.
+        """
+        from piper import SynthesisConfig  # deferred import
+
+        if dtype not in ("float32", "int16"):
+            raise ValueError(f"dtype must be 'float32' or 'int16', got {dtype!r}")
+
+        # Clamp speed to avoid division-by-zero
+        safe_speed = max(float(speed), 0.1)
+        cfg = SynthesisConfig(length_scale=1.0 / safe_speed)
+
+        for chunk in self._voice.synthesize(text, syn_config=cfg):
+            self._sample_rate = chunk.sample_rate
+            if dtype == "int16":
+                yield chunk.audio_int16_array, chunk.sample_rate
+            else:
+                yield chunk.audio_float_array, chunk.sample_rate
+
     def create(
         self,
         text: str,
@@ -81,27 +144,10 @@ class PiperEngine:
                 samples: np.ndarray[float32] in range [-1.0, 1.0]
                 sample_rate: int (typically 22050 Hz for Piper)
         """
-        from piper import SynthesisConfig  # deferred import
-
-        # Clamp speed to avoid division-by-zero
-        safe_speed = max(float(speed), 0.1)
-        cfg = SynthesisConfig(length_scale=1.0 / safe_speed)
-
-        # Synthesize to an in-memory WAV buffer
-        buf = io.BytesIO()
-        with wave.open(buf, "wb") as wf:
-            self._voice.synthesize_wav(text, wf, syn_config=cfg)
-
-        # Read back: extract raw PCM bytes and actual sample rate
-        buf.seek(0)
-        with wave.open(buf, "rb") as wf:
-            if wf.getnframes() == 0:
-                raise RuntimeError(
-                    f"Piper synthesized zero frames for: {text[:60]!r}"
-                )
-            raw = wf.readframes(wf.getnframes())
-            self._sample_rate = wf.getframerate()
-
-        # Convert int16 PCM -> float32 in [-1.0, 1.0]
-        samples = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+        chunks = [samples for samples, _rate in self.stream(text, speed=speed)]
+        if not chunks or not any(len(c) for c in chunks):
+            raise RuntimeError(
+                f"Piper synthesized zero frames for: {text[:60]!r}"
+            )
+        samples = chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
         return samples, self._sample_rate
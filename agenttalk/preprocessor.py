@@ -5,6 +5,10 @@ Strips markdown formatting from assistant text, segments into sentences,
 and filters out non-speakable content (JSON, symbol strings, code fragments).
 This module is the input gate for all TTS audio.
 
+split_for_latency() is a separate, optional stage applied after preprocess():
+it breaks overly long sentences at clause boundaries so the engine never has
+to synthesize a 60-word sentence before the first sound plays.
+
 Plan: 02-01 — Text Preprocessing Pipeline (TDD)
 Requirements: AUDIO-02, AUDIO-03
 """
@@ -142,3 +146,128 @@ def preprocess(text: str) -> list[str]:
         sentences = segment_sentences(cleaned)
         result.extend(s.strip() for s in sentences if is_speakable(s))
     return result
+
+
+# ---------------------------------------------------------------------------
+# Latency-oriented clause splitting
+# ---------------------------------------------------------------------------
+
+# Clause boundaries, strongest first. Each pattern matches the gap between two
+# clauses; the left clause keeps its punctuation, the right clause starts at
+# match.end(). Conjunction matches are zero-width before the word so the
+# conjunction opens the next clause ("..., and then" -> "and then ...").
+_CLAUSE_BREAKS: list[tuple[re.Pattern, int]] = [
+    (re.compile(r"(?<=[;:])\s+"), 3),
+    (re.compile(r"(?<=\u2014)\s*|(?<=--)\s*|(?<=\s\u2013)\s+"), 3),
+    (re.compile(r"(?<=,)\s+"), 2),
+    (re.compile(
+        r"\s+(?=(?:and|but|or|so|because|which|while|although|though|whereas|"
+        r"unless|until|then)\b)",
+        re.IGNORECASE,
+    ), 1),
+]
+
+# Clauses shorter than this are never produced — a lone "So," or "Then,"
+# costs a synthesis call and sounds choppy.
+_MIN_CLAUSE_CHARS = 12
+
+
+def _clause_cuts(sentence: str) -> list[tuple[int, int, int]]:
+    """Return (left_end, right_start, strength) for every usable clause boundary."""
+    cuts = []
+    for pattern, strength in _CLAUSE_BREAKS:
+        for m in pattern.finditer(sentence):
+            left_end, right_start = m.start(), m.end()
+            if left_end < _MIN_CLAUSE_CHARS or len(sentence) - right_start < _MIN_CLAUSE_CHARS:
+                continue
+            cuts.append((left_end, right_start, strength))
+    return cuts
+
+
+def split_clauses(sentence: str, max_chars: int) -> list[str]:
+    """
+    Split a sentence at clause boundaries into chunks of at most max_chars.
+
+    Cut choice, per chunk:
+      1. Among boundaries that keep the chunk within max_chars and at least
+         half of it, take the strongest (; : and dashes > commas > conjunctions),
+         then the latest — balanced chunks with natural pauses.
+      2. Otherwise take the latest boundary within max_chars.
+      3. If no boundary fits, take the earliest boundary past max_chars.
+      4. If there is no usable boundary at all, the remainder is left whole —
+         a clause is never split mid-phrase.
+
+    Args:
+        sentence: A single sentence (output of preprocess()).
+        max_chars: Character budget per chunk. <= 0 disables splitting.
+
+    Returns:
+        List of stripped clause chunks; [sentence] when no split is needed.
+    """
+    chunks = []
+    rest = sentence.strip()
+    while max_chars > 0 and len(rest) > max_chars:
+        cuts = _clause_cuts(rest)
+        if not cuts:
+            break
+        within = [c for c in cuts if c[0] <= max_chars]
+        balanced = [c for c in within if c[0] >= max_chars // 2]
+        if balanced:
+            left_end, right_start, _ = max(balanced, key=lambda c: (c[2], c[0]))
+        elif within:
+            left_end, right_start, _ = max(within, key=lambda c: c[0])
+        else:
+            left_end, right_start, _ = min(cuts, key=lambda c: c[0])
+        chunks.append(rest[:left_end].strip())
+        rest = rest[right_start:].strip()
+    if rest:
+        chunks.append(rest)
+    return chunks
+
+
+def split_for_latency(
+    sentences: list[str],
+    max_chars: int,
+    first_max_chars: int | None = None,
+) -> list[str]:
+    """
+    Break overly long sentences into clause chunks to cut time-to-first-audio.
+
+    Synthesis cost grows with sentence length and nothing plays until the
+    first chunk is synthesized, so the first sentence of a response is split
+    against a tighter budget (first_max_chars) — only its first chunk needs to
+    be short; later chunks synthesize while it plays. Every other sentence
+    uses max_chars.
+
+    Args:
+        sentences: Output of preprocess().
+        max_chars: Budget for all chunks after the first. <= 0 disables.
+        first_max_chars: Budget for the first chunk of the response.
+                         None or <= 0 uses max_chars.
+
+    Returns:
+        Flat list of chunks, in order.
+    """
+    groups = split_for_latency_groups(sentences, max_chars, first_max_chars)
+    return [chunk for group in groups for chunk in group]
+
+
+def split_for_latency_groups(
+    sentences: list[str],
+    max_chars: int,
+    first_max_chars: int | None = None,
+) -> list[list[str]]:
+    """
+    split_for_latency(), with the chunks of each input sentence kept together.
+
+    Returns one list of chunks per sentence, in order, so a caller can tell
+    which sentences were fully queued when only some chunks were.
+    """
+    groups: list[list[str]] = []
+    for i, sentence in enumerate(sentences):
+        if i == 0 and first_max_chars and first_max_chars > 0:
+            head, *tail = split_clauses(sentence, first_max_chars)
+            groups.append([head, *(split_clauses(" ".join(tail), max_chars) if tail else [])])
+        else:
+            groups.append(split_clauses(sentence, max_chars))
+    return groups
@@ -7,12 +7,13 @@ No special subprocess flags are needed for the service process itself.
 """
 import os
 import sys
+import json
 import logging
 import atexit
 import threading
 from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Literal
+from typing import Annotated, Literal
 
 import queue
 import time
@@ -20,16 +21,29 @@ import time
 import psutil
 import sounddevice as sd
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 
 import pystray
 
-from agenttalk.tts_worker import TTS_QUEUE, STATE, start_tts_worker, _ducker, _CueItem
+from agenttalk.tts_worker import (
+    TTS_QUEUE, STATE, start_tts_worker, pipeline_stats, cache_stats, disk_cache_stats,
+    speculate, speculative_stats, first_audio_at,
+    engine_lease, engine_stats, engine_status, configure_engines, prefetch_engine,
+    get_audio_output, stop_playback, MAX_SYNTH_WORKERS,
+    _ducker, _CueItem,
+)
 from agenttalk.tray import build_tray_icon
 from agenttalk.config_loader import load_config, save_config, _config_dir
-from agenttalk.preprocessor import preprocess
+from agenttalk.client import DEFAULT_PORT, SOCKET_NAME
+from agenttalk.preprocessor import preprocess, split_for_latency, split_for_latency_groups
+from agenttalk.dedup import SentenceDedup
+from agenttalk.installer import KOKORO_MODELS, VOICES_FILE
+from agenttalk.intake import FULL, HELD, PendingIntake
+from agenttalk.launcher import IDLE_EXIT_CODE, inherited_sockets, listen_sockets
+from agenttalk.ort_session import DEFAULTS as ORT_DEFAULTS
+from agenttalk.transcript_watcher import TranscriptWatcher
 
 # ---------------------------------------------------------------------------
 # Platform-aware paths (cross-platform via _config_dir())
@@ -37,10 +51,12 @@ from agenttalk.preprocessor import preprocess
 APPDATA_DIR = _config_dir()
 LOG_FILE    = APPDATA_DIR / "agenttalk.log"
 PID_FILE    = APPDATA_DIR / "service.pid"
+SOCKET_PATH = APPDATA_DIR / SOCKET_NAME  # Unix domain socket for local clients (see client.py)
+SESSIONS_FILE = APPDATA_DIR / "sessions.json"  # registered transcripts, kept across an idle exit
 MODELS_DIR  = APPDATA_DIR / "models"
 
-MODEL_PATH  = MODELS_DIR / "kokoro-v1.0.onnx"
-VOICES_PATH = MODELS_DIR / "voices-v1.0.bin"
+MODEL_PATHS = {precision: MODELS_DIR / name for precision, name in KOKORO_MODELS.items()}
+VOICES_PATH = MODELS_DIR / VOICES_FILE
 
 # ---------------------------------------------------------------------------
 # Logging — must be initialised before any other code runs in main()
@@ -115,37 +131,6 @@ def _release_pid_lock() -> None:
     logging.info("PID lock released.")
 
 
-# ---------------------------------------------------------------------------
-# TTS engine — kokoro-onnx
-# ---------------------------------------------------------------------------
-
-def _load_and_warmup_kokoro():
-    """
-    Load Kokoro model and perform a warmup synthesis call.
-    Warmup forces ONNX JIT compilation, eliminating 3-8s first-request latency.
-    Returns the loaded Kokoro instance.
-    Raises FileNotFoundError if model files are missing.
-    """
-    for p in (MODEL_PATH, VOICES_PATH):
-        if not p.exists():
-            raise FileNotFoundError(f"Model file missing: {p}\nRun 'agenttalk setup' to download.")
-
-    from kokoro_onnx import Kokoro  # deferred import — logging is already active
-
-    logging.info("Loading Kokoro model from %s ...", MODEL_PATH)
-    kokoro = Kokoro(str(MODEL_PATH), str(VOICES_PATH))
-    logging.info("Kokoro model loaded. Running warmup synthesis...")
-
-    _samples, _rate = kokoro.create(
-        "Warmup.",
-        voice="af_heart",
-        speed=1.0,
-        lang="en-us",
-    )
-    logging.info("Warmup synthesis complete (samples=%d, rate=%d).", len(_samples), _rate)
-    return kokoro
-
-
 # ---------------------------------------------------------------------------
 # Audio playback — sounddevice (PortAudio/MME handles sample rate conversion)
 # ---------------------------------------------------------------------------
@@ -188,8 +173,11 @@ def _configure_audio() -> None:
 
 def play_audio(samples, sample_rate: int) -> None:
     """
-    Play numpy audio samples synchronously through the default output device.
-    sd.wait() is mandatory — without it, audio truncates silently (garbage collection).
+    Play numpy audio samples synchronously through the shared output stream.
+
+    Uses the same persistent AudioOutput as the TTS playback stage, so no
+    PortAudio stream is opened or torn down per call. Blocks until the
+    buffered audio has drained.
 
     WASAPI note: WasapiSettings(auto_convert=True) is NOT used here — empirical testing
     shows that PortAudio/MME handles 24000 Hz vs 44100/48000 Hz sample rate conversion
@@ -197,8 +185,9 @@ def play_audio(samples, sample_rate: int) -> None:
     PaErrorCode -9984 (Incompatible host API specific stream info).
     If WASAPI exclusive mode is needed for a specific device, pass it explicitly.
     """
-    sd.play(samples, samplerate=sample_rate)
-    sd.wait()  # Block until playback finishes — do NOT omit; audio truncates silently
+    output = get_audio_output()
+    output.play(samples, sample_rate)
+    output.wait()
 
 
 # ---------------------------------------------------------------------------
@@ -206,9 +195,27 @@ def play_audio(samples, sample_rate: int) -> None:
 # ---------------------------------------------------------------------------
 
 is_ready: bool = False
-_kokoro_engine = None
+# /speak requests received before the worker is running — drained by _startup().
+_intake = PendingIntake(
+    max_entries=STATE["warmup_buffer_size"], max_age=STATE["warmup_buffer_max_age_s"],
+)
+# Sentences recently spoken per session — suppresses Stop/PostToolUse repeats.
+_dedup = SentenceDedup(ttl=STATE["dedup_ttl_s"])
+# Follows registered session transcripts and speaks intermediate messages.
+_watcher = TranscriptWatcher(
+    on_text=lambda session_id, text: _speak_from_transcript(session_id, text),
+    poll_interval=STATE["transcript_poll_ms"] / 1000,
+    on_candidate=lambda session_id, text: _speculate_text(text, session_id),
+)
 # Tray icon reference — set by _setup() callback, read by _lifespan to pass to start_tts_worker.
 _tray_icon = None
+# Socket activation (see launcher.py): set by _start_http_server() when the listening
+# sockets were handed over; only then does the service exit after idle_exit_s.
+_socket_activated = False
+_http_server = None
+_idle_exit_requested = False
+_last_activity = time.monotonic()
+IDLE_CHECK_S = 5.0  # how often the idle-exit thread re-checks
 
 
 class SpeakRequest(BaseModel):
@@ -219,6 +226,38 @@ class SpeakRequest(BaseModel):
         description="Text to speak. Markdown is stripped automatically (bold, code blocks, URLs, etc.).",
         examples=["Hello, world! AgentTalk will speak this aloud."],
     )
+    session_id: str | None = Field(
+        None,
+        description="Agent session ID. Sentences already spoken in this session within `dedup_ttl_s` are skipped; omit to always speak.",
+        examples=["3f2c9a1e-5b7d-4e0a-9c1f-2d8e6b4a7c90"],
+    )
+    speculative: bool = Field(
+        False,
+        description="Pre-synthesize the text into the audio cache at low priority without playing it, so a later /speak of the same sentences starts immediately.",
+        examples=[False],
+    )
+    source: Literal["auto-hook", "manual", "pipe"] = Field(
+        "manual",
+        description="Who is asking. 'auto-hook' requests (agent hooks speaking every reply) are skipped in semi-auto speech mode; 'manual' and 'pipe' are always spoken.",
+        examples=["auto-hook"],
+    )
+
+
+class SessionRequest(BaseModel):
+    """Request body for POST /sessions."""
+
+    session_id: str = Field(
+        ...,
+        min_length=1,
+        description="Agent session ID (the hook payload's session_id).",
+        examples=["3f2c9a1e-5b7d-4e0a-9c1f-2d8e6b4a7c90"],
+    )
+    transcript_path: str = Field(
+        ...,
+        min_length=1,
+        description="Absolute path to the session's JSONL transcript. It need not exist yet.",
+        examples=["C:/Users/user/.claude/projects/my-project/3f2c9a1e.jsonl"],
+    )
 
 
 class ConfigRequest(BaseModel):
@@ -246,6 +285,11 @@ class ConfigRequest(BaseModel):
         description="TTS engine to use. 'kokoro' (default, high quality) or 'piper' (alternative, requires piper_model_path).",
         examples=["kokoro", "piper"],
     )
+    kokoro_precision: Literal["fp32", "int8"] | None = Field(
+        None,
+        description="Kokoro weights: 'fp32' (default) or 'int8' (quantized — less memory, usually faster on modest CPUs). The selected file must be downloaded (agenttalk setup --precision).",
+        examples=["fp32", "int8"],
+    )
     muted: bool | None = Field(
         None,
         description="When true, audio playback is suppressed without affecting the queue.",
@@ -271,48 +315,339 @@ class ConfigRequest(BaseModel):
         description="Speech mode: 'auto' (speak every reply) or 'semi-auto' (only speak when /speak is invoked).",
         examples=["auto", "semi-auto"],
     )
+    sentence_gap_ms: int | None = Field(
+        None,
+        description="Silence inserted between consecutive sentences, in milliseconds.",
+        ge=0, le=2000,
+        examples=[50],
+    )
+    clause_max_chars: int | None = Field(
+        None,
+        description="Split sentences longer than this at clause boundaries (commas, semicolons, dashes, conjunctions). 0 disables.",
+        ge=0, le=2000,
+        examples=[160],
+    )
+    first_chunk_max_chars: int | None = Field(
+        None,
+        description="Character budget for the first chunk of each response — keeps time-to-first-audio low. 0 uses clause_max_chars.",
+        ge=0, le=2000,
+        examples=[60],
+    )
+    first_chunk_target_ms: int | None = Field(
+        None,
+        description="Target synthesis time for the first chunk; the budget shrinks to fit the measured engine throughput. 0 disables.",
+        ge=0, le=10000,
+        examples=[300],
+    )
+    audio_cache_mb: float | None = Field(
+        None,
+        description="Memory budget for cached synthesized audio, in MB. 0 disables the cache.",
+        ge=0, le=4096,
+        examples=[32],
+    )
+    disk_cache_mb: float | None = Field(
+        None,
+        description="Size cap for the persistent on-disk audio cache, in MB. 0 disables it.",
+        ge=0, le=65536,
+        examples=[256],
+    )
+    streaming: bool | None = Field(
+        None,
+        description="Play synthesized audio chunk by chunk as the engine produces it instead of waiting for each whole sentence.",
+        examples=[True],
+    )
+    synth_workers: Literal["auto"] | Annotated[int, Field(ge=1, le=MAX_SYNTH_WORKERS)] | None = Field(
+        None,
+        description="Sentences synthesized concurrently. 'auto' sizes the pool from the CPU core count and the measured real-time factor.",
+        examples=["auto", 4],
+    )
+    synth_isolation: Literal["thread", "process"] | None = Field(
+        None,
+        description="'thread' synthesizes on threads sharing the loaded engine; 'process' runs synthesis in child processes so inference never competes with HTTP handling and playback for the GIL.",
+        examples=["process"],
+    )
+    speculative: bool | None = Field(
+        None,
+        description="Pre-synthesize text that is likely to be spoken soon (speculative /speak requests, held transcript messages) while synthesis is idle.",
+        examples=[True],
+    )
+    dedup_ttl_s: float | None = Field(
+        None,
+        description="Seconds a sentence spoken in a session suppresses repeats of it from the same session. 0 disables.",
+        ge=0, le=86400,
+        examples=[300],
+    )
+    transcript_watch: bool | None = Field(
+        None,
+        description="Follow session transcripts registered by the SessionStart hook and speak intermediate assistant messages (the ones followed by a tool call). Off by default; turning it off stops following registered sessions.",
+        examples=[True],
+    )
+    idle_exit_s: float | None = Field(
+        None,
+        description="When started by agenttalk.launcher, exit after this many seconds without requests, speech or transcript activity; the launcher restarts the service on the next connection. 0 disables.",
+        ge=0, le=604800,
+        examples=[1800],
+    )
+    engine_idle_unload_s: float | None = Field(
+        None,
+        description="Unload a TTS engine after this many seconds unused; it is reloaded and warmed on the next request that needs synthesis. 0 keeps engines loaded.",
+        ge=0, le=604800,
+        examples=[900],
+    )
+    engine_memory_budget_mb: float | None = Field(
+        None,
+        description="Unload least-recently-used TTS engines while the loaded engines together exceed this many MB of resident memory. The engine in use is never unloaded. 0 disables the cap.",
+        ge=0, le=65536,
+        examples=[512],
+    )
+    piper_pool_size: int | None = Field(
+        None,
+        description="Piper voices kept loaded at once, so switching back to a recently used voice is instant. The least recently used voice beyond this is unloaded.",
+        ge=1, le=16,
+        examples=[3],
+    )
+    piper_pool_mb: float | None = Field(
+        None,
+        description="Cap on the resident memory of the loaded Piper voices; least recently used voices are unloaded above it. 0 disables the cap.",
+        ge=0, le=65536,
+        examples=[400],
+    )
+    ort_intra_op_threads: int | None = Field(
+        None,
+        description="ONNX Runtime threads inside one operator, for both engines. 0 = ORT default (all physical cores). Changing any ort_* setting loads new engine sessions in the background.",
+        ge=0, le=256,
+        examples=[4],
+    )
+    ort_inter_op_threads: int | None = Field(
+        None,
+        description="ONNX Runtime threads across independent operators (used in parallel execution mode). 0 = ORT default.",
+        ge=0, le=256,
+        examples=[1],
+    )
+    ort_execution_mode: Literal["sequential", "parallel"] | None = Field(
+        None,
+        description="ONNX Runtime execution mode.",
+        examples=["sequential"],
+    )
+    ort_graph_optimization: Literal["disabled", "basic", "extended", "all"] | None = Field(
+        None,
+        description="ONNX Runtime graph optimization level applied when a session loads.",
+        examples=["all"],
+    )
+    ort_cpu_mem_arena: bool | None = Field(
+        None,
+        description="Keep freed CPU tensors in ONNX Runtime's arena for reuse (faster; holds on to peak memory).",
+        examples=[True],
+    )
+    ort_mem_pattern: bool | None = Field(
+        None,
+        description="Let ONNX Runtime pre-plan allocations from the shapes of the first run.",
+        examples=[True],
+    )
+    ort_provider: str | None = Field(
+        None,
+        description="ONNX Runtime execution provider, e.g. CPUExecutionProvider, DnnlExecutionProvider or OpenVINOExecutionProvider. Providers not available in the installed onnxruntime fall back to CPUExecutionProvider.",
+        min_length=1, max_length=64,
+        examples=["CPUExecutionProvider"],
+    )
+    ort_graph_cache: bool | None = Field(
+        None,
+        description="Save each engine's optimized ONNX graph under models/.cache and load it on later starts instead of re-optimizing.",
+        examples=[True],
+    )
 
 
-@asynccontextmanager
-async def _lifespan(app: FastAPI):
-    """FastAPI lifespan: load Kokoro before accepting requests; set is_ready after warmup."""
-    global is_ready, _kokoro_engine
+def _startup() -> None:
+    """
+    Start the TTS worker, load the configured engine, then drain requests held during warmup.
+
+    Runs in the 'engine-startup' thread so uvicorn is accepting connections
+    (and /speak is buffering into _intake) while the model loads.
+    """
+    global is_ready
     try:
         _configure_audio()
-        _kokoro_engine = _load_and_warmup_kokoro()
-        is_ready = True
-        logging.info("Service ready. /health will return 200.")
 
-        # Phase 4: Start TTS worker AFTER Kokoro loads, passing the tray icon reference.
-        # _tray_icon is set by _setup() before _start_http_server() is called, so it is
-        # populated by the time _lifespan runs inside uvicorn.
-        start_tts_worker(_kokoro_engine, icon=_tray_icon)
+        # Phase 4: Start TTS worker with the tray icon reference. _tray_icon is set by
+        # _setup() before _start_http_server() is called, so it is populated by the
+        # time this thread runs.
+        start_tts_worker(icon=_tray_icon, kokoro_model_paths=MODEL_PATHS, kokoro_voices_path=VOICES_PATH)
         logging.info("TTS worker started with icon reference.")
-
-        # Startup audio: confirms full pipeline is working.
-        logging.info("Running startup audio proof: synthesizing 'AgentTalk is running.'")
-        samples, rate = _kokoro_engine.create(
-            "AgentTalk is running.",
-            voice="af_heart",
-            speed=1.0,
-            lang="en-us",
+        # Load and warm only the engine config.json selects; the other loads when
+        # STATE['model'] switches to it (see engine_manager.py).
+        t0 = time.perf_counter()
+        startup_model = _load_startup_engine()
+        is_ready = True
+        logging.info(
+            "Service ready in %.2f s since process start (engine load + warmup %.2f s). /health will return 200.",
+            time.time() - psutil.Process().create_time(), time.perf_counter() - t0,
         )
-        play_audio(samples, rate)
-        logging.info("Startup audio playback complete.")
+
+        # Held requests go first; when there were any, real speech confirms the
+        # pipeline and the startup phrase is skipped.
+        had_pending = _intake.pending > 0
+        _drain_intake()
+        if not had_pending:
+            # Startup audio: confirms full pipeline is working.
+            logging.info("Running startup audio proof: synthesizing 'AgentTalk is running.'")
+            with engine_lease(startup_model) as engine:
+                samples, rate = engine.create(
+                    "AgentTalk is running.",
+                    voice="af_heart",
+                    speed=1.0,
+                    lang="en-us",
+                )
+            play_audio(samples, rate)
+            logging.info("Startup audio playback complete.")
 
     except FileNotFoundError:
         logging.error(
             "Model files missing — service will start but /health returns 503 until models are present."
         )
     except Exception:
-        logging.exception("Error during Kokoro startup — service degraded; /health returns 503.")
+        logging.exception("Error during engine startup — service degraded; /health returns 503.")
+    finally:
+        if not is_ready:
+            dropped = _intake.close()
+            if dropped:
+                logging.warning("Discarded %d request(s) held during failed startup.", dropped)
+
+
+def _load_startup_engine() -> str:
+    """
+    Load and warm the engine selected by STATE['model']; return its name.
+
+    When Piper is selected but cannot be loaded (no model path, piper-tts not
+    installed, model file missing), Kokoro is loaded instead so the service
+    still comes up — synthesis keeps reporting the Piper error until the
+    configuration is fixed or the model is switched back.
+    """
+    model = STATE.get("model", "kokoro")
+    logging.info("Loading startup engine: %s", model)
+    try:
+        with engine_lease(model):
+            return model
+    except (RuntimeError, ImportError, FileNotFoundError) as exc:
+        if model == "kokoro":
+            raise
+        logging.error("Startup engine %s failed to load (%s) — loading Kokoro instead.", model, exc)
+    with engine_lease("kokoro"):
+        return "kokoro"
+
+
+def _drain_intake() -> None:
+    """Move held requests into TTS_QUEUE in arrival order, then close the intake."""
+    drained = 0
+    while (items := _intake.pop_or_close()) is not None:
+        for item in items:
+            TTS_QUEUE.put(item)  # blocking — the worker is running and will make room
+        drained += 1
+    if drained or _intake.expired:
+        logging.info(
+            "Warmup intake drained: %d request(s) queued, %d expired.", drained, _intake.expired,
+        )
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    """FastAPI lifespan: start loading the TTS engine in the background; is_ready is set after warmup."""
+    global is_ready
+    _intake.max_entries = int(STATE.get("warmup_buffer_size", 20))
+    _intake.max_age = float(STATE.get("warmup_buffer_max_age_s", 120))
+    _watcher.poll_interval = float(STATE.get("transcript_poll_ms", 500)) / 1000
+    _restore_sessions()
+    threading.Thread(target=_startup, daemon=True, name="engine-startup").start()
+    if _socket_activated:
+        threading.Thread(target=_idle_exit_loop, daemon=True, name="idle-exit").start()
 
     yield  # Service runs here
 
     is_ready = False
+    _watcher.stop()
     logging.info("FastAPI shutdown complete.")
 
 
+# ---------------------------------------------------------------------------
+# Idle exit — socket-activated services only (see launcher.py)
+# ---------------------------------------------------------------------------
+
+def _pipeline_busy() -> bool:
+    """True while speech is queued, held for the engine, or playing."""
+    return bool(STATE.get("speaking")) or not TTS_QUEUE.empty() or _intake.pending > 0
+
+
+def _idle_seconds() -> float:
+    """Seconds since the last sign of use: an API request, speech, or a transcript growing."""
+    if _pipeline_busy():
+        return 0.0
+    idle = time.monotonic() - _last_activity
+    for session in _watcher.sessions():
+        idle = min(idle, session["idle_s"])
+    return idle
+
+
+def _idle_exit_loop() -> None:
+    """
+    'idle-exit' thread: once idle for idle_exit_s (0 = never), stop uvicorn.
+
+    Uvicorn stops accepting, finishes requests in flight and runs the lifespan
+    shutdown; _exit_idle() then waits for speech to drain. Connections arriving
+    meanwhile wait in the launcher's socket backlog for the next service.
+    """
+    global _idle_exit_requested
+    while True:
+        time.sleep(IDLE_CHECK_S)
+        limit = float(STATE.get("idle_exit_s", 0))
+        if limit > 0 and _idle_seconds() >= limit:
+            break
+    logging.info("Idle for %.0f s — stopping; the launcher restarts the service on demand.", limit)
+    _idle_exit_requested = True
+    _http_server.should_exit = True
+
+
+def _exit_idle() -> None:
+    """Finish an idle exit once uvicorn has stopped: drain speech, keep sessions, exit."""
+    while _pipeline_busy():
+        time.sleep(0.1)
+    _save_sessions()
+    _ducker.unduck()
+    _release_pid_lock()
+    logging.info("Exiting idle (code %d).", IDLE_EXIT_CODE)
+    logging.shutdown()
+    os._exit(IDLE_EXIT_CODE)
+
+
+def _save_sessions() -> None:
+    """Write the registered transcripts so the next service follows them again."""
+    sessions = [
+        {"session_id": s["session_id"], "transcript_path": s["transcript_path"]}
+        for s in _watcher.sessions()
+    ]
+    if not sessions:
+        return
+    try:
+        SESSIONS_FILE.write_text(json.dumps(sessions), encoding="utf-8")
+    except OSError:
+        logging.warning("Could not save %d session(s) to %s.", len(sessions), SESSIONS_FILE, exc_info=True)
+
+
+def _restore_sessions() -> None:
+    """Re-register transcripts saved by an idle exit, following them from their current end."""
+    try:
+        sessions = json.loads(SESSIONS_FILE.read_text(encoding="utf-8"))
+        SESSIONS_FILE.unlink()
+    except FileNotFoundError:
+        return
+    except (OSError, ValueError):
+        logging.warning("Ignoring unreadable %s.", SESSIONS_FILE, exc_info=True)
+        return
+    if not STATE.get("transcript_watch"):
+        return
+    for s in sessions:
+        _watcher.register(s["session_id"], s["transcript_path"])
+    logging.info("Restored %d session(s) from the previous idle exit.", len(sessions))
+
+
 _DESCRIPTION = """
 AgentTalk is a local Windows text-to-speech service supporting two offline TTS engines:
 
@@ -336,7 +671,8 @@ curl -X POST http://localhost:5050/speak \\
 - Text is **preprocessed**: Markdown stripped, code blocks removed, URLs removed, whitespace normalised.
 - Audio is **queued** — multiple calls stack up and play in order (FIFO, max 10 items).
 - If the queue is full the request is dropped with **429**; the caller may retry.
-- While the TTS engine is loading all endpoints return **503**.
+- While the TTS engine is loading, `/speak` requests are **held** (202, `"status": "buffered"`)
+  and spoken in order once it is ready; `/health` returns **503** with the number pending.
 
 ## Engine switching
 
@@ -371,21 +707,37 @@ app = FastAPI(
 )
 
 
+@app.middleware("http")
+async def _track_activity(request: Request, call_next):
+    """Every request except health probes postpones the idle exit."""
+    global _last_activity
+    if request.url.path != "/health":
+        _last_activity = time.monotonic()
+    return await call_next(request)
+
+
 @app.get(
     "/health",
     tags=["Status"],
     summary="Service health check",
     responses={
         200: {"description": "Service is ready and accepting requests."},
-        503: {"description": "Kokoro model is still loading — retry shortly."},
+        503: {"description": "TTS engine is still loading — retry shortly."},
     },
 )
 def health():
     """Returns `{"status": "ok"}` once the TTS engine has loaded and the worker is running.
-    Returns `{"status": "initializing"}` with HTTP 503 while the model is loading (~5–15 s on first launch)."""
+    Returns `{"status": "initializing"}` with HTTP 503 while the model is loading (~5–15 s on first launch).
+    `pending` is the number of `/speak` requests held until the engine is ready.
+
+    `engine` reports the selected engine (`model`) after a switch: `loading` with `loading_s`
+    elapsed (compare `last_load_s`, the previous load of that model), `serving` — the engine
+    still speaking until the swap — and `error` if its last load failed."""
     if not is_ready:
-        return JSONResponse({"status": "initializing"}, status_code=503)
-    return JSONResponse({"status": "ok"}, status_code=200)
+        return JSONResponse({"status": "initializing", "pending": _intake.pending}, status_code=503)
+    return JSONResponse(
+        {"status": "ok", "pending": _intake.pending, "engine": engine_status()}, status_code=200,
+    )
 
 
 @app.get(
@@ -415,16 +767,36 @@ def get_config():
     """Returns the full current runtime state:
     - `voice`: active Kokoro voice ID (used when `model` is `kokoro`)
     - `model`: active TTS engine — `"kokoro"` or `"piper"`
+    - `kokoro_precision`: Kokoro weights — `"fp32"` or `"int8"` (quantized)
     - `speed`: speech speed multiplier (0.5–2.0)
     - `volume`: playback volume (0.0–1.0)
     - `muted`: when true, synthesis is skipped entirely
     - `pre_cue_path` / `post_cue_path`: optional WAV paths played before/after each utterance
     - `piper_model_path`: absolute path to the active Piper ONNX model (used when `model` is `piper`)
     - `speech_mode`: `"auto"` (speak every reply) or `"semi-auto"` (only speak when /speak is invoked)
+    - `sentence_gap_ms`: silence inserted between consecutive sentences
+    - `clause_max_chars` / `first_chunk_max_chars` / `first_chunk_target_ms`: clause splitting
+      budgets for long sentences and for the first chunk of each response
+    - `audio_cache_mb`: memory budget for cached synthesized audio (0 = disabled)
+    - `disk_cache_mb`: size cap for the persistent on-disk audio cache (0 = disabled)
+    - `streaming`: when true, playback starts on the first synthesized chunk of a sentence
+    - `synth_workers`: concurrent synthesis workers — an integer, or `"auto"`
+    - `synth_isolation`: `"thread"` or `"process"` (synthesis in child processes)
+    - `speculative`: pre-synthesize likely-upcoming text into the audio cache while idle
+    - `dedup_ttl_s`: window in which a sentence already spoken in a session is not repeated
+    - `transcript_watch`: follow registered session transcripts and speak intermediate messages
+    - `idle_exit_s`: idle period after which a service started by `agenttalk.launcher` exits
+    - `engine_idle_unload_s` / `engine_memory_budget_mb`: when loaded TTS engines are unloaded
+      (after this long unused / above this resident total); they reload on demand
+    - `piper_pool_size` / `piper_pool_mb`: how many Piper voices (and MB) stay loaded for instant switching
+    - `ort_*`: ONNX Runtime session options for both engines — intra-/inter-op threads, execution
+      mode, graph optimization level, CPU memory arena and memory pattern, execution provider,
+      and whether optimized graphs are cached on disk
     """
     return JSONResponse({
         "voice":            STATE.get("voice"),
         "model":            STATE.get("model"),
+        "kokoro_precision": STATE.get("kokoro_precision"),
         "speed":            STATE.get("speed"),
         "volume":           STATE.get("volume"),
         "muted":            STATE.get("muted"),
@@ -432,9 +804,103 @@ def get_config():
         "post_cue_path":    STATE.get("post_cue_path"),
         "piper_model_path": STATE.get("piper_model_path"),
         "speech_mode":      STATE.get("speech_mode"),
+        "sentence_gap_ms":  STATE.get("sentence_gap_ms"),
+        "clause_max_chars":      STATE.get("clause_max_chars"),
+        "first_chunk_max_chars": STATE.get("first_chunk_max_chars"),
+        "first_chunk_target_ms": STATE.get("first_chunk_target_ms"),
+        "audio_cache_mb":   STATE.get("audio_cache_mb"),
+        "disk_cache_mb":    STATE.get("disk_cache_mb"),
+        "streaming":        STATE.get("streaming"),
+        "synth_workers":    STATE.get("synth_workers"),
+        "synth_isolation":  STATE.get("synth_isolation"),
+        "speculative":      STATE.get("speculative"),
+        "dedup_ttl_s":      STATE.get("dedup_ttl_s"),
+        "transcript_watch": STATE.get("transcript_watch"),
+        "idle_exit_s":      STATE.get("idle_exit_s"),
+        "engine_idle_unload_s":    STATE.get("engine_idle_unload_s"),
+        "engine_memory_budget_mb": STATE.get("engine_memory_budget_mb"),
+        "piper_pool_size":         STATE.get("piper_pool_size"),
+        "piper_pool_mb":           STATE.get("piper_pool_mb"),
+        **{key: STATE.get(key) for key in ORT_DEFAULTS},
+    })
+
+
+@app.get(
+    "/stats",
+    tags=["Status"],
+    summary="Synthesis/playback pipeline counters",
+    responses={
+        200: {"description": "Pipeline counters since service start."},
+    },
+)
+def get_stats():
+    """Returns counters for the TTS pipeline:
+    - `pipeline.clips_played`: sentences played to completion
+    - `pipeline.playback_stalls`: sentence boundaries where playback waited for synthesis
+    - `pipeline.stall_seconds`: total time spent in those waits
+    - `pipeline.buffered`: clips currently synthesized and waiting to play
+    - `pipeline.synth_chars_per_sec`: measured synthesis throughput (sizes the first chunk)
+    - `pipeline.last_ttfs_ms` / `pipeline.avg_ttfs_ms`: time-to-first-sample — from the
+      synthesis stage picking up a sentence to its first audio chunk being ready
+    - `pipeline.rtf`: real-time factor — synthesis time / audio duration (below 1 is faster
+      than real time)
+    - `pipeline.synth_workers` / `pipeline.synth_active` / `pipeline.synth_peak_active`:
+      synthesis pool limit (resolved when `synth_workers` is `"auto"`), jobs running now,
+      and the most that have run at once
+    - `pipeline.isolation` / `pipeline.processes`: synthesis isolation mode and, once process
+      isolation has been used, the child process counts
+
+    - `output.underruns`: times the output stream ran dry mid-utterance (audible gaps)
+    - `output.stream_opens`: output stream (re)opens — increments only on sample-rate changes
+    - `cache.hits` / `cache.misses` / `cache.evictions`: synthesized-audio cache counters;
+      a hit skips synthesis entirely
+    - `disk_cache`: the persistent tier behind `cache` — survives restarts; `invalidated`
+      counts entries removed because a model file changed
+    - `dedup.entries` / `dedup.suppressed`: remembered per-session sentences and repeats skipped
+    - `speculative.used` / `speculative.wasted`: sentences pre-synthesized in the background that
+      a later request played from the cache, and those that expired unplayed; `preempted` counts
+      pauses for foreground synthesis
+    - `process.rss_mb`: resident memory of the service process
+    - `process.first_audio_s`: seconds from process start to the first audio sample played
+      (`first_audio_at` is the same moment as a Unix timestamp); null until something has played
+    - `process.socket_activated` / `process.idle_s`: whether `agenttalk.launcher` started the
+      service (and it exits after `idle_exit_s`), and seconds since it was last used
+    - `engines.engines[]`: per TTS engine — `loaded`, `loads` (reloads after an idle or budget
+      unload count again), `last_load_s` / `total_load_s` including warmup, `rss_mb` (resident
+      growth measured across its last load), `idle_s`, and `idle_unloads` / `budget_unloads`
+      (memory budget or Piper pool limit);
+      `engines.loaded_mb` sums the loaded ones
+
+    A stall count close to `clips_played` means synthesis is slower than playback;
+    raise `lookahead` in config.json or use a faster engine.
+    """
+    return JSONResponse({
+        "pipeline":   pipeline_stats(),
+        "output":     get_audio_output().stats(),
+        "cache":      cache_stats(),
+        "disk_cache": disk_cache_stats(),
+        "dedup":      _dedup.stats(),
+        "speculative": speculative_stats(),
+        "process":    _process_stats(),
+        "engines":    engine_stats(),
     })
 
 
+def _process_stats() -> dict:
+    proc = psutil.Process()
+    started = proc.create_time()
+    first_audio = first_audio_at()
+    return {
+        "pid":              proc.pid,
+        "uptime_s":         round(time.time() - started, 1),
+        "rss_mb":           round(proc.memory_info().rss / (1024 * 1024), 1),
+        "first_audio_at":   first_audio,
+        "first_audio_s":    round(first_audio - started, 3) if first_audio is not None else None,
+        "socket_activated": _socket_activated,
+        "idle_s":           round(_idle_seconds(), 1),
+    }
+
+
 @app.get(
     "/piper-voices",
     tags=["Status"],
@@ -460,47 +926,96 @@ def list_piper_voices():
     return JSONResponse({"voices": voices, "dir": str(piper_dir)})
 
 
-@app.post(
-    "/speak",
-    tags=["TTS"],
-    summary="Queue text for TTS playback",
-    status_code=202,
-    responses={
-        202: {"description": "Text accepted and queued for playback."},
-        200: {"description": "No speakable content after preprocessing (e.g. pure code, whitespace, or URLs only)."},
-        429: {"description": "TTS queue is full — request dropped. Retry after a moment."},
-        500: {"description": "Internal preprocessing error."},
-        503: {"description": "Service not yet initialised — model still loading."},
-    },
-)
-async def speak(req: SpeakRequest):
-    """
-    Accepts text (plain or Markdown), preprocesses it into speakable sentences,
-    and enqueues each sentence individually for ordered playback.
+# Floor for the latency-derived first-chunk budget — below this, chunks stop
+# sounding like phrases.
+_MIN_FIRST_CHUNK_CHARS = 24
 
-    Each sentence is a separate queue item (str) so the first sentence begins
-    playing as soon as it is synthesized, without waiting for later sentences.
-    If the queue fills mid-loop the remaining sentences are dropped gracefully
-    and the response includes dropped count.
 
-    Preprocessing strips: fenced code blocks, inline code, Markdown links, bare URLs,
-    headings, bold/italic, blockquotes, list markers, and excess whitespace.
-    Text is then split into sentences via `pysbd` before queuing.
+def _first_chunk_budget() -> int:
     """
-    if not is_ready:
-        return JSONResponse({"status": "not_ready"}, status_code=503)
+    Character budget for the first chunk of a response.
 
+    Starts from first_chunk_max_chars. When first_chunk_target_ms is set and a
+    synthesis throughput has been measured, shrinks the budget to what the
+    active engine can synthesize within that target on this machine.
+    """
+    budget = int(STATE.get("first_chunk_max_chars", 0))
+    target_ms = STATE.get("first_chunk_target_ms", 0)
+    cps = pipeline_stats().get("synth_chars_per_sec", 0.0)
+    if target_ms and cps > 0:
+        fit = max(_MIN_FIRST_CHUNK_CHARS, int(cps * target_ms / 1000))
+        budget = min(budget, fit) if budget > 0 else fit
+    return budget
+
+
+def _with_cues(sentences: list[str]) -> list:
+    """Queue items for one response: pre-cue, sentences, post-cue (as configured)."""
+    items: list = list(sentences)
+    if STATE.get("pre_cue_path"):
+        items.insert(0, _CueItem(STATE["pre_cue_path"]))
+    if STATE.get("post_cue_path"):
+        items.append(_CueItem(STATE["post_cue_path"]))
+    return items
+
+
+def _partly_queued(sentences: list[str], groups: list[list[str]], queued: int) -> list[str]:
+    """The sentences whose chunks (groups, in order) were not all among the first `queued`."""
+    missing, end = [], 0
+    for sentence, chunks in zip(sentences, groups):
+        end += len(chunks)
+        if end > queued:
+            missing.append(sentence)
+    return missing
+
+
+def _enqueue_speech(text: str, session_id: str | None = None) -> tuple[dict, int]:
+    """
+    Preprocess text and queue it for playback (or hold it during warmup).
+
+    Shared by POST /speak and the transcript watcher. Returns the response
+    body and HTTP status code that /speak answers with.
+    """
     try:
-        sentences = preprocess(req.text)
+        spoken = preprocess(text)
     except Exception:
-        logging.exception("preprocess() failed for /speak request.")
-        return JSONResponse({"status": "error", "reason": "preprocessing failed"}, status_code=500)
+        logging.exception("preprocess() failed for speech request.")
+        return {"status": "error", "reason": "preprocessing failed"}, 500
 
-    if not sentences:
-        return JSONResponse(
-            {"status": "skipped", "reason": "no speakable sentences"},
-            status_code=200,
+    if not spoken:
+        return {"status": "skipped", "reason": "no speakable sentences"}, 200
+
+    # Dedup on whole sentences, before clause splitting — the split of a
+    # sentence depends on whether it opens the request.
+    _dedup.ttl = float(STATE.get("dedup_ttl_s", 0))
+    fresh = _dedup.claim(session_id, spoken)
+    if not fresh:
+        return {"status": "skipped", "reason": "already spoken", "duplicates": len(spoken)}, 200
+    duplicates = len(spoken) - len(fresh)
+
+    try:
+        groups = split_for_latency_groups(
+            fresh,
+            max_chars=int(STATE.get("clause_max_chars", 0)),
+            first_max_chars=_first_chunk_budget(),
         )
+    except Exception:
+        _dedup.release(session_id, fresh)
+        logging.exception("split_for_latency() failed for speech request.")
+        return {"status": "error", "reason": "preprocessing failed"}, 500
+    sentences = [chunk for group in groups for chunk in group]
+
+    held = _intake.offer(_with_cues(sentences))
+    if held == HELD:
+        return {"status": "buffered", "sentences": len(sentences), "pending": _intake.pending}, 202
+    if held == FULL:
+        _dedup.release(session_id, fresh)
+        logging.info("Warmup buffer full - dropping request.")
+        return {"status": "dropped", "reason": "warmup buffer full"}, 429
+    if not is_ready:  # intake closed without a worker — startup failed
+        _dedup.release(session_id, fresh)
+        return {"status": "not_ready"}, 503
+    if not STATE["muted"]:
+        prefetch_engine(sentences)  # an engine unloaded while idle reloads while the queue drains
 
     # Push pre-cue sentinel before sentences — fires once per response, not per sentence.
     pre_cue = STATE.get("pre_cue_path")
@@ -524,11 +1039,11 @@ async def speak(req: SpeakRequest):
             )
             break
 
+    if dropped:
+        # Sentences not queued in full were never spoken — a retry must not be suppressed.
+        _dedup.release(session_id, _partly_queued(fresh, groups, queued))
     if queued == 0:
-        return JSONResponse(
-            {"status": "dropped", "reason": "queue full"},
-            status_code=429,
-        )
+        return {"status": "dropped", "reason": "queue full"}, 429
 
     # Push post-cue sentinel after sentences — only when at least one sentence was queued.
     post_cue = STATE.get("post_cue_path")
@@ -538,12 +1053,169 @@ async def speak(req: SpeakRequest):
         except queue.Full:
             pass  # queue full — skip cue rather than block
 
+    return {"status": "queued", "sentences": queued, "dropped": dropped, "duplicates": duplicates}, 202
+
+
+@app.post(
+    "/speak",
+    tags=["TTS"],
+    summary="Queue text for TTS playback",
+    status_code=202,
+    responses={
+        202: {"description": "Text accepted and queued for playback (or held until the engine finishes loading)."},
+        200: {"description": "Nothing queued: no speakable content after preprocessing (e.g. pure code, whitespace, or URLs only), or an `auto-hook` request in semi-auto mode."},
+        429: {"description": "TTS queue (or warmup buffer) is full — request dropped. Retry after a moment."},
+        500: {"description": "Internal preprocessing error."},
+        503: {"description": "Engine failed to start — see the service log."},
+    },
+)
+async def speak(req: SpeakRequest):
+    """
+    Accepts text (plain or Markdown), preprocesses it into speakable sentences,
+    and enqueues each sentence individually for ordered playback.
+
+    Each sentence is a separate queue item (str) so the first sentence begins
+    playing as soon as it is synthesized, without waiting for later sentences.
+    If the queue fills mid-loop the remaining sentences are dropped gracefully
+    and the response includes dropped count.
+
+    Preprocessing strips: fenced code blocks, inline code, Markdown links, bare URLs,
+    headings, bold/italic, blockquotes, list markers, and excess whitespace.
+    Text is then split into sentences via `pysbd`, and sentences longer than
+    `clause_max_chars` are split at clause boundaries (the first sentence against the
+    tighter `first_chunk_max_chars` budget) so audio starts sooner.
+
+    While the engine is still loading, the preprocessed request is held (up to
+    `warmup_buffer_size` requests, each for at most `warmup_buffer_max_age_s`) and
+    queued in order once the worker starts.
+
+    With `session_id`, sentences already spoken in that session during the last
+    `dedup_ttl_s` seconds are dropped before anything is queued (`duplicates` in the
+    response), so a Stop message repeating an intermediate message only speaks what is new.
+
+    With `speculative: true` nothing is played: the sentences are synthesized into the
+    audio cache at low priority (`"status": "speculating"`), so a later request for the
+    same text starts from the cache. Speculation only runs in `auto` mode.
+
+    `source` applies the speech mode here, so hooks need no config lookup of their
+    own: in `semi-auto` mode `auto-hook` requests are answered with
+    `"status": "skipped"` and nothing is synthesized. `manual` (the default, e.g.
+    `/agenttalk:speak`) and `pipe` (`agenttalk pipe`, stream wrappers) always speak.
+    """
+    if req.source == "auto-hook" and STATE.get("speech_mode") != "auto":
+        return JSONResponse({"status": "skipped", "reason": "semi-auto mode"}, status_code=200)
+    if req.speculative:
+        body, status = _speculate_text(req.text, req.session_id)
+    else:
+        body, status = _enqueue_speech(req.text, req.session_id)
+    return JSONResponse(body, status_code=status)
+
+
+def _speculate_text(text: str, session_id: str | None = None) -> tuple[dict, int]:
+    """
+    Pre-synthesize text the way _enqueue_speech() would split it, without playing it.
+
+    Sentences already spoken in the session are left out and the first
+    remaining one gets the first-chunk budget, so the cache keys match the
+    chunks of a later /speak for the same text. A trailing sentence without
+    terminal punctuation is still being written — its final form will differ
+    (and so will its cache key), so it is not synthesized.
+
+    Only in auto mode: in semi-auto mode most replies are never spoken, so
+    pre-synthesizing them would spend CPU on audio nobody asks for.
+    """
+    if STATE.get("speech_mode") != "auto":
+        return {"status": "skipped", "reason": "semi-auto mode"}, 200
+    if not is_ready or not STATE.get("speculative", True):
+        return {"status": "skipped", "reason": "speculation unavailable"}, 200
+    try:
+        spoken = preprocess(text)
+        if spoken and not spoken[-1].endswith((".", "!", "?")):
+            spoken.pop()
+        sentences = split_for_latency(
+            _dedup.peek(session_id, spoken),
+            max_chars=int(STATE.get("clause_max_chars", 0)),
+            first_max_chars=_first_chunk_budget(),
+        )
+    except Exception:
+        logging.exception("preprocess() failed for speculative request.")
+        return {"status": "error", "reason": "preprocessing failed"}, 500
+    return {"status": "speculating", "sentences": speculate(sentences)}, 202
+
+
+def _speak_from_transcript(session_id: str, text: str) -> None:
+    """Transcript watcher callback: speak an intermediate message in auto mode."""
+    if STATE.get("speech_mode") != "auto":
+        return
+    body, status = _enqueue_speech(text, session_id)
+    logging.debug("Transcript %s: %s (%d)", session_id, body.get("status"), status)
+
+
+@app.post(
+    "/sessions",
+    tags=["Sessions"],
+    summary="Follow a session transcript",
+    status_code=201,
+    responses={
+        201: {"description": "Session registered; new intermediate messages will be spoken."},
+        200: {"description": "Session was already registered and now follows the given path, or `transcript_watch` is off and nothing is followed."},
+    },
+)
+async def register_session(req: SessionRequest):
+    """
+    Registers an agent session so the service follows its transcript and speaks
+    intermediate assistant messages as they are written — the ones followed by a
+    tool call, which the Stop hook never sees. Called once per session by the
+    SessionStart hook; replaces spawning a hook process on every tool use.
+
+    Only messages written after registration are spoken, and only those that pass
+    the same filter the PostToolUse hook applied (at least 80 characters, ending in
+    terminal punctuation). Nothing is spoken in `semi-auto` speech mode.
+
+    Opt-in: unless `transcript_watch` is enabled (`POST /config`), the session is
+    not followed and the response is `{"status": "disabled"}`.
+    """
+    if not STATE.get("transcript_watch"):
+        return JSONResponse({"status": "disabled", "session_id": req.session_id})
+    is_new = _watcher.register(req.session_id, req.transcript_path)
+    logging.info("Session %s %s: %s", req.session_id, "registered" if is_new else "re-registered", req.transcript_path)
     return JSONResponse(
-        {"status": "queued", "sentences": queued, "dropped": dropped},
-        status_code=202,
+        {"status": "watching", "session_id": req.session_id},
+        status_code=201 if is_new else 200,
     )
 
 
+@app.get(
+    "/sessions",
+    tags=["Sessions"],
+    summary="List followed session transcripts",
+    responses={
+        200: {"description": "Registered sessions with read offset and spoken/filtered message counts."},
+    },
+)
+def list_sessions():
+    """Returns every registered session: transcript path, bytes consumed (`offset`),
+    intermediate messages spoken and filtered out, and seconds since the transcript last grew.
+    Sessions idle for six hours are dropped automatically."""
+    return JSONResponse({"sessions": _watcher.sessions()})
+
+
+@app.delete(
+    "/sessions/{session_id}",
+    tags=["Sessions"],
+    summary="Stop following a session transcript",
+    responses={
+        200: {"description": "Session unregistered."},
+        404: {"description": "No such session is registered."},
+    },
+)
+async def unregister_session(session_id: str):
+    """Stops following the session's transcript. Messages already queued still play."""
+    if not _watcher.unregister(session_id):
+        return JSONResponse({"status": "not_found"}, status_code=404)
+    return JSONResponse({"status": "removed", "session_id": session_id})
+
+
 @app.post(
     "/config",
     tags=["Configuration"],
@@ -561,8 +1233,11 @@ async def update_config(req: ConfigRequest):
     to `%APPDATA%\\AgentTalk\\config.json` so they survive service restarts.
 
     **Engine switching:** set `model` to `"piper"` and provide `piper_model_path` pointing to a
-    downloaded `.onnx` file. The Piper engine is lazy-loaded on the next `/speak` request and
-    reloaded automatically if `piper_model_path` changes. Switch back by setting `model` to `"kokoro"`.
+    downloaded `.onnx` file. The Piper engine starts loading in the background as soon as it is
+    selected (sentences keep using the previous engine until it is ready — progress is in
+    `GET /health`) and is reloaded automatically if `piper_model_path` changes. Switch back by setting `model` to `"kokoro"`.
+    Setting `kokoro_precision` to `"int8"` loads the quantized Kokoro weights the same way.
+    An engine unused for `engine_idle_unload_s` is unloaded and loads again on the next request.
 
     See `GET /piper-voices` for downloaded Piper models and `GET /voices` for Kokoro voice IDs.
     """
@@ -579,6 +1254,12 @@ async def update_config(req: ConfigRequest):
         else:
             ignored.append(key)
             logging.warning("Config update ignored — unknown STATE key: %s", key)
+    configure_engines()  # idle/budget limits also govern the engine-reaper between leases
+    if is_ready and {"model", "kokoro_precision", "piper_model_path", *ORT_DEFAULTS} & set(applied):
+        prefetch_engine()  # load the newly selected engine (or session) before the next /speak needs it
+    if "transcript_watch" in applied and not STATE["transcript_watch"]:
+        for session in _watcher.sessions():
+            _watcher.unregister(session["session_id"])
     response: dict = {"status": "ok", "updated": applied}
     if ignored:
         response["ignored"] = ignored
@@ -607,7 +1288,7 @@ async def stop_service():
     The HTTP response is delivered before the process exits (~100 ms delay via daemon thread).
     The system-tray icon disappears once the process exits.
     """
-    sd.stop()  # Interrupt any currently playing audio immediately
+    stop_playback()  # Interrupt any currently playing audio immediately
 
     def _exit():
         time.sleep(0.1)
@@ -626,26 +1307,39 @@ class _BackgroundServer(uvicorn.Server):
         pass  # Required: loop.add_signal_handler() raises NotImplementedError on Windows threads
 
 
-def _start_http_server() -> threading.Thread:
-    """Start uvicorn on localhost:5050 in a daemon thread."""
+def _start_http_server(port: int = DEFAULT_PORT, socket_path: Path = SOCKET_PATH) -> threading.Thread:
+    """
+    Start uvicorn in a daemon thread on localhost:5050 and the Unix socket — or,
+    when agenttalk.launcher started this process, on the listening sockets it
+    handed over.
+    """
+    global _http_server, _socket_activated
+    inherited = inherited_sockets()
+    _socket_activated = bool(inherited)
     config = uvicorn.Config(
         app,
         host="127.0.0.1",
-        port=5050,
+        port=port,
         log_config=None,
     )
     server = _BackgroundServer(config)
+    _http_server = server
     def _run_server():
         try:
-            server.run()
+            server.run(sockets=inherited or listen_sockets(port, socket_path if port == DEFAULT_PORT else None))
         except OSError:
             logging.critical("HTTP server failed to start (OSError — port in use?).", exc_info=True)
         except Exception:
             logging.critical("HTTP server crashed unexpectedly.", exc_info=True)
+        if _idle_exit_requested:
+            _exit_idle()
 
     thread = threading.Thread(target=_run_server, daemon=True, name="uvicorn")
     thread.start()
-    logging.info("HTTP server thread started (localhost:5050).")
+    if _socket_activated:
+        logging.info("HTTP server thread started on %d socket(s) from the launcher.", len(inherited))
+    else:
+        logging.info("HTTP server thread started (localhost:%d, %s).", port, socket_path)
     return thread
 
 
@@ -662,7 +1356,16 @@ def main() -> None:
         # CFG-01, CFG-02, CFG-03: Restore all persisted settings from config.json at startup.
         # This ensures voice, model, speed, volume, mute, and cue paths survive restarts.
         _cfg = load_config()
-        for _key in ("voice", "speed", "volume", "model", "muted", "pre_cue_path", "post_cue_path", "piper_model_path", "speech_mode"):
+        for _key in (
+            "voice", "speed", "volume", "model", "kokoro_precision", "muted", "pre_cue_path", "post_cue_path",
+            "piper_model_path", "speech_mode", "lookahead",
+            "output_blocksize", "output_latency", "sentence_gap_ms", "audio_cache_mb",
+            "disk_cache_mb", "clause_max_chars", "first_chunk_max_chars", "first_chunk_target_ms",
+            "streaming", "synth_workers", "synth_isolation",
+            "warmup_buffer_size", "warmup_buffer_max_age_s", "transcript_poll_ms", "dedup_ttl_s", "transcript_watch",
+            "speculative", "idle_exit_s", "engine_idle_unload_s", "engine_memory_budget_mb",
+            "piper_pool_size", "piper_pool_mb", *ORT_DEFAULTS,
+        ):
             if _key in _cfg and _cfg[_key] is not None:
                 STATE[_key] = _cfg[_key]
                 logging.info("Config restored: %s = %s", _key, STATE[_key])
@@ -682,7 +1385,7 @@ def main() -> None:
         def _on_mute_change() -> None:
             """Called after every Mute toggle. Stops audio immediately when muting."""
             if STATE["muted"]:
-                sd.stop()  # Interrupt the current sentence immediately
+                stop_playback()  # Interrupt the current sentence immediately
             try:
                 save_config(STATE)
             except OSError:
@@ -690,6 +1393,8 @@ def main() -> None:
 
         def _on_config_change() -> None:
             """Called after model, kokoro voice, or piper voice selection from tray."""
+            if is_ready:
+                prefetch_engine()  # a newly selected engine loads before it is needed
             try:
                 save_config(STATE)
             except OSError:
@@ -713,8 +1418,9 @@ def main() -> None:
             The visible property can only be set while the icon is running (pystray pitfall #1).
 
             Stores the icon reference so _lifespan can pass it to start_tts_worker.
-            Starts the HTTP server daemon thread — uvicorn's _lifespan runs Kokoro load,
-            then calls start_tts_worker(_kokoro_engine, icon=_tray_icon).
+            Starts the HTTP server daemon thread — uvicorn's _lifespan starts the
+            engine-startup thread, which calls start_tts_worker(icon=_tray_icon)
+            and then loads the configured engine.
             """
             global _tray_icon
             icon.visible = True  # REQUIRED — icon starts hidden by default
@@ -725,7 +1431,7 @@ def main() -> None:
         # SVC-04: pystray Icon.run() takes the main thread (Win32 message loop).
         # This replaces threading.Event().wait() from Phase 1.
         # _setup fires once the icon is running; it stores the icon ref and starts HTTP.
-        # _lifespan (inside uvicorn) starts the TTS worker after Kokoro loads.
+        # _lifespan (inside uvicorn) starts the TTS worker and loads the configured engine.
         logging.info("Starting pystray tray icon on main thread.")
         icon.run(setup=_setup)
 
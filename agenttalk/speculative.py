@@ -0,0 +1,142 @@
+"""
+speculative.py — Low-priority pre-synthesis of text that is likely to be spoken soon.
+
+Intermediate assistant messages that fail the _is_substantial() filter, and the
+message a session is still writing, usually reappear seconds later in the Stop
+hook's /speak request. The speculative lane synthesizes their sentences into
+the audio cache in the background without playing them, so that request is a
+cache hit and starts almost immediately.
+
+PRIORITY:
+The lane runs one sentence at a time on its own thread and only while
+foreground synthesis is idle (the `busy` callback). If foreground work arrives
+mid-sentence, the synthesize callback may raise Preempted at the next chunk
+boundary of a streaming engine; the sentence goes back to the front of the
+lane and is retried once the foreground is idle again.
+
+ACCOUNTING:
+Every sentence the lane synthesizes is remembered by cache key. A later
+foreground cache hit on that key counts as `used`; a key not hit within ttl
+seconds counts as `wasted`.
+"""
+import collections
+import logging
+import threading
+import time
+from typing import Callable, Hashable
+
+IDLE_POLL_S = 0.05  # how often a waiting lane re-checks whether the foreground is idle
+
+
+class Preempted(Exception):
+    """Raised by the synthesize callback when foreground work needs the CPU."""
+
+
+class SpeculativeLane:
+    """
+    Background pre-synthesis queue that yields to foreground synthesis.
+
+    Args:
+        synthesize:  synthesize(sentence, should_stop) -> cache key of the audio
+                     it cached, or None if nothing was synthesized (already
+                     cached, muted, ...). Raises Preempted when should_stop()
+                     turns true part-way through.
+        busy:        Returns True while foreground synthesis has work.
+        max_pending: Sentences waiting in the lane; older ones are dropped first.
+        ttl:         Seconds a speculative result may wait for its foreground hit.
+    """
+
+    def __init__(
+        self,
+        synthesize: Callable[[str, Callable[[], bool]], Hashable | None],
+        busy: Callable[[], bool],
+        max_pending: int = 32,
+        ttl: float = 300.0,
+    ):
+        self._synthesize = synthesize
+        self._busy = busy
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self._pending: collections.deque[str] = collections.deque()
+        self._unused: collections.OrderedDict[Hashable, float] = collections.OrderedDict()
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._counts = dict.fromkeys(
+            ("submitted", "synthesized", "skipped", "preempted", "dropped", "failed", "used", "wasted"), 0,
+        )
+
+    def submit(self, sentences: list[str]) -> int:
+        """Queue sentences for speculative synthesis. Returns how many were accepted."""
+        with self._cond:
+            accepted = 0
+            for sentence in sentences:
+                if sentence in self._pending:
+                    continue
+                self._pending.append(sentence)
+                accepted += 1
+            while len(self._pending) > self.max_pending:
+                self._pending.popleft()
+                self._counts["dropped"] += 1
+            self._counts["submitted"] += accepted
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name="tts-speculate")
+                self._thread.start()
+            self._cond.notify()
+            return accepted
+
+    def note_hit(self, key: Hashable) -> bool:
+        """Record a foreground cache hit. Returns True if the lane produced that entry."""
+        with self._cond:
+            if self._unused.pop(key, None) is None:
+                return False
+            self._counts["used"] += 1
+            return True
+
+    def stats(self) -> dict:
+        with self._cond:
+            self._expire_locked(time.monotonic())
+            return {**self._counts, "pending": len(self._pending), "unused": len(self._unused)}
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending)
+            while self._busy():
+                time.sleep(IDLE_POLL_S)
+            with self._cond:
+                if not self._pending:
+                    continue
+                sentence = self._pending.popleft()
+            self._run_one(sentence)
+
+    def _run_one(self, sentence: str) -> None:
+        try:
+            key = self._synthesize(sentence, self._busy)
+        except Preempted:
+            with self._cond:
+                self._pending.appendleft(sentence)
+                self._counts["preempted"] += 1
+            return
+        except Exception:
+            logging.warning("Speculative synthesis failed for %r.", sentence[:60], exc_info=True)
+            with self._cond:
+                self._counts["failed"] += 1
+            return
+        with self._cond:
+            now = time.monotonic()
+            self._expire_locked(now)
+            if key is None:
+                self._counts["skipped"] += 1
+            else:
+                self._counts["synthesized"] += 1
+                self._unused[key] = now
+                self._unused.move_to_end(key)
+
+    def _expire_locked(self, now: float) -> None:
+        cutoff = now - self.ttl
+        while self._unused:
+            key, stamp = next(iter(self._unused.items()))
+            if stamp >= cutoff:
+                break
+            del self._unused[key]
+            self._counts["wasted"] += 1
@@ -0,0 +1,74 @@
+"""
+streaming.py — Uniform chunked-synthesis interface over the TTS engines.
+
+iter_audio_chunks(engine, text, voice, speed, lang) yields (samples, rate)
+tuples as the engine produces them, so the playback stage can start on the
+first chunk instead of waiting for the whole sentence:
+
+  - Engines with a synchronous stream() method (PiperEngine) are iterated directly.
+  - Engines with an async create_stream() generator (kokoro-onnx Kokoro) are
+    driven on a private event loop owned by the calling thread.
+  - Anything else falls back to a single chunk from the blocking create().
+
+CRITICAL: iter_audio_chunks() is blocking and runs ONLY on the synthesis
+thread — never inside a FastAPI handler (uvicorn's loop already runs there,
+and asyncio forbids nesting run_until_complete on a running loop).
+"""
+import asyncio
+from collections.abc import Iterator
+
+import numpy as np
+
+Chunk = tuple[np.ndarray, int]
+
+
+def _drive_async_gen(agen) -> Iterator[Chunk]:
+    """
+    Iterate an async generator from synchronous code.
+
+    kokoro-onnx's create_stream() schedules batch synthesis as a background
+    task on the running loop, so the loop must stay alive between
+    __anext__() calls; a fresh loop is created and closed per generator.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(agen.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        try:
+            loop.run_until_complete(agen.aclose())
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            loop.close()
+
+
+def iter_audio_chunks(
+    engine,
+    text: str,
+    voice: str | None,
+    speed: float,
+    lang: str = "en-us",
+    **kwargs,
+) -> Iterator[Chunk]:
+    """
+    Yield (samples, sample_rate) chunks for text as soon as each is synthesized.
+
+    Args:
+        engine: Kokoro, PiperEngine, or any object with create(text, voice, speed, lang).
+        text:   Text to synthesize.
+        voice:  Voice identifier (ignored by Piper).
+        speed:  Speech speed multiplier.
+        lang:   Language code passed through to the engine.
+        **kwargs: Extra engine arguments (e.g. Kokoro's is_phonemes).
+    """
+    if hasattr(engine, "stream"):
+        yield from engine.stream(text, voice=voice, speed=speed, lang=lang, **kwargs)
+    elif hasattr(engine, "create_stream"):
+        yield from _drive_async_gen(
+            engine.create_stream(text, voice=voice, speed=speed, lang=lang, **kwargs)
+        )
+    else:
+        yield engine.create(text, voice=voice, speed=speed, lang=lang, **kwargs)
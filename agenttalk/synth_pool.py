@@ -0,0 +1,117 @@
+"""
+synth_pool.py — Concurrent sentence synthesis with in-order delivery.
+
+A long answer arrives as many queued sentences. One synthesis thread calling
+engine.create() back to back leaves most cores idle, so the synthesis stage
+hands each sentence to a SynthPool and the sentences are synthesized
+concurrently. All workers share the one loaded engine (ONNX Runtime's
+InferenceSession.run() is thread-safe), so extra workers cost threads, not
+model memory.
+
+ORDERING:
+Every queued item gets a SynthJob — a small chunk queue — and the jobs are
+consumed strictly in submission order. The job at the head is drained chunk by
+chunk as its worker produces them (streaming still works); later jobs fill
+their queues in the background and are forwarded the moment they reach the
+head.
+
+POOL SIZE:
+The concurrency limit is passed to every submit(), so a POST /config change
+applies to the next sentence. auto_pool_size() derives the limit from the core
+count and the measured real-time factor (RTF = synthesis time / audio
+duration).
+"""
+import math
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+_DONE = object()  # end-of-job marker inside SynthJob
+
+
+def auto_pool_size(cpu_count: int | None, rtf: float) -> int:
+    """
+    Size the synthesis pool from the core count and the measured RTF.
+
+    N workers produce audio N/RTF times faster than it plays, so ceil(RTF)
+    workers keep pace with playback and one more builds lookahead for long
+    answers. Each inference already fans out over ONNX Runtime's intra-op
+    threads, so the pool is capped at half the cores. Before any RTF has been
+    measured (rtf <= 0) two workers are used where the cores allow it.
+    """
+    cores = cpu_count or 1
+    cap = max(1, cores // 2)
+    if rtf <= 0:
+        return min(2, cap)
+    return max(1, min(cap, math.ceil(rtf) + 1))
+
+
+class SynthJob:
+    """
+    Output of one queued item, read back in submission order.
+
+    The producing worker put()s clips/sentinels and close()s the job exactly
+    once; iterating the job yields items until it is closed.
+    """
+
+    def __init__(self):
+        self._items: queue.Queue = queue.Queue()
+
+    def put(self, item) -> None:
+        self._items.put(item)
+
+    def close(self) -> None:
+        self._items.put(_DONE)
+
+    def __iter__(self):
+        while True:
+            item = self._items.get()
+            if item is _DONE:
+                return
+            yield item
+
+
+class SynthPool:
+    """
+    Thread pool whose concurrency limit may change between submissions.
+
+    Args:
+        max_threads: Hard upper bound on worker threads (the limit is clamped to it).
+    """
+
+    def __init__(self, max_threads: int):
+        self.max_threads = max(1, int(max_threads))
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_threads, thread_name_prefix="tts-synth-worker",
+        )
+        self._cond = threading.Condition()
+        self._active = 0
+        self.peak_active = 0
+
+    @property
+    def active(self) -> int:
+        """Jobs currently running."""
+        with self._cond:
+            return self._active
+
+    def submit(self, fn, *args, limit: int = 1) -> None:
+        """
+        Run fn(*args) on a worker once fewer than `limit` jobs are active.
+
+        Blocks the caller (the dispatcher thread) while the pool is at its
+        limit — this is what keeps synthesis from racing ahead of playback.
+        """
+        limit = max(1, min(int(limit), self.max_threads))
+        with self._cond:
+            self._cond.wait_for(lambda: self._active < limit)
+            self._active += 1
+            self.peak_active = max(self.peak_active, self._active)
+        self._executor.submit(self._run, fn, args)
+
+    def _run(self, fn, args) -> None:
+        try:
+            fn(*args)
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
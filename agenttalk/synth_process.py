@@ -0,0 +1,375 @@
+"""
+synth_process.py — Synthesis in child processes with shared-memory PCM hand-off.
+
+In the default thread mode, ONNX inference, uvicorn's event loop, pystray and
+the playback stage all share one interpreter and contend for the GIL; under
+load HTTP latency spikes and playback can stutter. With
+STATE['synth_isolation'] == 'process' each synthesis worker is a spawned child
+process that owns its own engine instance instead.
+
+PCM HAND-OFF:
+Each child gets one multiprocessing.shared_memory block used as a float32
+ring. The child writes every synthesized chunk into the ring and sends only
+(offset, frames, rate) over its Pipe; the parent copies the frames out with a
+single memcpy and returns the space with a 'free' message. No numpy array is
+ever pickled. A chunk that does not fit before the end of the ring starts at
+offset 0 and the skipped tail is freed together with it.
+
+SHARED WEIGHTS:
+shared_weights_model() rewrites the Kokoro model once so its initializers live
+in a separate, 64 KiB-aligned external data file. ONNX Runtime memory-maps
+aligned external data instead of copying it onto the heap, so every child maps
+the same page-cache pages rather than holding its own ~310 MB copy. The
+rewrite needs the optional `onnx` package; without it children load the
+original model (correct, just not shared).
+
+LIFETIME:
+Children are spawned (never forked — the parent is multi-threaded) and exit
+when their Pipe closes, which also happens when the service exits via
+os._exit() without running atexit handlers.
+"""
+import importlib
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import numpy as np
+
+from agenttalk.streaming import iter_audio_chunks
+
+# (factory "module:attr", positional args) — picklable, and the child imports
+# the factory itself, so engine classes never cross the process boundary.
+EngineSpec = tuple[str, tuple]
+
+_RING_SECONDS = 20.0
+_RING_RATE = 24000
+_ALIGN = 64 * 1024            # Windows allocation granularity; a multiple of the POSIX page size
+_EXTERNAL_MIN_BYTES = 64 * 1024  # smaller tensors stay inline in the model file
+
+# Exception types re-raised in the parent by name, so tts_worker's
+# configuration-error handling still applies to failures in a child.
+_ERRORS = {
+    "RuntimeError": RuntimeError,
+    "FileNotFoundError": FileNotFoundError,
+    "ImportError": ImportError,
+    "ModuleNotFoundError": ImportError,
+}
+
+
+# ---------------------------------------------------------------------------
+# Memory-mapped model weights
+# ---------------------------------------------------------------------------
+
+def shared_weights_model(model_path: str, cache_dir: Path) -> str:
+    """
+    Return a copy of model_path whose weights ONNX Runtime can memory-map.
+
+    The rewritten model is cached in cache_dir, keyed by the source file's
+    size and mtime, and reused across restarts. Falls back to model_path when
+    the optional onnx package is missing or the rewrite fails.
+    """
+    src = Path(model_path)
+    st = src.stat()
+    out = Path(cache_dir) / f"{src.stem}-{st.st_size}-{st.st_mtime_ns}.mmap.onnx"
+    data = out.with_name(out.name + ".data")
+    if out.exists() and data.exists():
+        return str(out)
+    try:
+        import onnx  # optional — only needed to write the aligned copy
+    except ImportError:
+        logging.info("onnx not installed — synthesis processes load private model copies.")
+        return str(model_path)
+
+    t0 = time.perf_counter()
+    try:
+        out.parent.mkdir(parents=True, exist_ok=True)
+        model = onnx.load(str(src))
+        tmp_data = data.with_name(f"{data.name}.{os.getpid()}.tmp")
+        offset = 0
+        with open(tmp_data, "wb") as fh:
+            for tensor in model.graph.initializer:
+                if not tensor.HasField("raw_data") or len(tensor.raw_data) < _EXTERNAL_MIN_BYTES:
+                    continue
+                pad = -offset % _ALIGN
+                fh.write(b"\0" * pad)
+                offset += pad
+                raw = tensor.raw_data
+                fh.write(raw)
+                tensor.ClearField("raw_data")
+                tensor.data_location = onnx.TensorProto.EXTERNAL
+                del tensor.external_data[:]
+                for key, value in (("location", data.name), ("offset", offset), ("length", len(raw))):
+                    entry = tensor.external_data.add()
+                    entry.key, entry.value = key, str(value)
+                offset += len(raw)
+        tmp_model = out.with_name(f"{out.name}.{os.getpid()}.tmp")
+        tmp_model.write_bytes(model.SerializeToString())
+        os.replace(tmp_data, data)   # data first: a visible model always has its weights
+        os.replace(tmp_model, out)
+    except Exception:
+        logging.warning("Writing memory-mappable model copy failed — using %s.", src, exc_info=True)
+        return str(model_path)
+    logging.info(
+        "Wrote memory-mappable model %s (%.0f MB weights) in %.1f s.",
+        out.name, offset / 1e6, time.perf_counter() - t0,
+    )
+    return str(out)
+
+
+# ---------------------------------------------------------------------------
+# Child process
+# ---------------------------------------------------------------------------
+
+def _load_engine(spec: EngineSpec):
+    factory, args = spec
+    module, _, attr = factory.partition(":")
+    return getattr(importlib.import_module(module), attr)(*args)
+
+
+def _child_main(conn, shm_name: str, capacity: int) -> None:
+    """
+    Child process entry point: load engines on demand, synthesize into the ring.
+
+    Messages in:  ('load', spec) | ('synth', spec, text, kwargs, streaming) |
+                  ('free', frames) | ('close',)
+    Messages out: ('chunk', offset, frames, rate, skipped) | ('done',) |
+                  ('error', exc_type_name, message)
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    ring = np.ndarray((capacity,), dtype=np.float32, buffer=shm.buf)
+    engines: dict = {}
+    write_pos = 0
+    used = 0
+    piece_max = capacity // 2
+
+    def _engine(spec):
+        if spec not in engines:
+            engines.clear()  # one engine per child — an engine switch replaces it
+            engines[spec] = _load_engine(spec)
+        return engines[spec]
+
+    try:
+        while True:
+            try:
+                msg = conn.recv()
+            except (EOFError, OSError):
+                return  # parent gone
+            kind = msg[0]
+            if kind == "close":
+                return
+            if kind == "free":
+                used -= msg[1]
+                continue
+            if kind == "load":
+                try:
+                    _engine(msg[1])
+                except Exception:
+                    pass  # reported on the first synth request instead
+                continue
+
+            _, spec, text, kwargs, streaming = msg
+            try:
+                engine = _engine(spec)
+                if streaming:
+                    chunks = iter_audio_chunks(engine, text, **kwargs)
+                else:
+                    chunks = [engine.create(text, **kwargs)]
+                for samples, rate in chunks:
+                    samples = np.asarray(samples, dtype=np.float32).reshape(-1)
+                    for start in range(0, len(samples), piece_max):
+                        piece = samples[start:start + piece_max]
+                        n = len(piece)
+                        skipped = capacity - write_pos if write_pos + n > capacity else 0
+                        while used + skipped + n > capacity:
+                            reply = conn.recv()  # only 'free' arrives mid-job
+                            if reply[0] == "free":
+                                used -= reply[1]
+                        if skipped:
+                            write_pos = 0
+                        ring[write_pos:write_pos + n] = piece
+                        used += skipped + n
+                        conn.send(("chunk", write_pos, n, int(rate), skipped))
+                        write_pos = (write_pos + n) % capacity
+                conn.send(("done",))
+            except (EOFError, OSError):
+                return
+            except Exception as exc:
+                conn.send(("error", type(exc).__name__, str(exc)))
+    finally:
+        del ring
+        shm.close()
+
+
+# ---------------------------------------------------------------------------
+# Parent side
+# ---------------------------------------------------------------------------
+
+class _ChildWorker:
+    """Parent-side handle for one synthesis process and its shared-memory ring."""
+
+    def __init__(self, ctx, capacity: int, spec: EngineSpec | None):
+        self._capacity = capacity
+        self._shm = shared_memory.SharedMemory(create=True, size=capacity * 4)
+        self._ring = np.ndarray((capacity,), dtype=np.float32, buffer=self._shm.buf)
+        self._conn, child_conn = ctx.Pipe()
+        self._proc = ctx.Process(
+            target=_child_main,
+            args=(child_conn, self._shm.name, capacity),
+            daemon=True,
+            name="tts-synth-proc",
+        )
+        self._proc.start()
+        child_conn.close()
+        self.alive = True
+        if spec is not None:
+            self._conn.send(("load", spec))  # start loading before the first request
+
+    @property
+    def pid(self) -> int | None:
+        return self._proc.pid
+
+    def stream(self, spec: EngineSpec, text: str, kwargs: dict, streaming: bool):
+        """Yield (samples, rate) chunks for text, copied out of the ring."""
+        finished = False
+        try:
+            self._conn.send(("synth", spec, text, kwargs, streaming))
+            while True:
+                msg = self._conn.recv()
+                if msg[0] == "chunk":
+                    _, offset, frames, rate, skipped = msg
+                    samples = self._ring[offset:offset + frames].copy()
+                    self._conn.send(("free", frames + skipped))
+                    yield samples, rate
+                elif msg[0] == "done":
+                    finished = True
+                    return
+                else:
+                    finished = True
+                    _, name, message = msg
+                    exc_type = _ERRORS.get(name)
+                    if exc_type is None:
+                        raise Exception(f"{name}: {message}")
+                    raise exc_type(message)
+        except (EOFError, OSError, BrokenPipeError) as exc:
+            finished = True
+            self.alive = False
+            raise RuntimeError(f"Synthesis process {self.pid} exited unexpectedly.") from exc
+        finally:
+            if not finished:
+                self._drain()
+
+    def _drain(self) -> None:
+        """Consume the rest of an abandoned job so the next request starts clean."""
+        try:
+            while True:
+                msg = self._conn.recv()
+                if msg[0] == "chunk":
+                    self._conn.send(("free", msg[2] + msg[4]))
+                elif msg[0] in ("done", "error"):
+                    return
+        except (EOFError, OSError):
+            self.alive = False
+
+    def close(self) -> None:
+        try:
+            self._conn.send(("close",))
+        except (OSError, ValueError):
+            pass
+        self._proc.join(timeout=2)
+        if self._proc.is_alive():
+            self._proc.terminate()
+        self._conn.close()
+        del self._ring
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class ProcessSynthPool:
+    """
+    Pool of synthesis child processes, grown on demand up to the caller's limit.
+
+    Args:
+        ring_seconds: Shared-memory ring capacity per child, in seconds of
+                      24 kHz audio. Longer chunks are handed over in pieces.
+    """
+
+    def __init__(self, ring_seconds: float = _RING_SECONDS):
+        self._ctx = multiprocessing.get_context("spawn")
+        self._capacity = int(ring_seconds * _RING_RATE)
+        self._idle: list[_ChildWorker] = []
+        self._count = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self.spawned = 0
+        self.crashed = 0
+
+    def stream(self, spec: EngineSpec, text: str, kwargs: dict, streaming: bool, limit: int = 1):
+        """
+        Synthesize text in a child process; yields (samples, rate) chunks.
+
+        Blocks until a child is idle, spawning a new one while fewer than
+        `limit` exist. The child loads the engine described by spec on first
+        use and reloads it when spec changes.
+        """
+        worker = self._acquire(spec, max(1, int(limit)))
+        try:
+            yield from worker.stream(spec, text, kwargs, streaming)
+        finally:
+            self._release(worker)
+
+    def _acquire(self, spec: EngineSpec, limit: int) -> _ChildWorker:
+        with self._cond:
+            self._cond.wait_for(lambda: self._idle or self._count < limit)
+            if self._idle:
+                return self._idle.pop()
+            self._count += 1
+        try:
+            worker = _ChildWorker(self._ctx, self._capacity, spec)
+        except Exception:
+            with self._cond:
+                self._count -= 1
+                self._cond.notify_all()
+            raise
+        self.spawned += 1
+        logging.info("Started synthesis process pid=%s.", worker.pid)
+        return worker
+
+    def _release(self, worker: _ChildWorker) -> None:
+        if not worker.alive or self._closed:
+            if not worker.alive:
+                self.crashed += 1
+                logging.warning("Synthesis process pid=%s died — it will be replaced.", worker.pid)
+            worker.close()
+            with self._cond:
+                self._count -= 1
+                self._cond.notify_all()
+            return
+        with self._cond:
+            self._idle.append(worker)
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        """Shut down idle children; busy ones are closed when their job ends."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._count -= len(idle)
+        for worker in idle:
+            worker.close()
+
+    def stats(self) -> dict:
+        """Counters for GET /stats."""
+        with self._cond:
+            return {
+                "processes": self._count,
+                "idle": len(self._idle),
+                "spawned": self.spawned,
+                "crashed": self.crashed,
+            }
@@ -0,0 +1,252 @@
+"""
+transcript_watcher.py — Follows session transcripts from inside the service.
+
+The PostToolUse hook spoke intermediate assistant messages by starting a fresh
+Python interpreter on every tool call, reading the transcript and POSTing to
+/speak — 50-150 ms of CPU per tool call in a busy agent loop. Instead, the
+SessionStart hook registers the session's transcript once (POST /sessions) and
+this watcher follows it: one thread, no process per event.
+
+DETECTION:
+Transcripts are append-only JSONL files. Every poll_interval the watcher
+stat()s each registered file and, when it has grown, reads only the bytes
+appended since the last poll (complete lines only — a line still being written
+is picked up on the next poll). A stat per session per poll is all an idle
+session costs. Polling is used rather than inotify because inotify is
+Linux-only and not in the standard library, while the service runs on
+Windows, macOS and Linux.
+
+WHAT IS SPOKEN:
+An assistant text message is held until the transcript shows the agent moving
+on — a tool call or a tool result — which is the point the PostToolUse hook
+used to speak it. It is then spoken if it passes the same _is_substantial()
+filter. The final message of a turn is never followed by a tool call and is
+left to the Stop hook, so it is not spoken twice.
+
+Text that is held, and text the filter rejects, is handed to on_candidate
+once: it is likely to be spoken soon (by the Stop hook, or here) and can be
+pre-synthesized.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+from agenttalk.hooks.post_tool_use_hook import _is_substantial
+
+MAX_SESSIONS = 32               # registrations beyond this evict the least recently active
+MAX_READ_BYTES = 4 * 1024 * 1024  # bytes consumed per session per poll; the rest waits a poll
+IDLE_EXPIRY_S = 6 * 3600        # sessions whose transcript has not grown for this long are dropped
+
+
+@dataclass
+class _Session:
+    path: str
+    offset: int = 0
+    ino: int | None = None
+    pending: str | None = None   # last assistant text not yet followed by a tool call
+    offered: bool = False        # pending already passed to on_candidate
+    last_active: float = field(default_factory=time.monotonic)
+    spoken: int = 0
+    filtered: int = 0
+
+
+def _parse_line(raw_line: bytes) -> tuple[str | None, bool]:
+    """
+    Classify one transcript line.
+
+    Returns (assistant_text, moves_on): assistant_text is the joined text
+    blocks of an assistant message (None for any other line) and moves_on is
+    True when the line shows the agent continuing past that text — a tool_use
+    block or a tool_result.
+    """
+    try:
+        msg = json.loads(raw_line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None, False
+    if not isinstance(msg, dict):
+        return None, False
+    # Unwrap the message envelope if present ({"type": ..., "message": {...}})
+    if isinstance(msg.get('message'), dict):
+        msg = msg['message']
+    content = msg.get('content', '')
+    blocks = [b for b in content if isinstance(b, dict)] if isinstance(content, list) else []
+    kinds = {b.get('type') for b in blocks}
+    moves_on = 'tool_use' in kinds or 'tool_result' in kinds
+    if msg.get('role') != 'assistant':
+        return None, moves_on
+    if isinstance(content, str):
+        text = content.strip()
+    else:
+        text = ' '.join(b['text'] for b in blocks if b.get('type') == 'text' and 'text' in b).strip()
+    return text or None, moves_on
+
+
+class TranscriptWatcher:
+    """
+    Polls registered transcripts and hands new intermediate messages to on_text.
+
+    Args:
+        on_text:       Called as on_text(session_id, text) from the watcher
+                       thread for every substantial intermediate message.
+        on_candidate:  Optional; called as on_candidate(session_id, text) for
+                       held and filtered-out text that may be spoken later.
+        poll_interval: Seconds between polls; read on every poll so it may be
+                       changed at runtime.
+    """
+
+    def __init__(
+        self,
+        on_text: Callable[[str, str], None],
+        poll_interval: float = 0.5,
+        on_candidate: Callable[[str, str], None] | None = None,
+    ):
+        self.on_text = on_text
+        self.on_candidate = on_candidate
+        self.poll_interval = poll_interval
+        self._sessions: dict[str, _Session] = {}
+        self._lock = threading.Lock()       # guards _sessions
+        self._poll_lock = threading.Lock()  # one poll at a time
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._stopped = False
+
+    def register(self, session_id: str, transcript_path: str) -> bool:
+        """
+        Start following transcript_path for session_id.
+
+        Only text appended after registration is considered — the history of a
+        resumed session is not replayed. A transcript that does not exist yet
+        is followed from its first byte once it appears. Re-registering a
+        session (resume, clear, compact) re-targets it to the given path.
+        Returns True if the session was new.
+        """
+        path = os.path.abspath(transcript_path)
+        session = _Session(path)
+        try:
+            st = os.stat(path)
+            session.offset, session.ino = st.st_size, st.st_ino
+        except OSError:
+            pass
+        with self._lock:
+            is_new = session_id not in self._sessions
+            self._sessions[session_id] = session
+            while len(self._sessions) > MAX_SESSIONS:
+                oldest = min(self._sessions, key=lambda s: self._sessions[s].last_active)
+                del self._sessions[oldest]
+                logging.info("Transcript watcher: evicted idle session %s.", oldest)
+            if self._thread is None and not self._stopped:
+                self._thread = threading.Thread(target=self._run, daemon=True, name="transcript-watch")
+                self._thread.start()
+        return is_new
+
+    def unregister(self, session_id: str) -> bool:
+        """Stop following a session. Returns False if it was not registered."""
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def sessions(self) -> list[dict]:
+        """Snapshot of the registered sessions for GET /sessions."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "session_id": sid,
+                    "transcript_path": s.path,
+                    "offset": s.offset,
+                    "spoken": s.spoken,
+                    "filtered": s.filtered,
+                    "idle_s": round(now - s.last_active, 1),
+                }
+                for sid, s in self._sessions.items()
+            ]
+
+    def stop(self) -> None:
+        """Stop the watcher thread. Registrations are kept but no longer polled."""
+        self._stopped = True
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._wake.wait(max(0.05, float(self.poll_interval))):
+            try:
+                self.poll_once()
+            except Exception:
+                logging.exception("Transcript watcher poll failed.")
+
+    def poll_once(self) -> None:
+        """Read what every registered transcript gained since the last poll."""
+        with self._poll_lock:
+            self._poll()
+
+    def _poll(self) -> None:
+        with self._lock:
+            items = list(self._sessions.items())
+        now = time.monotonic()
+        for session_id, session in items:
+            texts, candidates = self._advance(session, now)
+            for callback, batch in ((self.on_candidate, candidates), (self.on_text, texts)):
+                for text in batch:
+                    try:
+                        callback(session_id, text)
+                    except Exception:
+                        logging.exception("Transcript watcher: callback failed for session %s.", session_id)
+            if now - session.last_active > IDLE_EXPIRY_S:
+                with self._lock:
+                    if self._sessions.get(session_id) is session:
+                        del self._sessions[session_id]
+                logging.info("Transcript watcher: session %s expired after inactivity.", session_id)
+
+    def _advance(self, session: _Session, now: float) -> tuple[list[str], list[str]]:
+        """
+        Consume new complete lines of one transcript.
+
+        Returns (texts to speak, candidate texts for on_candidate).
+        """
+        try:
+            st = os.stat(session.path)
+        except OSError:
+            return [], []  # not created yet, or deleted — idle expiry cleans up
+        if session.ino is not None and (st.st_ino != session.ino or st.st_size < session.offset):
+            # Replaced or truncated: follow the new file from its current end.
+            session.ino, session.offset, session.pending = st.st_ino, st.st_size, None
+            return [], []
+        session.ino = st.st_ino
+        if st.st_size == session.offset:
+            return [], []
+        try:
+            with open(session.path, 'rb') as fh:
+                fh.seek(session.offset)
+                data = fh.read(min(st.st_size - session.offset, MAX_READ_BYTES))
+        except OSError:
+            return [], []
+        end = data.rfind(b'\n')
+        if end < 0:
+            if len(data) < MAX_READ_BYTES:
+                return [], []  # only a partial line so far
+            end = len(data) - 1  # a single oversized line — skip it rather than stall
+        session.offset += end + 1
+        session.last_active = now
+
+        texts, candidates = [], []
+        for raw_line in data[:end].split(b'\n'):
+            if not raw_line.strip():
+                continue
+            text, moves_on = _parse_line(raw_line)
+            if text is not None:
+                session.pending, session.offered = text, False
+            if moves_on and session.pending is not None:
+                if _is_substantial(session.pending):
+                    texts.append(session.pending)
+                    session.spoken += 1
+                else:
+                    if not session.offered:
+                        candidates.append(session.pending)
+                    session.filtered += 1
+                session.pending = None
+        if session.pending is not None and not session.offered:
+            candidates.append(session.pending)  # possibly the turn's final message
+            session.offered = True
+        return texts, candidates
@@ -1,10 +1,34 @@
 """
-TTS worker module — bounded queue and daemon synthesis thread.
+TTS worker module — bounded queue and two-stage synthesis/playback pipeline.
 
 Provides a threading.Queue(maxsize=10) for backpressure, a STATE dict
-for runtime volume/speed/voice/mute control, and a daemon thread that
-consumes individual str sentences, synthesizes via Kokoro or Piper, and
-plays audio via sounddevice.
+for runtime volume/speed/voice/mute control, and these daemon threads:
+
+  tts-synth    — consumes individual str sentences from TTS_QUEUE and
+                 dispatches them to a SynthPool (see synth_pool.py), which
+                 synthesizes up to STATE['synth_workers'] of them at once
+                 via Kokoro or Piper.
+  tts-forward  — hands the results to playback strictly in queue order.
+  tts-playback — plays synthesized clips in order through one persistent
+                 AudioOutput stream (see audio_output.py).
+  tts-speculate — pre-synthesizes text submitted via speculate() into the
+                 audio cache while the other stages are idle (see speculative.py).
+
+The stages are joined by a bounded lookahead buffer (STATE['lookahead'] clips),
+so sentence N+1 is synthesized while sentence N is playing. Without the split,
+every sentence boundary had a dead gap as long as the next synthesis call.
+
+With STATE['streaming'] set, a sentence that misses the audio cache is
+synthesized incrementally (see streaming.py) and its chunks are handed to
+playback as they arrive, so speech starts on the first chunk rather than after
+the whole sentence. Time-to-first-sample is recorded either way.
+
+Engines are leased from an EngineManager (see engine_manager.py): loaded on
+first use, unloaded after STATE['engine_idle_unload_s'] unused or beyond
+STATE['engine_memory_budget_mb'], and reloaded by the next cache miss.
+
+With STATE['synth_isolation'] == 'process', pool workers hand each sentence to
+a child process instead of calling the engine in-process (see synth_process.py).
 
 Each queue item is a single str sentence. The /speak endpoint enqueues
 sentences one by one so audio on sentence 1 begins playing while sentence 2
@@ -12,20 +36,23 @@ is still queued (sentence-level TTS streaming).
 
 CRITICAL: threading.Queue is used intentionally — NOT asyncio.Queue.
 asyncio.Queue is not thread-safe for the bridge between FastAPI's async
-handlers and this blocking daemon thread.
+handlers and these blocking daemon threads.
 
-CRITICAL: kokoro.create() runs ONLY inside _tts_worker(). It is blocking
+CRITICAL: kokoro.create() runs ONLY inside the synthesis stage. It is blocking
 CPU work and must never be called in the async FastAPI handler.
 """
 
+import contextlib
 import logging
+import os
 import platform
 import queue
 import threading
+import time
 from dataclasses import dataclass
+from pathlib import Path
 
 import numpy as np
-import sounddevice as sd
 
 if platform.system() == "Windows":
     import winsound
@@ -48,6 +75,16 @@ else:
 
     AudioDucker = _NoOpDucker  # type: ignore[misc,assignment]
 
+from agenttalk.audio_cache import AudioCache
+from agenttalk.audio_output import AudioOutput
+from agenttalk.config_loader import _config_dir
+from agenttalk.disk_cache import DiskAudioCache
+from agenttalk.engine_manager import EngineManager
+from agenttalk.ort_session import fingerprint as ort_fingerprint, load_kokoro
+from agenttalk.speculative import Preempted, SpeculativeLane
+from agenttalk.streaming import iter_audio_chunks
+from agenttalk.synth_pool import SynthJob, SynthPool, auto_pool_size
+from agenttalk.synth_process import ProcessSynthPool, shared_weights_model
 from agenttalk.tray import create_image_idle, create_image_speaking
 
 
@@ -65,6 +102,25 @@ class _CueItem:
     path: str
 
 
+@dataclass(frozen=True)
+class _Clip:
+    """
+    Synthesized audio handed from the synthesis stage to the playback stage.
+
+    One sentence arrives as one or more clips (several when streaming),
+    always followed by a _SentenceEnd.
+    """
+    samples: np.ndarray
+    rate: int
+    text: str
+
+
+@dataclass(frozen=True)
+class _SentenceEnd:
+    """Closes a sentence's clips — the playback stage inserts the sentence gap here."""
+    text: str
+
+
 # Bounded queue — maxsize=10 implements backpressure (AUDIO-04).
 # Each item is a str sentence or a _CueItem sentinel (plays audio cue, no synthesis).
 # /speak enqueues each sentence individually so sentence 1 plays immediately.
@@ -82,10 +138,62 @@ STATE: dict = {
     "pre_cue_path": None,       # Path to WAV file played before each utterance (CUE-01, CUE-03)
     "post_cue_path": None,      # Path to WAV file played after each utterance (CUE-02, CUE-03)
     "model": "kokoro",          # TTS engine: "kokoro" or "piper" (TTS-04)
+    "kokoro_precision": "fp32",  # Kokoro weights: "fp32" or "int8" (quantized, smaller and faster)
     "piper_model_path": None,   # Absolute path to Piper ONNX model file (TTS-04)
     "speech_mode": "auto",      # "auto" (speak every reply) or "semi-auto" (only on /speak)
+    "lookahead": 2,             # Clips synthesized ahead of playback; read at worker start
+    "output_blocksize": 1024,   # Frames per output stream callback; read at stream open
+    "output_latency": "low",    # PortAudio latency: "low", "high", or seconds; read at stream open
+    "sentence_gap_ms": 50,      # Silence inserted between consecutive sentences
+    "audio_cache_mb": 32,       # In-memory synthesized-audio cache budget; 0 disables
+    "disk_cache_mb": 256,       # On-disk synthesized-audio cache cap; 0 disables
+    "clause_max_chars": 160,    # Split longer sentences at clause boundaries; 0 disables
+    "first_chunk_max_chars": 60,  # Tighter budget for the first chunk of each response
+    "first_chunk_target_ms": 300,  # Shrink the first chunk to fit this synthesis time; 0 disables
+    "streaming": False,         # Play engine output chunk by chunk as it is synthesized (opt-in)
+    "synth_workers": "auto",    # Concurrent synthesis workers: int, or "auto" (cores + measured RTF)
+    "synth_isolation": "thread",  # "thread" (shared engine) or "process" (child processes)
+    "warmup_buffer_size": 20,   # /speak requests held while the engine loads; more get 429
+    "warmup_buffer_max_age_s": 120,  # Held requests older than this are dropped unspoken
+    "speculative": True,        # Pre-synthesize likely-upcoming text into the cache while idle
+    "dedup_ttl_s": 300,         # Sentences spoken in a session are not repeated within this window (0 = off)
+    "transcript_watch": False,  # Speak intermediate messages of hook-registered sessions (opt-in)
+    "transcript_poll_ms": 500,  # How often registered session transcripts are checked for new messages
+    "idle_exit_s": 1800,        # A socket-activated service exits after this long unused (0 = never)
+    "engine_idle_unload_s": 900,  # Unload a TTS engine after this long unused; reloaded on demand (0 = never)
+    "engine_memory_budget_mb": 0,  # Unload least-recently-used engines above this resident total (0 = no cap)
+    "piper_pool_size": 3,       # Piper voices kept loaded for instant switching (LRU beyond this)
+    "piper_pool_mb": 0,         # Cap on the Piper pool's resident total, LRU-evicted (0 = no cap)
+    # ONNX Runtime session options for both engines (see ort_session.py); a change loads new sessions.
+    "ort_intra_op_threads": 0,  # Threads inside one operator (0 = ORT default: all physical cores)
+    "ort_inter_op_threads": 0,  # Threads across operators in "parallel" mode (0 = ORT default)
+    "ort_execution_mode": "sequential",  # "sequential" or "parallel"
+    "ort_graph_optimization": "all",     # "disabled", "basic", "extended" or "all"
+    "ort_cpu_mem_arena": True,  # Reuse freed tensors from ORT's CPU arena (faster, holds memory)
+    "ort_mem_pattern": True,    # Pre-plan allocations from the first run's shapes
+    "ort_provider": "CPUExecutionProvider",  # Execution provider; unavailable ones fall back to CPU
+    "ort_graph_cache": True,    # Reuse optimized graphs saved under models/.cache across starts
+}
+
+# Pipeline counters — exposed via GET /stats. A "stall" is a sentence boundary
+# where playback finished a clip and had to wait for synthesis of the next one.
+PIPELINE_STATS: dict = {
+    "clips_played": 0,          # Synthesized sentences played to completion
+    "playback_stalls": 0,       # Sentence boundaries where playback waited on synthesis
+    "stall_seconds": 0.0,       # Total time spent in those waits
+    "synth_chars_per_sec": 0.0, # Moving average synthesis throughput (cache misses only)
+    "last_ttfs_ms": 0.0,        # Time-to-first-sample of the most recent sentence
+    "avg_ttfs_ms": 0.0,         # Moving average time-to-first-sample
+    "rtf": 0.0,                 # Moving average real-time factor: synthesis time / audio duration
 }
 
+# Wall-clock time the first audio sample was handed to the output — reported by
+# GET /stats as the service's cold-start-to-first-audio.
+_first_audio_at: float | None = None
+
+# Smoothing factor for the synth_chars_per_sec / rtf / ttfs moving averages.
+_THROUGHPUT_ALPHA = 0.2
+
 # Module-level AudioDucker instance — shared between worker and atexit handler.
 # Exported so service.py can register atexit(_ducker.unduck).
 _ducker: AudioDucker = AudioDucker()
@@ -96,51 +204,144 @@ _icon_ref = None
 
 # Consecutive synthesis failure counter — reset on each successful synthesis.
 # Used by _notify_if_degraded() to surface repeated failures via tray notification.
+# Pool workers update it concurrently, so it is only touched under _failures_lock.
 _consecutive_failures: int = 0
+_failures_lock = threading.Lock()
 _MAX_CONSECUTIVE_FAILURES = 3
 
 
-def _notify_if_degraded(msg: str) -> None:
+def _count_failure() -> int:
+    """Count one more consecutive synthesis failure and return the new total."""
+    global _consecutive_failures
+    with _failures_lock:
+        _consecutive_failures += 1
+        return _consecutive_failures
+
+
+def _reset_failures() -> None:
+    global _consecutive_failures
+    with _failures_lock:
+        _consecutive_failures = 0
+
+
+def _notify_if_degraded(msg: str, failures: int) -> None:
     """Send a tray notification once consecutive failure threshold is reached."""
-    if _consecutive_failures >= _MAX_CONSECUTIVE_FAILURES and _icon_ref is not None:
+    if failures >= _MAX_CONSECUTIVE_FAILURES and _icon_ref is not None:
         try:
             _icon_ref.notify(msg)
         except Exception:
             pass
 
-# Lazy-loaded Piper engine instance — None until STATE['model'] first switches to 'piper'.
-# _get_active_engine() creates it on demand and reloads it when piper_model_path changes.
-_piper_engine = None
-_piper_loaded_path: str | None = None  # tracks which .onnx is currently loaded
+# Synthesized-audio cache consulted before the engine dispatcher.
+# Resized from STATE['audio_cache_mb'] before every insert so POST /config applies live.
+_audio_cache = AudioCache(max_bytes=STATE["audio_cache_mb"] * 1024 * 1024)
+
+# Persistent second tier under _config_dir()/cache — survives restarts and reloads.
+_disk_cache = DiskAudioCache(_config_dir() / "cache", max_bytes=STATE["disk_cache_mb"] * 1024 * 1024)
+
+# Optimized ONNX graphs of both engines, reused across restarts (see ort_session.py).
+_graph_cache_dir = _config_dir() / "models" / ".cache"
+
+# Kokoro weights by precision — set by start_tts_worker(). The one selected by
+# STATE['kokoro_precision'] (see _kokoro_model_path()) identifies the model in
+# cache keys (Piper keys use piper_model_path).
+_kokoro_model_paths: dict[str, str] = {}
+
+# Loaded engines — Kokoro and Piper are loaded on first use, unloaded after
+# STATE['engine_idle_unload_s'] unused or beyond STATE['engine_memory_budget_mb'],
+# and loaded again by the next lease (see engine_manager.py). Piper voices form
+# an LRU pool of STATE['piper_pool_size'] (and STATE['piper_pool_mb']), so
+# switching between recent voices needs no load. Limits are applied from STATE
+# before every lease so POST /config takes effect live.
+_engines = EngineManager(
+    idle_timeout=STATE["engine_idle_unload_s"],
+    memory_budget_mb=STATE["engine_memory_budget_mb"],
+    max_per_kind={"kokoro": 1, "piper": STATE["piper_pool_size"]},
+    kind_budget_mb={"piper": STATE["piper_pool_mb"]},
+)
+_engine_lock = threading.Lock()  # guards process-pool creation and the shared-weights copy
+
+# (key, loader) of the engine that last synthesized. After a model or voice
+# switch, sentences keep using it until the newly selected engine has loaded
+# in the background (see _serving_engine()).
+_served: tuple | None = None
+
+# Serialises espeak-ng phonemization across pool workers (see _engine_chunks).
+_phonemize_lock = threading.Lock()
+
+# Process isolation (STATE['synth_isolation'] == 'process') — created on first use.
+# _kokoro_shared_paths maps each Kokoro model to the memory-mappable copy the children load.
+_proc_pool: ProcessSynthPool | None = None
+_kokoro_voices_path: str | None = None
+_kokoro_shared_paths: dict[str, str] = {}
 
 
 # ---------------------------------------------------------------------------
 # Engine dispatcher
 # ---------------------------------------------------------------------------
 
-def _get_active_engine(kokoro):
+def _kokoro_model_path() -> str | None:
+    """Path of the Kokoro weights selected by STATE['kokoro_precision'] (None before start_tts_worker())."""
+    precision = STATE.get("kokoro_precision") or "fp32"
+    return _kokoro_model_paths.get(precision)
+
+
+def _load_kokoro(model_path: str | None, ort_settings: tuple):
     """
-    Return the active TTS engine based on STATE['model'].
+    Load Kokoro from model_path with the given ONNX Runtime settings and run one warmup synthesis.
 
-    When model == 'kokoro' (default): returns the Kokoro engine passed as argument.
-    When model == 'piper': lazy-loads PiperEngine on first call using STATE['piper_model_path'].
+    Warmup forces ONNX Runtime's first-run graph work, eliminating 3-8 s of
+    first-request latency. Raises FileNotFoundError if model files are missing.
+    """
+    for p in (model_path, _kokoro_voices_path):
+        if not p or not Path(p).exists():
+            # The voices file comes with either precision; a model file names its own.
+            precision = next((k for k, v in _kokoro_model_paths.items() if v == p), None)
+            setup = f"agenttalk setup --precision {precision}" if precision else "agenttalk setup"
+            raise FileNotFoundError(f"Model file missing: {p}\nRun '{setup}' to download.")
 
-    Args:
-        kokoro: The Kokoro engine instance (passed from _tts_worker via start_tts_worker).
+    logging.info("Loading Kokoro model from %s ...", model_path)
+    _prepare_disk_cache(model_path)  # re-hash a model file replaced since the last load
+    t0 = time.perf_counter()
+    kokoro = load_kokoro(model_path, _kokoro_voices_path, ort_settings, _graph_cache_dir)
+    t1 = time.perf_counter()
+    logging.info("Kokoro model loaded in %.2f s. Running warmup synthesis...", t1 - t0)
+    samples, rate = kokoro.create("Warmup.", voice="af_heart", speed=1.0, lang="en-us")
+    logging.info(
+        "Warmup synthesis complete in %.2f s (samples=%d, rate=%d).",
+        time.perf_counter() - t1, len(samples), rate,
+    )
+    return kokoro
 
-    Returns:
-        An engine with a create(text, voice, speed, lang) -> (samples, rate) interface.
 
-    Raises:
-        RuntimeError: If model == 'piper' and piper_model_path is not configured in STATE.
-        ImportError: If model == 'piper' and piper-tts package is not installed.
-        FileNotFoundError: If model == 'piper' and the model file does not exist.
+def _load_piper(model_path: str, ort_settings: tuple):
+    """Load a Piper voice with the given ONNX Runtime settings and run one warmup synthesis."""
+    from agenttalk.piper_engine import PiperEngine  # deferred — lazy load
+    logging.info("Initialising Piper engine from %s", model_path)
+    _prepare_disk_cache(model_path)  # re-hash a model file replaced since the last load
+    t0 = time.perf_counter()
+    piper = PiperEngine(model_path, ort_settings, _graph_cache_dir)
+    t1 = time.perf_counter()
+    piper.create("Warmup.")
+    logging.info("Piper voice loaded in %.2f s, warmup %.2f s.", t1 - t0, time.perf_counter() - t1)
+    return piper
+
+
+def _active_engine(model: str | None = None) -> tuple:
+    """
+    Return (key, loader) for the engine selected by STATE['model'] (or model).
+
+    The key includes the ort_* session settings, so changing one loads a new
+    session (the previous engine keeps speaking until it is ready).
 
     TTS-04: Piper TTS switchable at runtime via /agenttalk:model without service restart.
     CFG-03: STATE['model'] is updated by POST /config; next synthesis call uses new engine.
+
+    Raises:
+        RuntimeError: If model == 'piper' and piper_model_path is not configured in STATE.
     """
-    global _piper_engine, _piper_loaded_path
-    model = STATE.get("model", "kokoro")
+    model = model or STATE.get("model", "kokoro")
+    ort_settings = ort_fingerprint(STATE)
     if model == "piper":
         piper_path = STATE.get("piper_model_path")
         if not piper_path:
@@ -149,14 +350,362 @@ def _get_active_engine(kokoro):
                 "Run 'agenttalk setup --piper' to download a model, "
                 "or set piper_model_path in config.json."
             )
-        if _piper_engine is None or _piper_loaded_path != piper_path:
-            from agenttalk.piper_engine import PiperEngine  # deferred — lazy load
-            logging.info("Initialising Piper engine from %s", piper_path)
-            _piper_engine = PiperEngine(piper_path)
-            _piper_loaded_path = piper_path
-        return _piper_engine
-    # Default: Kokoro
-    return kokoro
+        return ("piper", piper_path, ort_settings), lambda: _load_piper(piper_path, ort_settings)
+    kokoro_path = _kokoro_model_path()
+    return ("kokoro", kokoro_path, ort_settings), lambda: _load_kokoro(kokoro_path, ort_settings)
+
+
+def configure_engines() -> None:
+    """Apply the engine_* and piper_pool_* STATE limits to the engine manager."""
+    _engines.idle_timeout = float(STATE.get("engine_idle_unload_s", 0))
+    _engines.memory_budget_mb = float(STATE.get("engine_memory_budget_mb", 0))
+    _engines.max_per_kind["piper"] = max(1, int(STATE.get("piper_pool_size", 1)))
+    _engines.kind_budget_mb["piper"] = float(STATE.get("piper_pool_mb", 0))
+
+
+def engine_lease(model: str | None = None):
+    """
+    Context manager yielding the loaded engine for model (default: STATE['model']).
+
+    Loads and warms the engine first when it is not resident; it cannot be
+    unloaded until the block exits. Raises RuntimeError, ImportError or
+    FileNotFoundError when the engine cannot be loaded.
+    """
+    configure_engines()
+    key, loader = _active_engine(model)
+    return _lease(key, loader)
+
+
+@contextlib.contextmanager
+def _lease(key: tuple, loader):
+    global _served
+    with _engines.lease(key, loader) as engine:
+        _served = (key, loader)
+        yield engine
+
+
+def _serving_engine() -> tuple:
+    """
+    Return (key, loader) of the engine the next sentence should use.
+
+    That is the selected engine (STATE['model'] / piper_model_path) once it is
+    loaded. Right after a switch, while the new engine loads in the background,
+    it is the previously used engine — so queued sentences keep playing in the
+    old voice instead of waiting 2-5 s — and the swap happens at the next
+    sentence boundary after the load completes. Falls through to the selected
+    engine (a blocking load that raises on failure) when its last background
+    load failed or nothing was loaded before.
+    """
+    key, loader = _active_engine()
+    served = _served
+    if served is None or served[0] == key:
+        return key, loader
+    status = _engines.status(key)
+    if status["loaded"] or not _engines.is_loaded(served[0]):
+        return key, loader
+    if not status["loading"]:
+        if status["error"] is not None:
+            return key, loader
+        _engines.preload(key, loader)
+    return served
+
+
+def engine_status() -> dict:
+    """
+    Load state of the selected engine for GET /health.
+
+    `serving` names the engine sentences are synthesized with while the
+    selected one is still loading.
+    """
+    try:
+        key, _loader = _active_engine()
+    except RuntimeError as exc:
+        return {"model": STATE.get("model", "kokoro"), "loaded": False, "loading": False, "error": str(exc)}
+    status = {"model": key[0], **_engines.status(key)}
+    served = _served
+    if served is not None and served[0] != key and status["loading"]:
+        status["serving"] = served[0][0]
+    return status
+
+
+def prefetch_engine(sentences: list[str] = ()) -> bool:
+    """
+    Start loading the active engine in the background if it is not resident.
+
+    Called when speech is queued, so an engine unloaded while idle reloads
+    while earlier sentences and cues play rather than when the first cache
+    miss reaches the pool. Skipped when every sentence is in the in-memory
+    audio cache. Returns True if a load was started.
+    """
+    if sentences and all(_cache_key(s) in _audio_cache for s in sentences):
+        return False
+    try:
+        key, loader = _active_engine()
+    except RuntimeError:
+        return False  # misconfigured — synthesis reports it
+    return _engines.preload(key, loader)
+
+
+def engine_stats() -> dict:
+    """Per-engine load counts, load times and resident size for GET /stats."""
+    configure_engines()
+    return _engines.stats()
+
+
+def _leased_chunks(sentence: str, engine: tuple | None = None):
+    """
+    _engine_chunks() on engine ((key, loader); default: the selected engine),
+    holding its lease until the sentence is done.
+    """
+    configure_engines()
+    key, loader = engine or _active_engine()
+    with _lease(key, loader) as leased:
+        yield from _engine_chunks(leased, sentence)
+
+
+def _cache_key(sentence: str, engine_key: tuple | None = None) -> tuple:
+    """
+    Build the audio cache key for sentence from the current STATE.
+
+    engine_key is the engine manager key (kind, model path, ...) of the engine
+    that synthesizes it — by default the selected engine. Piper ignores the
+    voice argument (the voice is baked into the .onnx file), so the model path
+    alone identifies a Piper voice.
+    """
+    speed = round(float(STATE["speed"]), 3)
+    if engine_key is None:
+        if STATE.get("model", "kokoro") == "piper":
+            engine_key = ("piper", STATE.get("piper_model_path"))
+        else:
+            engine_key = ("kokoro", _kokoro_model_path())
+    kind, model_path = engine_key[:2]
+    if kind == "piper":
+        return ("piper", model_path, None, speed, sentence)
+    return ("kokoro", model_path, STATE["voice"], speed, sentence)
+
+
+def _synthesize(sentence: str):
+    """
+    Yield (samples, rate) chunks for sentence, from the audio caches when possible.
+
+    Lookup order: in-memory AudioCache, then the on-disk cache (promoted into
+    memory on a hit), then synthesis (written to both tiers). A cache hit
+    skips engine loading as well as synthesis, so a cached phrase plays even
+    while its engine is unloaded.
+
+    Cache hits and blocking synthesis yield one chunk. With STATE['streaming']
+    set, a miss yields chunks as the engine produces them; they are joined
+    and cached once the sentence completes.
+    """
+    key = _cache_key(sentence)
+    cached = _audio_cache.get(key)
+    if cached is not None:
+        logging.debug("TTS: cache hit %r", sentence[:60])
+        _note_speculative_hit(key)
+        yield cached
+        return
+    _disk_cache.resize(int(STATE.get("disk_cache_mb", 0) * 1024 * 1024))
+    cached = _disk_cache.get(key)
+    if cached is not None:
+        logging.debug("TTS: disk cache hit %r", sentence[:60])
+        _note_speculative_hit(key)
+        _audio_cache.put(key, *cached)
+        yield cached
+        return
+
+    if STATE.get("synth_isolation") == "process":
+        chunks = _process_chunks(sentence)
+    else:
+        _shutdown_process_pool()
+        engine = _serving_engine()
+        if engine[0][:2] != key[:2]:
+            logging.debug("TTS: %s still loading — using %s.", key[0], engine[0][0])
+            key = _cache_key(sentence, engine[0])
+        chunks = _leased_chunks(sentence, engine)
+    logging.debug("TTS: synthesizing %r", sentence[:60])
+    t0 = time.perf_counter()
+    parts = []
+    for samples, rate in chunks:
+        parts.append(samples)
+        yield samples, rate
+    if not parts:
+        raise RuntimeError(f"Engine produced no audio for: {sentence[:60]!r}")
+    samples = parts[0] if len(parts) == 1 else np.concatenate(parts)
+    _record_throughput(len(sentence), time.perf_counter() - t0, len(samples) / rate)
+    _audio_cache.resize(int(STATE.get("audio_cache_mb", 0) * 1024 * 1024))
+    _audio_cache.put(key, samples, rate)
+    _disk_cache.put(key, samples, rate)
+
+
+def speculate(sentences: list[str]) -> int:
+    """
+    Queue sentences for low-priority pre-synthesis into the audio cache.
+
+    Nothing is played. Returns the number accepted — 0 when the worker has
+    not started or STATE['speculative'] is off.
+    """
+    if _speculative is None or not STATE.get("speculative", True):
+        return 0
+    return _speculative.submit([s for s in sentences if s.strip()])
+
+
+def speculative_stats() -> dict:
+    """Counters of the speculative lane (used vs wasted results) for GET /stats."""
+    return _speculative.stats() if _speculative is not None else {}
+
+
+def _note_speculative_hit(key: tuple) -> None:
+    if _speculative is not None:
+        _speculative.note_hit(key)
+
+
+def _speculate_sentence(sentence: str, should_stop):
+    """
+    Synthesize sentence into the audio caches without playing it.
+
+    Runs on the tts-speculate thread. Returns the cache key, or None when the
+    sentence is already cached or synthesis is muted. With STATE['streaming']
+    set, raises Preempted at the first chunk boundary after foreground
+    synthesis picks up work; a blocking create() call runs to completion.
+    """
+    if STATE["muted"]:
+        return None
+    key = _cache_key(sentence)
+    if key in _audio_cache:
+        return None
+    cached = _disk_cache.get(key)
+    if cached is not None:
+        _audio_cache.put(key, *cached)  # promote so the foreground hit skips the disk
+        return None
+
+    if STATE.get("synth_isolation") == "process":
+        chunks = _process_chunks(sentence)
+    else:
+        chunks = _leased_chunks(sentence)
+    t0 = time.perf_counter()
+    parts = []
+    try:
+        for samples, rate in chunks:
+            parts.append(samples)
+            if STATE.get("streaming") and should_stop():
+                raise Preempted
+    finally:
+        chunks.close()
+    if not parts:
+        raise RuntimeError(f"Engine produced no audio for: {sentence[:60]!r}")
+    samples = parts[0] if len(parts) == 1 else np.concatenate(parts)
+    _record_throughput(len(sentence), time.perf_counter() - t0, len(samples) / rate)
+    _audio_cache.resize(int(STATE.get("audio_cache_mb", 0) * 1024 * 1024))
+    _audio_cache.put(key, samples, rate)
+    _disk_cache.put(key, samples, rate)
+    logging.debug("TTS: speculatively synthesized %r", sentence[:60])
+    return key
+
+
+def _engine_chunks(engine, sentence: str):
+    """
+    Yield (samples, rate) for sentence from engine — chunk by chunk when
+    STATE['streaming'] is set, otherwise in one piece from create().
+
+    espeak-ng, which both engines use to phonemize, keeps global state and is
+    not thread-safe. Kokoro exposes its tokenizer, so only phonemization runs
+    under _phonemize_lock and pool workers run inference concurrently. Piper
+    phonemizes inside synthesize(), so Piper synthesis is serialized as a whole.
+    """
+    kwargs = {"voice": STATE["voice"], "speed": STATE["speed"], "lang": "en-us"}
+    tokenizer = getattr(engine, "tokenizer", None)
+    if tokenizer is None:
+        with _phonemize_lock:
+            yield from _engine_output(engine, sentence, kwargs)
+        return
+    with _phonemize_lock:
+        phonemes = tokenizer.phonemize(sentence, "en-us")
+    yield from _engine_output(engine, phonemes, {**kwargs, "is_phonemes": True})
+
+
+def _engine_output(engine, text: str, kwargs: dict):
+    if STATE.get("streaming"):
+        yield from iter_audio_chunks(engine, text, **kwargs)
+    else:
+        yield engine.create(text, **kwargs)
+
+
+def _engine_spec() -> tuple:
+    """
+    Describe the active engine for a synthesis process (see synth_process.EngineSpec).
+
+    Raises:
+        RuntimeError: If model == 'piper' and piper_model_path is not configured.
+    """
+    if STATE.get("model", "kokoro") == "piper":
+        piper_path = STATE.get("piper_model_path")
+        if not piper_path:
+            raise RuntimeError(
+                "Piper model path not configured. "
+                "Run 'agenttalk setup --piper' to download a model, "
+                "or set piper_model_path in config.json."
+            )
+        return ("agenttalk.piper_engine:PiperEngine", (piper_path, ort_fingerprint(STATE)))
+    model_path = _kokoro_model_path()
+    if not model_path or not _kokoro_voices_path:
+        raise RuntimeError("Kokoro model paths unknown — process isolation unavailable.")
+    with _engine_lock:
+        if model_path not in _kokoro_shared_paths:
+            _kokoro_shared_paths[model_path] = shared_weights_model(
+                model_path, Path(model_path).parent / ".cache",
+            )
+        shared_path = _kokoro_shared_paths[model_path]
+    return ("agenttalk.ort_session:load_kokoro", (shared_path, _kokoro_voices_path, ort_fingerprint(STATE)))
+
+
+def _process_chunks(sentence: str):
+    """Synthesize sentence in a child process (STATE['synth_isolation'] == 'process')."""
+    global _proc_pool
+    spec = _engine_spec()
+    with _engine_lock:
+        if _proc_pool is None:
+            _proc_pool = ProcessSynthPool()
+        pool = _proc_pool
+    return pool.stream(
+        spec,
+        sentence,
+        {"voice": STATE["voice"], "speed": STATE["speed"], "lang": "en-us"},
+        streaming=bool(STATE.get("streaming")),
+        limit=_pool_limit(),
+    )
+
+
+def _shutdown_process_pool() -> None:
+    """Stop synthesis processes after a switch back to thread isolation."""
+    global _proc_pool
+    if _proc_pool is None:
+        return
+    with _engine_lock:
+        pool, _proc_pool = _proc_pool, None
+    if pool is not None:
+        logging.info("Synthesis isolation switched to threads — stopping synthesis processes.")
+        pool.close()
+
+
+def _record_ttfs(seconds: float) -> None:
+    """Record one sentence's time-to-first-sample (synthesis start to first chunk)."""
+    ms = seconds * 1000
+    prev = PIPELINE_STATS["avg_ttfs_ms"]
+    PIPELINE_STATS["last_ttfs_ms"] = ms
+    PIPELINE_STATS["avg_ttfs_ms"] = ms if prev == 0 else prev + _THROUGHPUT_ALPHA * (ms - prev)
+    logging.debug("TTS: time-to-first-sample %.0f ms.", ms)
+
+
+def _record_throughput(chars: int, seconds: float, audio_seconds: float) -> None:
+    """Fold one synthesis call into the synth_chars_per_sec and rtf moving averages."""
+    if seconds <= 0:
+        return
+    for stat, value in (
+        ("synth_chars_per_sec", chars / seconds),
+        ("rtf", seconds / audio_seconds if audio_seconds > 0 else 0.0),
+    ):
+        prev = PIPELINE_STATS[stat]
+        PIPELINE_STATS[stat] = value if prev == 0 else prev + _THROUGHPUT_ALPHA * (value - prev)
 
 
 # ---------------------------------------------------------------------------
@@ -187,40 +736,184 @@ def play_cue(path: str | None) -> None:
 
 
 # ---------------------------------------------------------------------------
-# Worker thread
+# Worker threads
 # ---------------------------------------------------------------------------
 
-def start_tts_worker(kokoro_engine, icon=None) -> threading.Thread:
+# Lookahead buffer between the synthesis and playback stages.
+# Created by start_tts_worker() with room for STATE['lookahead'] clips, each
+# followed by its _SentenceEnd.
+_AUDIO_BUFFER: queue.Queue | None = None
+
+# Set while the synthesis stage has items dispatched but not yet handed to
+# playback. The playback stage uses it to tell a mid-response stall apart from
+# the end of a response.
+_synth_busy = threading.Event()
+
+# Synthesis pool and the in-order hand-off to playback (see synth_pool.py).
+# _jobs carries one SynthJob per dispatched item in TTS_QUEUE order;
+# _jobs_outstanding counts jobs dispatched but not yet fully forwarded.
+MAX_SYNTH_WORKERS = 16  # ceiling for STATE['synth_workers']; threads are created on demand
+_pool: SynthPool | None = None
+_jobs: queue.Queue | None = None
+_jobs_cond = threading.Condition()
+_jobs_outstanding = 0
+
+# Low-priority pre-synthesis lane — created by start_tts_worker().
+_speculative: SpeculativeLane | None = None
+
+# Persistent output stream — created on first use by get_audio_output().
+_output: AudioOutput | None = None
+_output_lock = threading.Lock()
+
+# Once a clip is written, playback waits until only this much of it is still
+# buffered before taking the next item, so the next clip is written before the
+# current one runs out (gapless) without synthesis racing ahead of lookahead.
+_WRITE_AHEAD_SECONDS = 0.15
+
+# Set while the playback stage is playing a clip or cue.
+_playback_active = threading.Event()
+
+# Serialises the speaking -> idle transition, which either stage may trigger.
+_idle_lock = threading.Lock()
+
+
+def start_tts_worker(icon=None, kokoro_model_paths=None, kokoro_voices_path=None) -> threading.Thread:
     """
-    Start the TTS daemon thread.
+    Start the TTS synthesis and playback daemon threads.
 
-    Must be called from the FastAPI lifespan AFTER the Kokoro model is
-    loaded and warmed up. The daemon flag ensures the thread does not
-    prevent process exit.
+    Engines are loaded on first use (see engine_lease()); the service loads
+    the startup engine right after this returns. The daemon flag ensures the
+    threads do not prevent process exit.
 
     Args:
-        kokoro_engine: Loaded Kokoro instance from kokoro_onnx.
         icon: Optional pystray.Icon reference for speaking state indicator (TRAY-03).
               If None, icon image swapping is skipped (safe for testing without tray).
+        kokoro_model_paths: {precision: path} of the Kokoro .onnx files. The one
+              STATE['kokoro_precision'] selects identifies the model in audio
+              cache keys; its hash invalidates the disk cache.
+        kokoro_voices_path: Path of the Kokoro voices file. With kokoro_model_paths,
+              lets the engine manager and synthesis processes load Kokoro.
 
     Returns:
-        The started daemon Thread (for reference; callers need not manage it).
+        The started dispatcher Thread (for reference; callers need not manage it).
     """
-    global _icon_ref
+    global _icon_ref, _AUDIO_BUFFER, _kokoro_voices_path, _pool, _jobs, _speculative
     _icon_ref = icon
+    for precision, path in (kokoro_model_paths or {}).items():
+        _kokoro_model_paths[precision] = str(path)
+    _kokoro_voices_path = str(kokoro_voices_path) if kokoro_voices_path else None
+    threading.Thread(
+        target=_prepare_disk_cache,
+        daemon=True,
+        name="disk-cache-prep",
+    ).start()
+    lookahead = max(1, int(STATE.get("lookahead", 2)))
+    _AUDIO_BUFFER = queue.Queue(maxsize=lookahead * 2)
+    _pool = SynthPool(max_threads=MAX_SYNTH_WORKERS)
+    _jobs = queue.Queue()
+    _speculative = SpeculativeLane(
+        _speculate_sentence,
+        busy=_synthesis_pending,
+    )
+    threading.Thread(
+        target=_playback_worker,
+        args=(_AUDIO_BUFFER,),
+        daemon=True,
+        name="tts-playback",
+    ).start()
+    threading.Thread(
+        target=_forward_worker,
+        args=(_jobs, _AUDIO_BUFFER),
+        daemon=True,
+        name="tts-forward",
+    ).start()
     t = threading.Thread(
         target=_tts_worker,
-        args=(kokoro_engine,),
+        args=(_jobs,),
         daemon=True,
-        name="tts-worker",
+        name="tts-synth",
     )
     t.start()
     logging.info(
-        "TTS worker daemon thread started (icon=%s).", "yes" if icon else "none"
+        "TTS worker daemon threads started (lookahead=%d, synth_workers=%s, icon=%s).",
+        lookahead, STATE.get("synth_workers"), "yes" if icon else "none",
     )
     return t
 
 
+def _pool_limit() -> int:
+    """Current synthesis concurrency from STATE['synth_workers'] ('auto' or an int)."""
+    setting = STATE.get("synth_workers", "auto")
+    if setting != "auto":
+        try:
+            return max(1, min(int(setting), MAX_SYNTH_WORKERS))
+        except (TypeError, ValueError):
+            logging.warning("Invalid synth_workers %r — using auto.", setting)
+    return auto_pool_size(os.cpu_count(), PIPELINE_STATS["rtf"])
+
+
+def get_audio_output() -> AudioOutput:
+    """Return the shared AudioOutput, creating it from STATE on first use."""
+    global _output
+    with _output_lock:
+        if _output is None:
+            _output = AudioOutput(
+                blocksize=int(STATE.get("output_blocksize", 1024)),
+                latency=STATE.get("output_latency", "low"),
+            )
+        return _output
+
+
+def stop_playback() -> None:
+    """Silence the output stream immediately (mute toggle, /stop)."""
+    if _output is not None:
+        _output.stop()
+
+
+def _prepare_disk_cache(model_path: str | None = None) -> None:
+    """Fingerprint model_path (default: the active model) so the first lookup does not hash ~310 MB."""
+    try:
+        if model_path is None:
+            piper = STATE.get("model") == "piper"
+            model_path = STATE.get("piper_model_path") if piper else _kokoro_model_path()
+        _disk_cache.prepare_model(model_path)
+    except Exception:
+        logging.warning("Disk cache preparation failed (non-fatal).", exc_info=True)
+
+
+def cache_stats() -> dict:
+    """Return the audio cache counters (hits, misses, evictions, bytes)."""
+    return _audio_cache.stats()
+
+
+def disk_cache_stats() -> dict:
+    """Return the on-disk audio cache counters."""
+    return _disk_cache.stats()
+
+
+def first_audio_at() -> float | None:
+    """Unix time the first speech sample was played, or None if nothing has played yet."""
+    return _first_audio_at
+
+
+def pipeline_stats() -> dict:
+    """Return a snapshot of PIPELINE_STATS plus the current buffer depth."""
+    stats = dict(PIPELINE_STATS)
+    stats["stall_seconds"] = round(stats["stall_seconds"], 3)
+    stats["synth_chars_per_sec"] = round(stats["synth_chars_per_sec"], 1)
+    stats["last_ttfs_ms"] = round(stats["last_ttfs_ms"], 1)
+    stats["avg_ttfs_ms"] = round(stats["avg_ttfs_ms"], 1)
+    stats["rtf"] = round(stats["rtf"], 3)
+    stats["synth_workers"] = _pool_limit()
+    stats["synth_active"] = _pool.active if _pool is not None else 0
+    stats["synth_peak_active"] = _pool.peak_active if _pool is not None else 0
+    stats["buffered"] = _AUDIO_BUFFER.qsize() if _AUDIO_BUFFER is not None else 0
+    stats["isolation"] = STATE.get("synth_isolation", "thread")
+    if _proc_pool is not None:
+        stats["processes"] = _proc_pool.stats()
+    return stats
+
+
 def _swap_icon(image_fn, label: str) -> None:
     """Swap the tray icon image. No-op if no icon reference is set."""
     if _icon_ref is None:
@@ -231,100 +924,252 @@ def _swap_icon(image_fn, label: str) -> None:
         logging.warning("Icon swap to %s failed (non-fatal).", label, exc_info=True)
 
 
-def _tts_worker(kokoro_engine) -> None:
+def _tts_worker(jobs: queue.Queue) -> None:
     """
-    Blocking TTS synthesis loop — runs in daemon thread.
-
-    Each queue item is a single str sentence. Duck/unduck and cue playback
-    happen per sentence so the first sentence plays immediately after it is
-    synthesized, without waiting for the full batch to queue up.
-
-    Sequence per item:
-      _CueItem: play the cue sound synchronously — no synthesis, no ducking.
-      str sentence:
-        1. Check muted — skip if True
-        2. Skip if blank
-        3. Set speaking=True, swap icon to speaking image
-        4. Resolve active engine — raises on misconfiguration (before ducking)
-        5. Duck other audio sessions
-        6. Synthesize and play the sentence
-        7. Unduck audio sessions
-        8. else: reset consecutive failure counter
-        9. finally: unduck if still ducked, set speaking=False, swap icon, task_done()
+    Synthesis dispatcher — runs in the 'tts-synth' daemon thread.
 
-    Cues fire once per response because /speak pushes _CueItem sentinels before
-    and after the sentence batch — not once per sentence.
+    Each TTS_QUEUE item is a single str sentence or a _CueItem. Every item gets
+    a SynthJob appended to jobs in queue order; sentences are synthesized into
+    their job on the SynthPool (up to _pool_limit() at once), cues are placed
+    in their job directly so they keep their position relative to the speech.
+    The tts-forward thread drains the jobs in order into the audio buffer.
 
-    The try/finally guarantees task_done() is always called, even on error.
-    The 'continue' in the muted/blank branches executes the finally block — correct Python.
+    Dispatch blocks while _pool_limit() + STATE['lookahead'] jobs are
+    outstanding, so concurrent synthesis never races far ahead of playback.
     """
-    global _consecutive_failures
-    logging.info("TTS worker thread running.")
+    logging.info("TTS synthesis dispatcher running.")
     while True:
         item = TTS_QUEUE.get()
+        try:
+            limit = _pool_limit()
+            _open_job(limit + max(1, int(STATE.get("lookahead", 2))))
+            job = SynthJob()
+            jobs.put(job)
+            if isinstance(item, _CueItem):
+                job.put(item)  # cue sentinel — forwarded in order, no synthesis
+                job.close()
+            else:
+                _pool.submit(_synthesize_job, item, job, limit=limit)
+        except Exception:
+            logging.exception("TTS dispatch error — dropping item.")
+        finally:
+            TTS_QUEUE.task_done()
 
-        # Cue sentinel — play sound immediately, no synthesis.
-        if isinstance(item, _CueItem):
-            try:
-                play_cue(item.path)
-            finally:
-                TTS_QUEUE.task_done()
-            continue
 
-        sentence: str = item
-        ducked = False
-        try:
-            if STATE["muted"]:
-                logging.debug("TTS: muted - skipping sentence.")
-                continue
-            if not sentence.strip():
-                continue
+def _synthesize_job(sentence: str, job: SynthJob) -> None:
+    """
+    Synthesize one sentence into its job — runs on a SynthPool worker thread.
 
+    Sequence:
+      1. Check muted — skip if True
+      2. Skip if blank
+      3. Set speaking=True, swap icon to speaking image
+      4. Look the sentence up in the audio cache; on a miss lease the active
+         engine, loading it if needed (raises on misconfiguration), and synthesize
+      5. Put each chunk into the job as it is produced (one chunk unless
+         STATE['streaming'] is set), then a _SentenceEnd sentinel
+      6. else: reset consecutive failure counter
+      7. finally: close the job so the forwarder moves on to the next one
+    """
+    try:
+        if STATE["muted"]:
+            logging.debug("TTS: muted - skipping sentence.")
+            return
+        if not sentence.strip():
+            return
+
+        if not STATE["speaking"]:
             STATE["speaking"] = True
             _swap_icon(create_image_speaking, "speaking")
 
-            # Resolve engine before ducking — avoids briefly silencing other apps
-            # only to fail immediately after with a configuration error.
-            engine = _get_active_engine(kokoro_engine)
-            _ducker.duck()
-            ducked = True
-
-            logging.debug("TTS: synthesizing %r", sentence[:60])
-            samples, rate = engine.create(
-                sentence,
-                voice=STATE["voice"],
-                speed=STATE["speed"],
-                lang="en-us",
-            )
-            scaled = np.clip(samples * STATE["volume"], -1.0, 1.0)
-            sd.play(scaled, samplerate=rate)
-            sd.wait()
-
-            _ducker.unduck()
-            ducked = False
-
-        except (RuntimeError, FileNotFoundError, ImportError) as config_err:
-            # Engine misconfiguration — actionable message, notify user after threshold.
-            _consecutive_failures += 1
-            logging.error(
-                "TTS engine configuration error (failure %d): %s",
-                _consecutive_failures, config_err,
-            )
-            _notify_if_degraded(f"AgentTalk: {config_err}")
+        t0 = time.perf_counter()
+        started = False
+        try:
+            for samples, rate in _synthesize(sentence):
+                if not started:
+                    _record_ttfs(time.perf_counter() - t0)
+                    started = True
+                job.put(_Clip(samples, rate, sentence))
+        finally:
+            if started:  # close the sentence even if streaming failed part-way
+                job.put(_SentenceEnd(sentence))
+
+    except (RuntimeError, FileNotFoundError, ImportError) as config_err:
+        # Engine misconfiguration — actionable message, notify user after threshold.
+        failures = _count_failure()
+        logging.error(
+            "TTS engine configuration error (failure %d): %s",
+            failures, config_err,
+        )
+        _notify_if_degraded(f"AgentTalk: {config_err}", failures)
+    except Exception:
+        failures = _count_failure()
+        logging.exception(
+            "TTS worker error (failure %d) — skipping sentence.", failures
+        )
+        _notify_if_degraded("AgentTalk: TTS synthesis failing. Check the log.", failures)
+    else:
+        _reset_failures()  # reset on clean synthesis
+    finally:
+        job.close()
+
+
+def _forward_worker(jobs: queue.Queue, audio_buffer: queue.Queue) -> None:
+    """
+    In-order hand-off — runs in the 'tts-forward' daemon thread.
+
+    Drains each SynthJob into audio_buffer in dispatch order. The head job is
+    forwarded chunk by chunk while later jobs keep synthesizing on the pool.
+    audio_buffer.put() blocks once the lookahead limit is reached.
+    """
+    while True:
+        job = jobs.get()
+        try:
+            for item in job:
+                audio_buffer.put(item)
         except Exception:
-            _consecutive_failures += 1
-            logging.exception(
-                "TTS worker error (failure %d) — skipping sentence.", _consecutive_failures
-            )
-            _notify_if_degraded("AgentTalk: TTS synthesis failing. Check the log.")
-        else:
-            _consecutive_failures = 0  # reset on clean synthesis
+            logging.exception("TTS forward error — dropping job.")
         finally:
-            if ducked:
-                try:
-                    _ducker.unduck()
-                except Exception:
-                    logging.warning("Unduck in finally failed.", exc_info=True)
+            _close_job()
+            _mark_idle_if_drained()
+
+
+def _open_job(max_outstanding: int) -> None:
+    """Wait for room under max_outstanding, then count a new job as outstanding."""
+    global _jobs_outstanding
+    with _jobs_cond:
+        _jobs_cond.wait_for(lambda: _jobs_outstanding < max_outstanding)
+        _jobs_outstanding += 1
+        _synth_busy.set()
+
+
+def _close_job() -> None:
+    global _jobs_outstanding
+    with _jobs_cond:
+        _jobs_outstanding -= 1
+        if _jobs_outstanding == 0:
+            _synth_busy.clear()
+        _jobs_cond.notify_all()
+
+
+def _synthesis_pending() -> bool:
+    """True while the synthesis stage has work in hand or queued."""
+    return _synth_busy.is_set() or not TTS_QUEUE.empty()
+
+
+def _mark_idle_if_drained() -> None:
+    """Clear the speaking flag and icon once both stages have nothing left to do."""
+    with _idle_lock:
+        if _synthesis_pending() or _playback_active.is_set():
+            return
+        if _AUDIO_BUFFER is not None and not _AUDIO_BUFFER.empty():
+            return
+        if STATE["speaking"]:
             STATE["speaking"] = False
             _swap_icon(create_image_idle, "idle")
-            TTS_QUEUE.task_done()
+
+
+def _playback_worker(audio_buffer: queue.Queue) -> None:
+    """
+    Playback stage — runs in the 'tts-playback' daemon thread.
+
+    Plays clips and cues from audio_buffer strictly in order through the
+    persistent AudioOutput stream, with STATE['sentence_gap_ms'] of silence
+    after each sentence (on its _SentenceEnd). Other audio sessions stay
+    ducked across back-to-back clips and are restored once the buffer drains
+    with no synthesis pending (end of the response).
+
+    When a clip finishes, the buffer is empty, and synthesis is still running,
+    playback is stalled on synthesis: the wait is counted in PIPELINE_STATS
+    so the lookahead depth can be judged from GET /stats.
+    """
+    global _first_audio_at
+    logging.info("TTS playback thread running.")
+    output = get_audio_output()
+    ducked = False
+    after_clip = False  # True when the previous item was a clip that just finished
+    while True:
+        item = None
+        try:
+            item = audio_buffer.get_nowait()
+        except queue.Empty:
+            if after_clip and _synthesis_pending():
+                t0 = time.perf_counter()
+                item = _wait_for_synthesis(audio_buffer)
+                if item is not None:
+                    waited = time.perf_counter() - t0
+                    PIPELINE_STATS["playback_stalls"] += 1
+                    PIPELINE_STATS["stall_seconds"] += waited
+                    logging.debug(
+                        "TTS: playback stalled %.0f ms waiting on synthesis.", waited * 1000
+                    )
+        if item is None:
+            # End of response — let the tail play out, then restore other audio.
+            output.wait()
+            if ducked:
+                _safe_unduck()
+                ducked = False
+            _mark_idle_if_drained()
+            item = audio_buffer.get()
+        after_clip = False
+
+        _playback_active.set()
+        try:
+            if isinstance(item, _CueItem):
+                output.wait()  # cue must not overlap the speech before it
+                play_cue(item.path)
+                continue
+            if isinstance(item, _SentenceEnd):
+                # Sentence complete — inter-sentence gap, then let the next one queue up.
+                if STATE["muted"]:
+                    continue
+                output.write_silence(STATE.get("sentence_gap_ms", 0) / 1000.0)
+                output.wait(_WRITE_AHEAD_SECONDS)
+                PIPELINE_STATS["clips_played"] += 1
+                after_clip = True
+                continue
+            if STATE["muted"]:
+                continue  # muted while buffered — drop without playing
+            if not STATE["speaking"]:
+                STATE["speaking"] = True
+                _swap_icon(create_image_speaking, "speaking")
+            if not ducked:
+                _ducker.duck()
+                ducked = True
+            scaled = np.clip(item.samples * STATE["volume"], -1.0, 1.0)
+            if output.play(scaled, item.rate):
+                if _first_audio_at is None:
+                    _first_audio_at = time.time()
+                output.wait(_WRITE_AHEAD_SECONDS)
+                after_clip = True
+        except Exception:
+            logging.exception("TTS playback error — skipping clip.")
+        finally:
+            _playback_active.clear()
+            audio_buffer.task_done()
+
+
+def _wait_for_synthesis(audio_buffer: queue.Queue):
+    """
+    Block until the next buffered item arrives.
+
+    Returns None if synthesis goes idle without producing one (e.g. the
+    sentence failed), so a failed synthesis never leaves playback ducked.
+    """
+    while True:
+        try:
+            return audio_buffer.get(timeout=0.05)
+        except queue.Empty:
+            if not _synthesis_pending():
+                try:
+                    return audio_buffer.get_nowait()
+                except queue.Empty:
+                    return None
+
+
+def _safe_unduck() -> None:
+    """Restore ducked sessions, logging (not raising) on failure."""
+    try:
+        _ducker.unduck()
+    except Exception:
+        logging.warning("Unduck failed.", exc_info=True)
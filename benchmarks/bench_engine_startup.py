@@ -0,0 +1,108 @@
+"""
+Benchmark: service startup with Kokoro vs Piper as the configured engine.
+
+For each configuration, writes config.json into a temporary config directory
+(models are symlinked from the real one), starts agenttalk.launcher on a spare
+port and measures from the first request — which starts the service — to:
+
+  ready        GET /health returns 200 (engine loaded and warmed)
+  RSS          resident memory of the service once ready
+  engines      which engines are loaded, and their load + warmup time,
+               from GET /stats
+
+Only the configured engine should appear as loaded. The Piper run needs a
+downloaded voice (`agenttalk setup --piper`) and is skipped without one.
+
+Usage:
+    python benchmarks/bench_engine_startup.py [--runs 3] [--piper PATH]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import psutil
+
+PORT = 5059  # away from a running service on 5050 and bench_launcher on 5058
+
+
+def _wait_for(predicate, timeout: float, interval: float = 0.05):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        value = predicate()
+        if value:
+            return value
+        time.sleep(interval)
+    raise TimeoutError(f'gave up after {timeout:.0f} s')
+
+
+def _healthy(client) -> bool:
+    try:
+        status, _body = client.request('GET', '/health', port=PORT, timeout=5)
+    except OSError:
+        return False
+    return status == 200
+
+
+def _start(client, models: Path, config: dict) -> tuple[float, float, list[dict]]:
+    """Start a fresh service with config; return (seconds to ready, RSS MB, engine stats)."""
+    tmp = tempfile.mkdtemp()
+    os.environ['APPDATA'] = os.environ['XDG_CONFIG_HOME'] = tmp  # client and children use the temp dir
+    config_dir = Path(client.config_dir())
+    config_dir.mkdir(parents=True)
+    if models.is_dir():
+        os.symlink(models, config_dir / 'models', target_is_directory=True)
+    (config_dir / 'config.json').write_text(json.dumps(config), encoding='utf-8')
+
+    launcher = subprocess.Popen([sys.executable, '-m', 'agenttalk.launcher', '--port', str(PORT)])
+    try:
+        _wait_for((config_dir / 'launcher.pid').exists, timeout=10)
+        t0 = time.perf_counter()
+        _wait_for(lambda: _healthy(client), timeout=180, interval=0.02)
+        ready = time.perf_counter() - t0
+        _status, stats = client.request('GET', '/stats', port=PORT, timeout=10)
+        rss = psutil.Process(stats['process']['pid']).memory_info().rss / (1024 * 1024)
+        return ready, rss, stats['engines']['engines']
+    finally:
+        launcher.terminate()
+        try:
+            launcher.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            launcher.kill()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=3, help='service starts per configuration')
+    parser.add_argument('--piper', type=Path, help='Piper .onnx voice (default: first in models/piper)')
+    args = parser.parse_args()
+
+    from agenttalk import client
+    models = Path(client.config_dir()) / 'models'
+    piper = args.piper or next(iter(sorted((models / 'piper').glob('*.onnx'))), None)
+
+    configs = [('kokoro', {'model': 'kokoro'})]
+    if piper is not None:
+        configs.append(('piper', {'model': 'piper', 'piper_model_path': str(Path(piper).resolve())}))
+
+    print(f'service start to ready, by configured engine ({sys.platform}, n={args.runs})')
+    print(f'  {"config":<8} {"ready":>9} {"RSS":>9}   engines loaded (load + warmup)')
+    for name, config in configs:
+        results = [_start(client, models, config) for _ in range(args.runs)]
+        ready = statistics.median(r[0] for r in results)
+        rss = statistics.median(r[1] for r in results)
+        loaded = ', '.join(
+            f'{e["kind"]} {e["last_load_s"]:.2f} s' for e in results[-1][2] if e['loaded']
+        ) or 'none'
+        print(f'  {name:<8} {ready * 1000:7.0f} ms {rss:6.1f} MB   {loaded}')
+    if piper is None:
+        print('  piper    skipped — no Piper voice downloaded (agenttalk setup --piper)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark: hook interpreter start-to-exit time.
+
+Runs the Stop and PostToolUse hooks as Claude Code does — a fresh interpreter
+per event, payload on stdin — and times each process from spawn to exit. The
+service is not running and the config directory is an empty temp dir, so the
+numbers are interpreter startup, imports and the refused connection: the fixed
+cost every assistant response pays before any speech is queued.
+
+  --repo PATH   run the hooks from another checkout (e.g. a git worktree of an
+                older commit) to compare against this tree.
+
+Usage:
+    python benchmarks/bench_hook_startup.py [--runs 40] [--repo PATH]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+MESSAGE = 'I have updated the configuration loader so that saved values survive a restart.'
+
+
+def _time(cmd: list[str], payload: dict, env: dict, runs: int) -> tuple[float, float]:
+    data = json.dumps(payload).encode('utf-8')
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run(cmd, input=data, env=env, capture_output=True, check=False)
+        samples.append(time.perf_counter() - t0)
+    samples.sort()
+    return statistics.median(samples) * 1000, samples[int(len(samples) * 0.95)] * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=40, help='hook invocations per hook')
+    parser.add_argument('--repo', type=Path, default=ROOT, help='checkout to run the hooks from')
+    args = parser.parse_args()
+
+    repo = args.repo.resolve()
+    tmp = tempfile.mkdtemp()
+    env = {**os.environ, 'APPDATA': tmp, 'XDG_CONFIG_HOME': tmp, 'PYTHONPATH': str(repo)}
+    transcript = Path(tmp) / 'transcript.jsonl'
+    transcript.write_text(
+        json.dumps({'type': 'assistant', 'message': {'role': 'assistant', 'content': [
+            {'type': 'text', 'text': MESSAGE}, {'type': 'tool_use', 'id': 't1', 'name': 'Read', 'input': {}},
+        ]}}) + '\n',
+        encoding='utf-8',
+    )
+
+    hooks = [
+        ('stop', {'stop_hook_active': False, 'last_assistant_message': MESSAGE}),
+        ('post_tool_use', {'transcript_path': str(transcript)}),
+    ]
+    print(f'hook start-to-exit, service down ({repo}, {sys.platform}, n={args.runs})')
+    print(f'  {"hook":<15} {"median":>9} {"p95":>9}')
+    median, p95 = _time([sys.executable, '-c', 'pass'], {}, env, args.runs)
+    print(f'  {"(bare python)":<15} {median:7.1f} ms {p95:7.1f} ms')
+    for name, payload in hooks:
+        script = repo / 'agenttalk' / 'hooks' / f'{name}_hook.py'
+        median, p95 = _time([sys.executable, str(script)], payload, env, args.runs)
+        print(f'  {name:<15} {median:7.1f} ms {p95:7.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
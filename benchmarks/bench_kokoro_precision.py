@@ -0,0 +1,107 @@
+"""
+Benchmark: Kokoro fp32 vs int8 weights on this CPU.
+
+Each downloaded precision (see installer.KOKORO_MODELS) is measured in a fresh
+Python process, so peak memory is not inherited from the previous run:
+
+  load      session creation + engine construction (no optimized-graph cache — a cold load)
+  warmup    first synthesis, which still pays ONNX Runtime's first-run work
+  RTF       median synthesis time / audio duration (lower is faster; < 1 is faster than real time)
+  peak RSS  highest resident memory of the process, from the OS
+
+The ort_* settings come from config.json, so the numbers match the service.
+Precisions that are not downloaded are skipped (`agenttalk setup --precision int8`).
+
+Usage:
+    python benchmarks/bench_kokoro_precision.py [--repeat 3]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SENTENCES = [
+    'I have updated the configuration loader so that saved values survive a restart.',
+    'All tests pass.',
+    'The benchmark shows a clear improvement on the second run, but the first call is still slow.',
+]
+
+
+def _peak_rss() -> int:
+    """Peak resident set size of this process in bytes, as tracked by the OS."""
+    if sys.platform == 'win32':
+        import psutil
+        return psutil.Process().memory_info().peak_wset
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024  # bytes on macOS, KiB elsewhere
+
+
+def _child(model: Path, voices: Path, repeat: int) -> None:
+    """Measure one model in this process and print the result as JSON."""
+    from agenttalk.config_loader import load_config
+    from agenttalk.ort_session import load_kokoro, settings_from
+
+    t0 = time.perf_counter()
+    engine = load_kokoro(str(model), str(voices), settings_from(load_config()))
+    load_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    engine.create('Warmup.', voice='af_heart', speed=1.0, lang='en-us')
+    warmup_s = time.perf_counter() - t0
+    rtfs = []
+    for _ in range(repeat):
+        for text in SENTENCES:
+            t0 = time.perf_counter()
+            samples, rate = engine.create(text, voice='af_heart', speed=1.0, lang='en-us')
+            rtfs.append((time.perf_counter() - t0) / (len(samples) / rate))
+    print(json.dumps({
+        'load_s': load_s, 'warmup_s': warmup_s, 'rtf': statistics.median(rtfs), 'peak_rss': _peak_rss(),
+    }))
+
+
+def _measure(model: Path, voices: Path, repeat: int) -> dict:
+    proc = subprocess.run(
+        [sys.executable, __file__, '--child', str(model), '--voices', str(voices), '--repeat', str(repeat)],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=3, help='passes over the sample sentences per precision')
+    parser.add_argument('--child', type=Path, help=argparse.SUPPRESS)
+    parser.add_argument('--voices', type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        _child(args.child, args.voices, args.repeat)
+        return
+
+    import platform
+
+    from agenttalk import client
+    from agenttalk.installer import KOKORO_MODELS, VOICES_FILE
+    models = Path(client.config_dir()) / 'models'
+    voices = models / VOICES_FILE
+    if not voices.exists():
+        sys.exit(f'{voices} not found — run: agenttalk setup')
+
+    print(f'Kokoro precision: {platform.processor() or platform.machine()}, {sys.platform}, {args.repeat} passes')
+    print(f'  {"precision":<10} {"size":>8} {"load":>8} {"warmup":>8} {"RTF":>7} {"peak RSS":>10}')
+    for precision, name in KOKORO_MODELS.items():
+        model = models / name
+        if not model.exists():
+            print(f'  {precision:<10} skipped — not downloaded (agenttalk setup --precision {precision})')
+            continue
+        r = _measure(model, voices, args.repeat)
+        print(
+            f'  {precision:<10} {model.stat().st_size / 2**20:5.0f} MB {r["load_s"]:6.2f} s {r["warmup_s"]:6.2f} s'
+            f' {r["rtf"]:7.3f} {r["peak_rss"] / 2**20:7.0f} MB'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark: socket-activated service — cold start to first audio, and resident memory.
+
+Starts agenttalk.launcher on a spare port with a temporary config directory
+(models are symlinked from the real one, so logs, caches and config.json stay
+separate) and measures:
+
+  launcher RSS        resident memory while only the launcher runs
+  cold start          first /speak (which starts the service) to its first audio
+                      sample, as reported by GET /stats process.first_audio_at
+  service RSS         steady-state resident memory of the service after --settle s
+  idle exit           time until the service exits after its last request
+  warm restart        the same /speak after the idle exit: page cache and disk
+                      audio cache are now warm
+
+Needs the service's runtime dependencies and downloaded models.
+
+Usage:
+    python benchmarks/bench_launcher.py [--settle 30] [--idle 10]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import psutil
+
+PORT = 5058  # away from a running service on 5050
+
+
+def _wait_for(predicate, timeout: float, interval: float = 0.05):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        value = predicate()
+        if value:
+            return value
+        time.sleep(interval)
+    raise TimeoutError(f'gave up after {timeout:.0f} s')
+
+
+def _first_audio(client) -> dict | None:
+    try:
+        _status, stats = client.request('GET', '/stats', port=PORT, timeout=5)
+    except OSError:
+        return None
+    process = stats.get('process', {})
+    return process if process.get('first_audio_at') else None
+
+
+def _cold_start(client, text: str) -> tuple[float, float, dict]:
+    """Return (seconds to the /speak response, seconds to first audio, process stats)."""
+    t0 = time.time()
+    status = client.speak(text, port=PORT, timeout=120)
+    responded = time.time() - t0
+    if status not in (200, 202):
+        raise RuntimeError(f'/speak returned HTTP {status}')
+    process = _wait_for(lambda: _first_audio(client), timeout=180, interval=0.1)
+    return responded, process['first_audio_at'] - t0, process
+
+
+def _rss_mb(pid: int) -> float:
+    return psutil.Process(pid).memory_info().rss / (1024 * 1024)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--settle', type=float, default=30, help='seconds to wait before reading steady-state RSS')
+    parser.add_argument('--idle', type=float, default=10, help='idle_exit_s for the benchmarked service')
+    args = parser.parse_args()
+
+    from agenttalk import client
+    models = Path(client.config_dir()) / 'models'
+    tmp = tempfile.mkdtemp()
+    os.environ['APPDATA'] = os.environ['XDG_CONFIG_HOME'] = tmp  # client and children use the temp dir
+    config_dir = Path(client.config_dir())
+    config_dir.mkdir(parents=True)
+    if models.is_dir():
+        os.symlink(models, config_dir / 'models', target_is_directory=True)
+
+    launcher = subprocess.Popen([sys.executable, '-m', 'agenttalk.launcher', '--port', str(PORT)])
+    try:
+        _wait_for((config_dir / 'launcher.pid').exists, timeout=10)
+        launcher_rss = _rss_mb(launcher.pid)
+
+        responded, first_audio, process = _cold_start(client, 'Cold start check for the launcher benchmark.')
+        service_pid = process['pid']
+        time.sleep(args.settle)
+        service_rss = _rss_mb(service_pid)
+
+        # Shorten the idle period only now, so the service does not exit while settling.
+        client.request('POST', '/config', {'idle_exit_s': args.idle}, port=PORT)
+        last_use = time.monotonic()
+        _wait_for(lambda: not psutil.pid_exists(service_pid), timeout=args.idle + 60, interval=0.2)
+        idle_exit = time.monotonic() - last_use
+        launcher_rss_after = _rss_mb(launcher.pid)
+
+        warm_responded, warm_first_audio, _process = _cold_start(
+            client, 'Cold start check for the launcher benchmark.',
+        )
+    finally:
+        launcher.terminate()
+        try:
+            launcher.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            launcher.kill()
+
+    print(f'socket-activated service ({sys.platform}, idle_exit_s={args.idle:g})')
+    print(f'  launcher RSS             {launcher_rss:7.1f} MB')
+    print(f'  cold start: /speak reply {responded * 1000:7.0f} ms')
+    print(f'  cold start: first audio  {first_audio * 1000:7.0f} ms  ({process["first_audio_s"]:.2f} s after process start)')
+    print(f'  service RSS after {args.settle:g} s   {service_rss:7.1f} MB')
+    print(f'  idle exit after          {idle_exit:7.1f} s')
+    print(f'  launcher RSS after exit  {launcher_rss_after:7.1f} MB')
+    print(f'  warm restart: reply      {warm_responded * 1000:7.0f} ms')
+    print(f'  warm restart: 1st audio  {warm_first_audio * 1000:7.0f} ms')
+
+
+if __name__ == '__main__':
+    main()
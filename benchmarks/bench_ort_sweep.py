@@ -0,0 +1,118 @@
+"""
+Benchmark: ONNX Runtime session settings sweep — real-time factor per setting.
+
+Loads the engine once per setting with that ort_* configuration (see
+agenttalk/ort_session.py), runs one warmup synthesis, then synthesizes the
+sample sentences --repeat times and reports:
+
+  load     session creation + engine construction
+  RTF      median synthesis time / audio duration (lower is faster; < 1 is faster than real time)
+  vs base  RTF relative to ONNX Runtime's defaults
+
+Settings are varied one at a time from the defaults: intra-op threads, parallel
+execution with inter-op threads, graph optimization level, and the CPU memory
+arena / memory pattern switches. The fastest row is printed as a config.json
+snippet. Run it while the machine is otherwise as busy as it usually is when
+speech plays — thread counts that win on an idle machine can lose under load.
+
+Usage:
+    python benchmarks/bench_ort_sweep.py [--engine kokoro|piper] [--model PATH] [--repeat 3]
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import psutil
+
+SENTENCES = [
+    'I have updated the configuration loader so that saved values survive a restart.',
+    'All tests pass.',
+    'The benchmark shows a clear improvement on the second run, but the first call is still slow.',
+]
+MIN_GAIN = 0.03  # smaller RTF differences are run-to-run noise
+
+
+def _variants(max_threads: int) -> list[tuple[str, dict]]:
+    threads = sorted(n for n in {1, 2, 4, max_threads} if n <= max_threads)
+    variants = [('defaults', {})]
+    variants += [(f'intra={n}', {'ort_intra_op_threads': n}) for n in threads]
+    variants += [
+        (f'parallel inter={n}', {'ort_execution_mode': 'parallel', 'ort_inter_op_threads': n})
+        for n in (1, 2)
+    ]
+    variants += [(f'opt={level}', {'ort_graph_optimization': level}) for level in ('basic', 'extended')]
+    variants += [
+        ('no cpu arena', {'ort_cpu_mem_arena': False}),
+        ('no mem pattern', {'ort_mem_pattern': False}),
+    ]
+    return variants
+
+
+def _loader(args):
+    if args.engine == 'piper':
+        from agenttalk.piper_engine import PiperEngine
+        return lambda settings: PiperEngine(str(args.model), settings)
+    from agenttalk.ort_session import load_kokoro
+    return lambda settings: load_kokoro(str(args.model), str(args.voices), settings)
+
+
+def _measure(load, settings: dict, repeat: int) -> tuple[float, float]:
+    """Return (load seconds, median RTF) for one setting."""
+    t0 = time.perf_counter()
+    engine = load(settings)
+    load_s = time.perf_counter() - t0
+    engine.create('Warmup.', voice='af_heart', speed=1.0, lang='en-us')
+    rtfs = []
+    for _ in range(repeat):
+        for text in SENTENCES:
+            t0 = time.perf_counter()
+            samples, rate = engine.create(text, voice='af_heart', speed=1.0, lang='en-us')
+            rtfs.append((time.perf_counter() - t0) / (len(samples) / rate))
+    return load_s, statistics.median(rtfs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--engine', choices=('kokoro', 'piper'), default='kokoro')
+    parser.add_argument('--model', type=Path, help='engine .onnx (default: the downloaded model)')
+    parser.add_argument('--voices', type=Path, help='Kokoro voices file (default: the downloaded one)')
+    parser.add_argument('--repeat', type=int, default=3, help='passes over the sample sentences per setting')
+    args = parser.parse_args()
+
+    from agenttalk import client
+    from agenttalk.ort_session import DEFAULTS
+    models = Path(client.config_dir()) / 'models'
+    if args.engine == 'piper':
+        args.model = args.model or next(iter(sorted((models / 'piper').glob('*.onnx'))), None)
+        if args.model is None:
+            sys.exit('No Piper voice found — pass --model or run: agenttalk setup --piper')
+    else:
+        args.model = args.model or models / 'kokoro-v1.0.onnx'
+        args.voices = args.voices or models / 'voices-v1.0.bin'
+
+    cores = psutil.cpu_count(logical=False) or psutil.cpu_count() or 1
+    load = _loader(args)
+    print(f'ONNX Runtime sweep: {args.engine} ({args.model.name}), {cores} physical cores, {sys.platform}')
+    print(f'  {"setting":<20} {"load":>8} {"RTF":>7} {"vs base":>8}')
+    results = []
+    base = None
+    for name, overrides in _variants(cores):
+        settings = {**DEFAULTS, **overrides}
+        load_s, rtf = _measure(load, settings, args.repeat)
+        base = base or rtf
+        results.append((rtf, name, overrides))
+        print(f'  {name:<20} {load_s:6.2f} s {rtf:7.3f} {rtf / base:7.2f}x')
+
+    rtf, name, overrides = min(results, key=lambda r: r[0])
+    print(f'\nfastest: {name} (RTF {rtf:.3f})')
+    if overrides and rtf < base * (1 - MIN_GAIN):
+        print(f'  config.json / POST /config: {json.dumps(overrides)}')
+    else:
+        print(f'  within {MIN_GAIN:.0%} of the defaults — keep them')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark: post_tool_use_hook transcript reading — full read vs tail-seek.
+
+Builds a synthetic Claude Code transcript (default 50 MB of JSONL: tool calls,
+tool results and assistant messages) and times:
+
+  full-read   the previous implementation: read_text().splitlines(), walk backwards
+  tail cold   _extract_assistant_text() with no offset cache
+  tail warm   a repeat call after a few lines were appended (offset cache hit)
+
+Usage:
+    python benchmarks/bench_transcript_reader.py [--mb 50] [--repeat 5]
+"""
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HOOK = Path(__file__).resolve().parent.parent / 'agenttalk' / 'hooks' / 'post_tool_use_hook.py'
+
+
+def _load_hook():
+    spec = importlib.util.spec_from_file_location('post_tool_use_hook', HOOK)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _write_transcript(path: Path, size_mb: int) -> None:
+    """Append rounds of user / tool_use / tool_result / assistant lines until size_mb."""
+    target = size_mb * 1024 * 1024
+    tool_result = 'line of tool output\n' * 150
+    with open(path, 'w', encoding='utf-8') as fh:
+        i = 0
+        while fh.tell() < target:
+            for entry in (
+                {'type': 'user', 'message': {'role': 'user', 'content': f'Request {i}'}},
+                {'type': 'message', 'message': {'role': 'assistant', 'content': [
+                    {'type': 'tool_use', 'name': 'Read', 'input': {'file_path': f'/src/f{i}.py'}}]}},
+                {'type': 'user', 'message': {'role': 'user', 'content': [
+                    {'type': 'tool_result', 'content': tool_result}]}},
+                {'type': 'message', 'message': {'role': 'assistant', 'content': [
+                    {'type': 'text', 'text': f'Finished step {i}. The change compiles and tests pass.'}]}},
+            ):
+                fh.write(json.dumps(entry) + '\n')
+            i += 1
+
+
+def _full_read(path: str) -> str:
+    """The pre-tail-seek implementation, kept verbatim for comparison."""
+    lines = Path(path).read_text(encoding='utf-8').splitlines()
+    for raw_line in reversed(lines):
+        stripped = raw_line.strip()
+        if not stripped:
+            continue
+        try:
+            msg = json.loads(stripped)
+        except json.JSONDecodeError:
+            continue
+        if msg.get('type') == 'message':
+            msg = msg.get('message', msg)
+        if msg.get('role') != 'assistant':
+            continue
+        content = msg.get('content', '')
+        if isinstance(content, str):
+            return content.strip()
+        if isinstance(content, list):
+            parts = [b['text'] for b in content if isinstance(b, dict) and b.get('type') == 'text']
+            return ' '.join(parts).strip()
+    return ''
+
+
+def _time(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mb', type=int, default=50, help='synthetic transcript size in MB')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per measurement (median reported)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['APPDATA'] = os.environ['XDG_CONFIG_HOME'] = tmp  # keep the offset cache out of the real config dir
+        hook = _load_hook()
+        transcript = Path(tmp) / 'transcript.jsonl'
+        _write_transcript(transcript, args.mb)
+        path = str(transcript)
+        size = transcript.stat().st_size / 1024 / 1024
+
+        assert _full_read(path) == hook._extract_assistant_text(path)
+
+        def cold():
+            Path(hook._offset_cache_path()).unlink(missing_ok=True)
+            hook._extract_assistant_text(path)
+
+        def warm():
+            with open(path, 'a', encoding='utf-8') as fh:
+                fh.write(json.dumps({'type': 'user', 'message': {'role': 'user', 'content': 'more'}}) + '\n')
+            hook._extract_assistant_text(path)
+
+        full_ms = _time(lambda: _full_read(path), args.repeat)
+        cold_ms = _time(cold, args.repeat)
+        hook._extract_assistant_text(path)  # prime the cache
+        warm_ms = _time(warm, args.repeat)
+
+    print(f'transcript: {size:.1f} MB ({sys.platform}, median of {args.repeat})')
+    print(f'  full-read  {full_ms:9.2f} ms')
+    print(f'  tail cold  {cold_ms:9.2f} ms   ({full_ms / cold_ms:,.0f}x faster)')
+    print(f'  tail warm  {warm_ms:9.2f} ms   ({full_ms / warm_ms:,.0f}x faster)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark: hook-to-enqueue latency over TCP and over the Unix domain socket.
+
+Starts the real service app (FastAPI + uvicorn, listening on both transports
+via _start_http_server) with the engine startup replaced by a no-op, so
+/speak preprocesses and enqueues into TTS_QUEUE — which a drain thread empties
+— and nothing is synthesized. Each request opens a fresh connection, as a
+hook process does, and is timed from connect to response:
+
+  urllib TCP    urllib.request POST, as the hooks did before agenttalk.client
+  client TCP    agenttalk.client over 127.0.0.1
+  client UDS    agenttalk.client over the Unix socket
+
+Needs the service's runtime dependencies installed (sounddevice, pystray).
+
+Usage:
+    python benchmarks/bench_transport.py [--requests 300]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+PORT = 5057  # away from a running service on 5050
+
+
+def _wait_until_listening(client, deadline: float) -> None:
+    while True:
+        try:
+            client.request('GET', '/health', port=PORT)
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+def _urllib_post(text: str) -> None:
+    req = urllib.request.Request(
+        f'http://localhost:{PORT}/speak',
+        data=json.dumps({'text': text}).encode('utf-8'),
+        headers={'Content-Type': 'application/json'},
+        method='POST',
+    )
+    with urllib.request.urlopen(req, timeout=3) as resp:
+        resp.read()
+
+
+def _time(fn, n: int) -> tuple[float, float]:
+    samples = []
+    for i in range(n):
+        t0 = time.perf_counter()
+        fn(f'Benchmark sentence number {i}.')
+        samples.append(time.perf_counter() - t0)
+    samples.sort()
+    return statistics.median(samples) * 1000, samples[int(len(samples) * 0.95)] * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=300, help='requests per transport')
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ['APPDATA'] = os.environ['XDG_CONFIG_HOME'] = tmp  # keep logs/caches out of the real config dir
+    from agenttalk import client, service
+
+    def _ready_without_engine():
+        service.is_ready = True
+        service._drain_intake()
+
+    def _drain():
+        while True:
+            service.TTS_QUEUE.get()
+            service.TTS_QUEUE.task_done()
+
+    service._startup = _ready_without_engine
+    threading.Thread(target=_drain, daemon=True).start()
+    sock = Path(tmp) / client.SOCKET_NAME
+    service._start_http_server(port=PORT, socket_path=sock)
+
+    client.socket_path = lambda: sock
+    _wait_until_listening(client, time.monotonic() + 10)
+    uds = sock.exists()
+
+    results = [('urllib TCP', _time(_urllib_post, args.requests))]
+    client.socket_path = lambda: Path(tmp) / 'missing.sock'
+    results.append(('client TCP', _time(lambda t: client.speak(t, port=PORT), args.requests)))
+    if uds:
+        client.socket_path = lambda: sock
+        results.append(('client UDS', _time(lambda t: client.speak(t, port=PORT), args.requests)))
+
+    print(f'/speak round trip, new connection per request ({sys.platform}, n={args.requests})')
+    print(f'  {"transport":<12} {"median":>9} {"p95":>9}')
+    for name, (median, p95) in results:
+        print(f'  {name:<12} {median:7.3f} ms {p95:7.3f} ms')
+    if not uds:
+        print('  (no AF_UNIX on this platform — socket transport not measured)')
+
+
+if __name__ == '__main__':
+    main()
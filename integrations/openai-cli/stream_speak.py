@@ -17,27 +17,17 @@ Environment:
 Design: Zero TTS logic here — all audio goes through localhost:5050/speak.
 """
 import argparse
-import json
 import os
 import sys
-import urllib.request
-import urllib.error
+
+from agenttalk import client
 
 
 def _post_speak(text: str, port: int = 5050) -> None:
     """POST text to AgentTalk /speak. Best-effort — never raises."""
-    url = f"http://localhost:{port}/speak"
-    body = json.dumps({"text": text}).encode("utf-8")
-    req = urllib.request.Request(
-        url,
-        data=body,
-        headers={"Content-Type": "application/json"},
-        method="POST",
-    )
     try:
-        with urllib.request.urlopen(req, timeout=3) as _:
-            pass
-    except urllib.error.URLError:
+        client.speak(text, port=port, source='pipe')
+    except OSError:
         pass  # Service offline or busy — silent fail by design
     except Exception as exc:
         print(f"[agenttalk stream_speak] Unexpected error posting to /speak: {exc}", file=sys.stderr)
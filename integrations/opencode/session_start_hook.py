@@ -15,10 +15,10 @@ import platform
 import subprocess
 from pathlib import Path
 
-# Import _config_dir for cross-platform config directory resolution.
+# Import config_dir for cross-platform config directory resolution.
 try:
-    from agenttalk.config_loader import _config_dir
-    CONFIG_DIR = _config_dir()
+    from agenttalk.client import config_dir
+    CONFIG_DIR = Path(config_dir())
 except Exception:
     # Fallback: compute without importing agenttalk
     _system = platform.system()
@@ -32,16 +32,18 @@ except Exception:
         CONFIG_DIR = Path(_xdg) / "AgentTalk"
 
 PID_FILE = CONFIG_DIR / "service.pid"
+# Written by agenttalk.launcher, which owns the sockets and starts the service on demand.
+LAUNCHER_PID_FILE = CONFIG_DIR / "launcher.pid"
 SERVICE_PATH_FILE = CONFIG_DIR / "service_path.txt"
 PYTHONW_PATH_FILE = CONFIG_DIR / "pythonw_path.txt"
 
 
-def _service_is_running() -> bool:
-    """Return True if the service PID file points to a live process."""
-    if not PID_FILE.exists():
+def _pid_file_is_live(pid_file: Path) -> bool:
+    """Return True if pid_file points to a live process."""
+    if not pid_file.exists():
         return False
     try:
-        pid_text = PID_FILE.read_text(encoding='utf-8').strip()
+        pid_text = pid_file.read_text(encoding='utf-8').strip()
         if not pid_text:
             return False
         pid = int(pid_text)
@@ -58,6 +60,11 @@ def _service_is_running() -> bool:
         return False
 
 
+def _service_is_running() -> bool:
+    """Return True if the service, or the launcher that starts it on demand, is running."""
+    return _pid_file_is_live(PID_FILE) or _pid_file_is_live(LAUNCHER_PID_FILE)
+
+
 def main() -> None:
     # Binary read + explicit UTF-8 decode.
     raw = sys.stdin.buffer.read()
@@ -85,10 +92,15 @@ def main() -> None:
     try:
         pythonw = Path(PYTHONW_PATH_FILE.read_text(encoding='utf-8').strip())
         service_py = Path(SERVICE_PATH_FILE.read_text(encoding='utf-8').strip())
+        # Prefer the launcher: it starts the service on the first request and lets
+        # it exit when idle. Older installs without launcher.py start it directly.
+        target = service_py.with_name('launcher.py')
+        if not target.exists():
+            target = service_py
 
         if platform.system() == "Windows":
             subprocess.Popen(
-                [str(pythonw), str(service_py)],
+                [str(pythonw), str(target)],
                 creationflags=(
                     subprocess.DETACHED_PROCESS |
                     subprocess.CREATE_NEW_PROCESS_GROUP
@@ -100,7 +112,7 @@ def main() -> None:
             )
         else:
             subprocess.Popen(
-                [str(pythonw), str(service_py)],
+                [str(pythonw), str(target)],
                 start_new_session=True,
                 close_fds=True,
                 stdin=subprocess.DEVNULL,
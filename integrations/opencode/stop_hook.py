@@ -11,11 +11,9 @@ See integrations/opencode/README.md for registration instructions.
 """
 import sys
 import json
-import urllib.request
-import urllib.error
 
-SERVICE_URL = 'http://localhost:5050/speak'
-CONFIG_URL  = 'http://localhost:5050/config'
+from agenttalk import client
+
 TIMEOUT_SECS = 3  # POST completes in <1s; 3s gives headroom without long block
 
 
@@ -41,32 +39,12 @@ def main() -> None:
     if not text:
         sys.exit(0)
 
-    # Semi-auto guard: fetch current speech_mode before deciding to speak.
-    # Fail-open: if service unreachable or field absent, fall through to auto behavior.
-    cfg_req = urllib.request.Request(CONFIG_URL, method='GET')
-    try:
-        with urllib.request.urlopen(cfg_req, timeout=2) as resp:
-            cfg = json.loads(resp.read().decode('utf-8'))
-        if cfg.get('speech_mode') == 'semi-auto':
-            sys.exit(0)
-    except urllib.error.URLError:
-        pass  # service unreachable — fall through to speak
-    except Exception as exc:
-        print(f"[agenttalk opencode hook] Unexpected error reading config: {exc}", file=sys.stderr)
-
-    # POST text to /speak endpoint.
-    body = json.dumps({'text': text}).encode('utf-8')
-    req = urllib.request.Request(
-        SERVICE_URL,
-        data=body,
-        headers={'Content-Type': 'application/json'},
-        method='POST',
-    )
+    # POST text to /speak endpoint. source='auto-hook' makes the service apply
+    # the semi-auto guard itself, so this is the only request.
     try:
-        with urllib.request.urlopen(req, timeout=TIMEOUT_SECS) as _:
-            pass
-    except urllib.error.URLError:
-        pass  # Service not running or 503 warmup — silent fail
+        client.speak(text, timeout=TIMEOUT_SECS, source='auto-hook')
+    except OSError:
+        pass  # Service not running — silent fail
     except Exception as exc:
         print(f"[agenttalk opencode hook] Unexpected error: {exc}", file=sys.stderr)
 
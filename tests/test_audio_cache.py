@@ -0,0 +1,71 @@
+"""
+Unit tests for agenttalk/audio_cache.py — byte-bounded LRU of synthesized clips.
+"""
+import numpy as np
+import pytest
+
+from agenttalk.audio_cache import AudioCache
+
+
+def _clip(frames: int) -> np.ndarray:
+    return np.zeros(frames, dtype=np.float32)  # 4 bytes per frame
+
+
+def _key(text: str) -> tuple:
+    return ("kokoro", "kokoro-v1.0", "af_heart", 1.0, text)
+
+
+def test_miss_then_hit_counts():
+    cache = AudioCache(max_bytes=1024)
+    assert cache.get(_key("Done.")) is None
+    cache.put(_key("Done."), _clip(10), 24000)
+    samples, rate = cache.get(_key("Done."))
+    assert rate == 24000
+    assert len(samples) == 10
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_eviction_is_bounded_by_bytes_and_lru_ordered():
+    cache = AudioCache(max_bytes=100)  # room for two 40-byte clips
+    cache.put(_key("a"), _clip(10), 24000)
+    cache.put(_key("b"), _clip(10), 24000)
+    cache.get(_key("a"))  # "b" is now least recently used
+    cache.put(_key("c"), _clip(10), 24000)
+
+    assert _key("a") in cache
+    assert _key("b") not in cache
+    assert _key("c") in cache
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] == 80
+
+
+def test_clip_larger_than_budget_is_not_cached():
+    cache = AudioCache(max_bytes=16)
+    cache.put(_key("long"), _clip(100), 24000)
+    assert _key("long") not in cache
+    assert cache.stats()["bytes"] == 0
+
+
+def test_resize_evicts_down_to_new_limit():
+    cache = AudioCache(max_bytes=1000)
+    for text in ("a", "b", "c"):
+        cache.put(_key(text), _clip(10), 24000)
+    cache.resize(40)
+    assert cache.stats()["entries"] == 1
+    assert _key("c") in cache
+
+
+def test_zero_budget_disables_cache():
+    cache = AudioCache(max_bytes=0)
+    cache.put(_key("a"), _clip(1), 24000)
+    assert cache.get(_key("a")) is None
+
+
+def test_cached_samples_are_read_only():
+    cache = AudioCache(max_bytes=1024)
+    cache.put(_key("a"), _clip(4), 24000)
+    samples, _ = cache.get(_key("a"))
+    with pytest.raises(ValueError):
+        samples[0] = 1.0
@@ -0,0 +1,102 @@
+"""
+Unit tests for agenttalk/audio_output.py.
+
+Exercises the ring buffer and the stream callback directly — no PortAudio
+stream is opened, so these run on machines without an audio device.
+"""
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from agenttalk.audio_output import AudioOutput, _RingBuffer
+
+
+_OK = SimpleNamespace(output_underflow=False)
+
+
+def test_ring_buffer_round_trip_with_wraparound():
+    ring = _RingBuffer(8)
+    assert ring.write(np.arange(6, dtype=np.float32))
+    out = np.zeros(4, dtype=np.float32)
+    assert ring.read_into(out) == 4
+    assert out.tolist() == [0, 1, 2, 3]
+
+    # Next write wraps past the end of the backing array
+    assert ring.write(np.arange(6, 12, dtype=np.float32))
+    out = np.zeros(8, dtype=np.float32)
+    assert ring.read_into(out) == 8
+    assert out.tolist() == [4, 5, 6, 7, 8, 9, 10, 11]
+    assert ring.buffered == 0
+
+
+def test_ring_buffer_write_blocks_until_space_frees():
+    ring = _RingBuffer(4)
+    done = threading.Event()
+
+    def _writer():
+        ring.write(np.ones(10, dtype=np.float32))
+        done.set()
+
+    threading.Thread(target=_writer, daemon=True).start()
+    time.sleep(0.05)
+    assert not done.is_set()  # blocked: 10 frames into a 4-frame buffer
+
+    out = np.zeros(4, dtype=np.float32)
+    total = 0
+    deadline = time.monotonic() + 2
+    while total < 10 and time.monotonic() < deadline:
+        total += ring.read_into(out)
+    assert done.wait(1)
+    assert total == 10
+
+
+def test_ring_buffer_clear_aborts_blocked_writer():
+    ring = _RingBuffer(4)
+    result = []
+    t = threading.Thread(
+        target=lambda: result.append(ring.write(np.ones(10, dtype=np.float32))),
+        daemon=True,
+    )
+    t.start()
+    time.sleep(0.05)
+    ring.clear()
+    t.join(1)
+    assert result == [False]
+    assert ring.buffered == 0
+
+
+def test_callback_zero_fills_and_counts_underrun_mid_write():
+    output = AudioOutput(blocksize=4)
+    output._ring = _RingBuffer(16)
+    output._ring.write(np.full(2, 0.5, dtype=np.float32))
+    outdata = np.full((4, 1), 9.0, dtype=np.float32)
+
+    output._writing = True  # a clip is still being written
+    output._callback(outdata, 4, None, _OK)
+
+    assert outdata[:, 0].tolist() == [0.5, 0.5, 0.0, 0.0]
+    assert output.underruns == 1
+
+
+def test_callback_silence_between_utterances_is_not_an_underrun():
+    output = AudioOutput(blocksize=4)
+    output._ring = _RingBuffer(16)
+    outdata = np.ones((4, 1), dtype=np.float32)
+
+    output._callback(outdata, 4, None, _OK)
+
+    assert not outdata.any()
+    assert output.underruns == 0
+
+
+def test_callback_counts_portaudio_underflow_flag():
+    output = AudioOutput()
+    output._ring = _RingBuffer(16)
+    output._ring.write(np.ones(4, dtype=np.float32))
+    outdata = np.zeros((4, 1), dtype=np.float32)
+
+    output._callback(outdata, 4, None, SimpleNamespace(output_underflow=True))
+
+    assert output.underruns == 1
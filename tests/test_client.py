@@ -0,0 +1,129 @@
+"""
+Unit tests for agenttalk/client.py.
+
+Serves a tiny JSON echo handler over TCP and over a Unix domain socket and
+checks which transport the client picks.
+"""
+import http.server
+import json
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from agenttalk import client
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        reply = json.dumps({'via': self.server.name, 'got': json.loads(body)}).encode('utf-8')
+        self.send_response(202)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, *args):
+        pass
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        conn, _addr = super().get_request()
+        return conn, ('local', 0)  # BaseHTTPRequestHandler expects a (host, port) address
+
+
+def _serve(server, name):
+    server.name = name
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def tcp_server():
+    server = _serve(http.server.ThreadingHTTPServer(('127.0.0.1', 0), _Handler), 'tcp')
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+def test_falls_back_to_tcp_without_socket_file(tmp_path, monkeypatch, tcp_server):
+    monkeypatch.setattr(client, 'socket_path', lambda: tmp_path / 'agenttalk.sock')
+    status, body = client.request('POST', '/speak', {'text': 'hi'}, port=tcp_server)
+    assert (status, body['via'], body['got']) == (202, 'tcp', {'text': 'hi'})
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='no Unix domain sockets')
+def test_prefers_unix_socket(tmp_path, monkeypatch, tcp_server):
+    path = tmp_path / 'agenttalk.sock'
+    server = _serve(_UnixServer(str(path), _Handler), 'uds')
+    monkeypatch.setattr(client, 'socket_path', lambda: path)
+    try:
+        assert client.speak('hi') == 202
+        assert client.request('POST', '/speak', {'text': 'hi'})[1]['via'] == 'uds'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='no Unix domain sockets')
+def test_non_default_port_skips_the_default_socket(tmp_path, monkeypatch, tcp_server):
+    path = tmp_path / 'agenttalk.sock'
+    server = _serve(_UnixServer(str(path), _Handler), 'uds')
+    monkeypatch.setattr(client, 'socket_path', lambda: path)
+    try:
+        assert tcp_server != client.DEFAULT_PORT
+        assert client.request('POST', '/speak', {'text': 'hi'}, port=tcp_server)[1]['via'] == 'tcp'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='no Unix domain sockets')
+def test_stale_socket_file_falls_back_to_tcp(tmp_path, monkeypatch, tcp_server):
+    path = tmp_path / 'agenttalk.sock'
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(path))
+    stale.close()  # file remains, nothing listens
+    monkeypatch.setattr(client, 'socket_path', lambda: path)
+    assert client.request('POST', '/speak', {'text': 'hi'}, port=tcp_server)[1]['via'] == 'tcp'
+
+
+def test_unreachable_service_raises_oserror(tmp_path, monkeypatch):
+    monkeypatch.setattr(client, 'socket_path', lambda: tmp_path / 'agenttalk.sock')
+    probe = socket.socket()
+    probe.bind(('127.0.0.1', 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    with pytest.raises(OSError):
+        client.speak('hi', port=port)
+
+
+IMPORT_BUDGET_US = 30_000  # measured ~8 ms; generous for slow CI machines
+HEAVY_MODULES = {
+    'http.client', 'urllib.request', 'email', 'ssl', 'pathlib', 'platform',
+    'logging', 'asyncio', 'agenttalk.config_loader',
+}
+
+
+def test_import_stays_within_cold_start_budget():
+    """Hooks pay this import on every event — keep it to os/sys/socket/json."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import agenttalk.client'],
+        capture_output=True, text=True, check=True,
+    )
+    lines = [l for l in result.stderr.splitlines() if l.startswith('import time:')]
+    # Everything before the top-level `site` entry is interpreter startup.
+    start = next((i + 1 for i, l in enumerate(lines) if l.rstrip().endswith('| site')), 0)
+    imported = {}
+    for line in lines[start:]:
+        _self, cumulative, name = line[len('import time:'):].split('|')
+        imported[name.strip()] = int(cumulative)
+    assert not HEAVY_MODULES & set(imported), sorted(HEAVY_MODULES & set(imported))
+    assert imported['agenttalk.client'] < IMPORT_BUDGET_US
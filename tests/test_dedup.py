@@ -0,0 +1,52 @@
+"""
+Unit tests for agenttalk/dedup.py.
+"""
+import time
+
+from agenttalk.dedup import SentenceDedup, sentence_key
+
+
+def test_normalization_ignores_case_punctuation_and_spacing():
+    assert sentence_key("Done.") == sentence_key("  done!")
+    assert sentence_key("Tests  pass, mostly.") == sentence_key("tests pass mostly")
+    assert sentence_key("Tests pass.") != sentence_key("Tests fail.")
+
+
+def test_extension_of_spoken_partial_keeps_only_new_sentences():
+    dedup = SentenceDedup(ttl=60)
+    assert dedup.claim("s1", ["I read the file.", "The bug is in save."]) == [
+        "I read the file.", "The bug is in save.",
+    ]
+    assert dedup.claim("s1", ["I read the file.", "The bug is in save.", "I fixed it."]) == ["I fixed it."]
+    assert dedup.stats()["suppressed"] == 2
+
+
+def test_scoped_per_session_and_skipped_without_one():
+    dedup = SentenceDedup(ttl=60)
+    dedup.claim("s1", ["Hello there."])
+    assert dedup.claim("s2", ["Hello there."]) == ["Hello there."]
+    assert dedup.claim(None, ["Hello there."]) == ["Hello there."]
+    assert dedup.claim(None, ["Hello there."]) == ["Hello there."]
+
+
+def test_repeats_within_one_request_are_kept():
+    dedup = SentenceDedup(ttl=60)
+    assert dedup.claim("s1", ["Done.", "Next step.", "Done."]) == ["Done.", "Next step.", "Done."]
+
+
+def test_ttl_expiry_and_release():
+    dedup = SentenceDedup(ttl=0.05)
+    dedup.claim("s1", ["Hello there."])
+    time.sleep(0.1)
+    assert dedup.claim("s1", ["Hello there."]) == ["Hello there."]
+
+    dedup.ttl = 60
+    dedup.release("s1", ["Hello there."])
+    assert dedup.claim("s1", ["Hello there."]) == ["Hello there."]
+
+
+def test_max_entries_evicts_oldest():
+    dedup = SentenceDedup(ttl=60, max_entries=2)
+    dedup.claim("s1", ["One.", "Two.", "Three."])
+    assert dedup.stats()["entries"] == 2
+    assert dedup.claim("s1", ["One."]) == ["One."]
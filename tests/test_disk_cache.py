@@ -0,0 +1,106 @@
+"""
+Unit tests for agenttalk/disk_cache.py — persistent int16 PCM audio cache.
+
+All files live under pytest's tmp_path; the real config directory is never touched.
+"""
+import os
+
+import numpy as np
+
+from agenttalk.disk_cache import DiskAudioCache
+
+
+def _key(model_path, text="All tests pass."):
+    return ("kokoro", str(model_path), "af_heart", 1.0, text)
+
+
+def _model(tmp_path, content=b"weights-v1"):
+    path = tmp_path / "model.onnx"
+    path.write_bytes(content)
+    return path
+
+
+def test_round_trip_survives_a_new_instance(tmp_path):
+    model = _model(tmp_path)
+    samples = np.linspace(-0.5, 0.5, 2400, dtype=np.float32)
+    DiskAudioCache(tmp_path / "cache", max_bytes=1 << 20).put(_key(model), samples, 24000)
+
+    reopened = DiskAudioCache(tmp_path / "cache", max_bytes=1 << 20)
+    got, rate = reopened.get(_key(model))
+
+    assert rate == 24000
+    assert got.dtype == np.float32
+    np.testing.assert_allclose(got, samples, atol=1 / 16384)  # int16 quantisation
+    assert reopened.stats()["hits"] == 1
+
+
+def test_entries_are_stored_as_int16(tmp_path):
+    model = _model(tmp_path)
+    cache = DiskAudioCache(tmp_path / "cache", max_bytes=1 << 20)
+    cache.put(_key(model), np.zeros(1000, dtype=np.float32), 22050)
+    (entry,) = (tmp_path / "cache").glob("*.pcm")
+    assert entry.stat().st_size == 16 + 2 * 1000
+
+
+def test_model_change_invalidates_entries(tmp_path):
+    model = _model(tmp_path)
+    cache = DiskAudioCache(tmp_path / "cache", max_bytes=1 << 20)
+    cache.put(_key(model), np.zeros(100, dtype=np.float32), 24000)
+
+    model.write_bytes(b"weights-v2-different-size")
+    restarted = DiskAudioCache(tmp_path / "cache", max_bytes=1 << 20)
+
+    assert restarted.get(_key(model)) is None
+    assert restarted.stats()["invalidated"] == 1
+    assert not list((tmp_path / "cache").glob("*.pcm"))
+
+
+def test_model_replaced_while_running_is_rehashed(tmp_path):
+    model = _model(tmp_path)
+    cache = DiskAudioCache(tmp_path / "cache", max_bytes=1 << 20)
+    cache.prepare_model(str(model))
+    cache.put(_key(model), np.zeros(100, dtype=np.float32), 24000)
+    assert cache.get(_key(model)) is not None
+
+    model.write_bytes(b"weights-v2-different-size")  # same instance, memoised hash
+    cache.prepare_model(str(model))
+
+    assert cache.get(_key(model)) is None
+    assert cache.stats()["invalidated"] == 1
+
+
+def test_size_cap_evicts_least_recently_used(tmp_path):
+    model = _model(tmp_path)
+    entry_bytes = 16 + 2 * 1000
+    cache = DiskAudioCache(tmp_path / "cache", max_bytes=int(entry_bytes * 2.5))
+    clip = np.zeros(1000, dtype=np.float32)
+
+    cache.put(_key(model, "a"), clip, 24000)
+    cache.put(_key(model, "b"), clip, 24000)
+    old = (tmp_path / "cache").glob("*.pcm")
+    for i, path in enumerate(sorted(old, key=os.path.getmtime)):
+        os.utime(path, (1000 + i, 1000 + i))  # deterministic ordering: "a" oldest
+    cache.get(_key(model, "a"))  # touch "a" — "b" becomes LRU
+    cache.put(_key(model, "c"), clip, 24000)
+
+    assert cache.get(_key(model, "a")) is not None
+    assert cache.get(_key(model, "b")) is None
+    assert cache.get(_key(model, "c")) is not None
+    assert cache.stats()["evictions"] >= 1
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    model = _model(tmp_path)
+    cache = DiskAudioCache(tmp_path / "cache", max_bytes=1 << 20)
+    cache.put(_key(model), np.zeros(10, dtype=np.float32), 24000)
+    (entry,) = (tmp_path / "cache").glob("*.pcm")
+    entry.write_bytes(b"garbage")
+
+    assert cache.get(_key(model)) is None
+
+
+def test_zero_cap_disables(tmp_path):
+    cache = DiskAudioCache(tmp_path / "cache", max_bytes=0)
+    cache.put(_key(None), np.zeros(10, dtype=np.float32), 24000)
+    assert cache.get(_key(None)) is None
+    assert not (tmp_path / "cache").exists()
@@ -0,0 +1,238 @@
+"""
+Unit tests for agenttalk/engine_manager.py.
+
+Loaders return plain objects; process RSS is a fake counter that each load
+grows, so resident sizes are exact.
+"""
+import threading
+import time
+
+from agenttalk.engine_manager import EngineManager
+
+MB = 1024 * 1024
+
+
+class _FakeRss:
+    """Process RSS stand-in: loaders call grow() to simulate model allocation."""
+
+    def __init__(self):
+        self.value = 100 * MB
+
+    def __call__(self) -> int:
+        return self.value
+
+    def grow(self, mb: int) -> None:
+        self.value += mb * MB
+
+
+def _loader(rss: _FakeRss, name: str, mb: int = 10, delay: float = 0.0, calls: list | None = None):
+    def load():
+        if calls is not None:
+            calls.append(name)
+        time.sleep(delay)
+        rss.grow(mb)
+        return {"engine": name}
+    return load
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def _use(manager, key, loader):
+    with manager.lease(key, loader) as engine:
+        return engine
+
+
+def test_concurrent_leases_load_once():
+    rss = _FakeRss()
+    manager = EngineManager(rss=rss)
+    calls = []
+    loader = _loader(rss, "k", delay=0.2, calls=calls)
+    engines = []
+    threads = [
+        threading.Thread(target=lambda: engines.append(_use(manager, ("kokoro", "m"), loader)))
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert calls == ["k"]
+    assert len(engines) == 4 and all(e is engines[0] for e in engines)
+    (stats,) = manager.stats()["engines"]
+    assert stats["loads"] == 1 and stats["rss_mb"] == 10.0 and stats["in_use"] == 0
+
+
+def test_idle_engine_is_unloaded_and_reloaded_on_next_lease():
+    rss = _FakeRss()
+    manager = EngineManager(idle_timeout=0.05, rss=rss)
+    calls = []
+    loader = _loader(rss, "k", calls=calls)
+    key = ("kokoro", "m")
+    _use(manager, key, loader)
+
+    assert manager.sweep() == []  # just used
+    time.sleep(0.1)
+    assert manager.sweep() == [key]
+    assert not manager.is_loaded(key)
+
+    _use(manager, key, loader)
+    assert calls == ["k", "k"]
+    (stats,) = manager.stats()["engines"]
+    assert (stats["loads"], stats["idle_unloads"], stats["loaded"]) == (2, 1, True)
+
+
+def test_leased_engine_is_never_unloaded():
+    rss = _FakeRss()
+    manager = EngineManager(idle_timeout=0.01, rss=rss)
+    key = ("kokoro", "m")
+    with manager.lease(key, _loader(rss, "k")):
+        time.sleep(0.05)
+        assert manager.sweep() == []
+        assert manager.unload(key) is False
+    time.sleep(0.05)
+    assert manager.sweep() == [key]
+
+
+def test_memory_budget_evicts_least_recently_used():
+    rss = _FakeRss()
+    manager = EngineManager(memory_budget_mb=250, rss=rss)
+    kokoro, piper = ("kokoro", "k.onnx"), ("piper", "p.onnx")
+    _use(manager, kokoro, _loader(rss, "k", mb=200))
+    _use(manager, piper, _loader(rss, "p", mb=100))  # over budget: kokoro is older
+
+    assert not manager.is_loaded(kokoro)
+    assert manager.is_loaded(piper)
+    stats = manager.stats()
+    assert stats["loaded_mb"] == 100.0
+    by_kind = {e["kind"]: e for e in stats["engines"]}
+    assert by_kind["kokoro"]["budget_unloads"] == 1
+
+
+def test_budget_keeps_the_most_recent_engine_even_when_it_alone_exceeds_it():
+    rss = _FakeRss()
+    manager = EngineManager(memory_budget_mb=50, rss=rss)
+    key = ("kokoro", "m")
+    _use(manager, key, _loader(rss, "k", mb=200))
+    assert manager.sweep() == []
+    assert manager.is_loaded(key)
+
+
+def test_per_kind_limit_unloads_previous_model():
+    rss = _FakeRss()
+    manager = EngineManager(max_per_kind={"piper": 1}, rss=rss)
+    _use(manager, ("piper", "a.onnx"), _loader(rss, "a"))
+    _use(manager, ("piper", "b.onnx"), _loader(rss, "b"))
+    _use(manager, ("kokoro", "k.onnx"), _loader(rss, "k"))
+
+    assert not manager.is_loaded(("piper", "a.onnx"))
+    assert manager.is_loaded(("piper", "b.onnx"))
+    assert manager.is_loaded(("kokoro", "k.onnx"))
+
+
+def test_failed_load_is_raised_to_every_waiter_and_retried_later():
+    rss = _FakeRss()
+    manager = EngineManager(rss=rss)
+    key = ("piper", "missing.onnx")
+    attempts = []
+
+    def failing():
+        attempts.append(1)
+        time.sleep(0.1)
+        raise FileNotFoundError("missing.onnx")
+
+    errors = []
+
+    def lease():
+        try:
+            _use(manager, key, failing)
+        except FileNotFoundError as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=lease) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(attempts) == 1 and len(errors) == 3
+
+    assert _use(manager, key, _loader(rss, "p")) == {"engine": "p"}
+
+
+def test_preload_loads_in_background_and_lease_waits_for_it():
+    rss = _FakeRss()
+    manager = EngineManager(rss=rss)
+    calls = []
+    loader = _loader(rss, "k", delay=0.1, calls=calls)
+    key = ("kokoro", "m")
+
+    assert manager.preload(key, loader) is True
+    assert manager.preload(key, loader) is False  # already loading
+    assert _use(manager, key, loader) == {"engine": "k"}
+    assert calls == ["k"]
+    assert manager.stats()["engines"][0]["last_load_s"] >= 0.1
+
+
+def test_zero_idle_timeout_keeps_engines_loaded():
+    rss = _FakeRss()
+    manager = EngineManager(idle_timeout=0, rss=rss)
+    _use(manager, ("kokoro", "m"), _loader(rss, "k"))
+    time.sleep(0.02)
+    assert manager.sweep() == []
+
+
+def test_status_reports_load_in_flight_and_last_error():
+    rss = _FakeRss()
+    manager = EngineManager(rss=rss)
+    key = ("piper", "v.onnx")
+    assert manager.status(key) == {
+        "loaded": False, "loading": False, "loading_s": None, "last_load_s": 0.0, "error": None,
+    }
+
+    def failing():
+        raise ImportError("piper-tts not installed")
+
+    manager.preload(key, failing)
+    _wait_for(lambda: not manager.status(key)["loading"])
+    assert manager.status(key)["error"] == "piper-tts not installed"
+
+    manager.preload(key, _loader(rss, "p", delay=0.2))
+    time.sleep(0.05)
+    status = manager.status(key)
+    assert status["loading"] and status["loading_s"] >= 0.0
+    _wait_for(lambda: manager.status(key)["loaded"])
+    status = manager.status(key)
+    assert status["error"] is None and status["last_load_s"] >= 0.2
+
+
+def test_pool_keeps_recent_voices_loaded_within_count_and_memory_caps():
+    rss = _FakeRss()
+    manager = EngineManager(max_per_kind={"piper": 2}, kind_budget_mb={"piper": 100}, rss=rss)
+    calls = []
+    a, b, c = ("piper", "a.onnx"), ("piper", "b.onnx"), ("piper", "c.onnx")
+    _use(manager, a, _loader(rss, "a", mb=40, calls=calls))
+    _use(manager, b, _loader(rss, "b", mb=40, calls=calls))
+    _use(manager, a, _loader(rss, "a", mb=40, calls=calls))  # switch back: no load
+    assert calls == ["a", "b"]
+
+    _use(manager, c, _loader(rss, "c", mb=40, calls=calls))  # count cap: b is least recent
+    assert [manager.is_loaded(k) for k in (a, b, c)] == [True, False, True]
+
+    manager.max_per_kind["piper"] = 3
+    _use(manager, b, _loader(rss, "b", mb=40, calls=calls))  # 120 MB > 100 MB: a is least recent
+    assert [manager.is_loaded(k) for k in (a, b, c)] == [False, True, True]
+
+
+def test_sweep_applies_a_lowered_pool_size():
+    rss = _FakeRss()
+    manager = EngineManager(max_per_kind={"piper": 3}, rss=rss)
+    for name in ("a", "b", "c"):
+        _use(manager, ("piper", name), _loader(rss, name))
+    manager.max_per_kind["piper"] = 1
+    assert manager.sweep() == [("piper", "a"), ("piper", "b")]
+    assert manager.is_loaded(("piper", "c"))
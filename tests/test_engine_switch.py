@@ -0,0 +1,137 @@
+"""
+Unit tests for tts_worker engine selection: _serving_engine() — which engine
+the next sentence uses — and the Kokoro missing-file message.
+
+A fresh EngineManager with fake loaders replaces the module's, and
+_active_engine() is pointed at whichever fake engine the test selects, so a
+model switch is just a change of the selected key. Loaders block on an event,
+so a load stays in flight until the test releases it.
+"""
+import os
+import threading
+import time
+
+import pytest
+
+os.environ.setdefault("PYSTRAY_BACKEND", "dummy")  # tray.py imports pystray; no display here
+pytest.importorskip("pystray")
+
+from agenttalk import tts_worker  # noqa: E402
+from agenttalk.engine_manager import EngineManager  # noqa: E402
+
+OLD = ("kokoro", "kokoro.onnx", ())
+NEW = ("piper", "voice.onnx", ())
+
+
+class _Engines:
+    """Fake loaders per key; a key's load waits until release(key)."""
+
+    def __init__(self):
+        self.gates = {OLD: threading.Event(), NEW: threading.Event()}
+        self.failing = set()
+        self.selected = OLD
+
+    def loader(self, key):
+        def load():
+            self.gates[key].wait(5)
+            if key in self.failing:
+                raise FileNotFoundError(key[1])
+            return {"engine": key[0]}
+        return load
+
+    def active(self, model=None):
+        return self.selected, self.loader(self.selected)
+
+    def release(self, key):
+        self.gates[key].set()
+
+
+@pytest.fixture
+def engines(monkeypatch):
+    fake = _Engines()
+    monkeypatch.setattr(tts_worker, "_engines", EngineManager(rss=lambda: 0))
+    monkeypatch.setattr(tts_worker, "_served", None)
+    monkeypatch.setattr(tts_worker, "_active_engine", fake.active)
+    return fake
+
+
+def _speak_with(key, loader):
+    """Lease an engine the way _leased_chunks() does for one sentence."""
+    with tts_worker._lease(key, loader) as engine:
+        return engine
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+def test_previous_engine_keeps_serving_while_the_new_one_loads(engines):
+    engines.release(OLD)
+    _speak_with(*tts_worker._serving_engine())
+
+    engines.selected = NEW
+    key, _loader = tts_worker._serving_engine()
+    assert key == OLD
+    assert tts_worker._engines.status(NEW)["loading"]  # loading in the background
+    assert tts_worker._serving_engine()[0] == OLD  # no second load started
+    engines.release(NEW)
+
+
+def test_switches_once_the_new_engine_is_ready(engines):
+    engines.release(OLD)
+    _speak_with(*tts_worker._serving_engine())
+    engines.selected = NEW
+    assert tts_worker._serving_engine()[0] == OLD
+
+    engines.release(NEW)
+    _wait_for(lambda: tts_worker._engines.is_loaded(NEW))
+    key, loader = tts_worker._serving_engine()
+    assert key == NEW
+    assert _speak_with(key, loader) == {"engine": "piper"}
+    assert tts_worker._served[0] == NEW
+
+
+def test_blocks_on_the_selected_engine_when_none_is_loaded(engines):
+    engines.selected = NEW
+    key, loader = tts_worker._serving_engine()
+    assert key == NEW
+
+    spoken = []
+    speaker = threading.Thread(target=lambda: spoken.append(_speak_with(key, loader)))
+    speaker.start()
+    time.sleep(0.1)
+    assert speaker.is_alive() and not spoken  # the sentence waits for the load
+    engines.release(NEW)
+    speaker.join(2)
+    assert spoken == [{"engine": "piper"}]
+
+
+def test_falls_through_to_the_selected_engine_after_a_failed_load(engines):
+    engines.release(OLD)
+    _speak_with(*tts_worker._serving_engine())
+    engines.selected = NEW
+    engines.failing.add(NEW)
+    engines.release(NEW)
+    assert tts_worker._serving_engine()[0] == OLD
+    _wait_for(lambda: tts_worker._engines.status(NEW)["error"] is not None)
+
+    key, loader = tts_worker._serving_engine()
+    assert key == NEW  # the blocking load surfaces the error to the sentence
+    with pytest.raises(FileNotFoundError):
+        _speak_with(key, loader)
+
+
+def test_missing_kokoro_file_names_the_precision_to_download(tmp_path, monkeypatch):
+    fp32, int8, voices = tmp_path / "fp32.onnx", tmp_path / "int8.onnx", tmp_path / "voices.bin"
+    fp32.write_bytes(b"weights")
+    monkeypatch.setattr(tts_worker, "_kokoro_model_paths", {"fp32": str(fp32), "int8": str(int8)})
+    monkeypatch.setattr(tts_worker, "_kokoro_voices_path", str(voices))
+    monkeypatch.setitem(tts_worker.STATE, "kokoro_precision", "fp32")
+
+    with pytest.raises(FileNotFoundError, match="agenttalk setup --precision int8"):
+        tts_worker._load_kokoro(str(int8), ())  # int8 still loading after a switch
+    with pytest.raises(FileNotFoundError, match=r"voices\.bin\nRun 'agenttalk setup' "):
+        tts_worker._load_kokoro(str(fp32), ())
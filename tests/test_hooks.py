@@ -2,7 +2,7 @@
 Unit tests for agenttalk/hooks/stop_hook.py and session_start_hook.py.
 
 Tests import hooks as modules via importlib.util to avoid venv path issues.
-All external calls (urllib.request.urlopen, os.kill, subprocess.Popen) are mocked.
+All external calls (agenttalk.client.request, os.kill, subprocess.Popen) are mocked.
 
 Requirements: HOOK-01, HOOK-02, HOOK-03, HOOK-04
 """
@@ -53,7 +53,7 @@ def _make_stdin_bytes(raw: bytes) -> MagicMock:
 class TestStopHook:
 
     def test_stop_hook_guard_stop_hook_active(self):
-        """When stop_hook_active is True, urlopen must NOT be called."""
+        """When stop_hook_active is True, no request may be sent."""
         stop_hook = _load_hook('stop_hook')
         payload = {'stop_hook_active': True, 'last_assistant_message': 'Hello'}
 
@@ -61,15 +61,15 @@ class TestStopHook:
         mock_stdin.buffer = _make_stdin(payload)
 
         with patch.object(sys, 'stdin', mock_stdin), \
-             patch('urllib.request.urlopen') as mock_urlopen:
+             patch('agenttalk.client.request') as mock_request:
             with pytest.raises(SystemExit) as exc_info:
                 stop_hook.main()
 
         assert exc_info.value.code == 0
-        mock_urlopen.assert_not_called()
+        mock_request.assert_not_called()
 
     def test_stop_hook_empty_message(self):
-        """When last_assistant_message is empty, urlopen must NOT be called."""
+        """When last_assistant_message is empty, no request may be sent."""
         stop_hook = _load_hook('stop_hook')
         payload = {'stop_hook_active': False, 'last_assistant_message': ''}
 
@@ -77,19 +77,15 @@ class TestStopHook:
         mock_stdin.buffer = _make_stdin(payload)
 
         with patch.object(sys, 'stdin', mock_stdin), \
-             patch('urllib.request.urlopen') as mock_urlopen:
+             patch('agenttalk.client.request') as mock_request:
             with pytest.raises(SystemExit) as exc_info:
                 stop_hook.main()
 
         assert exc_info.value.code == 0
-        mock_urlopen.assert_not_called()
+        mock_request.assert_not_called()
 
     def test_stop_hook_non_ascii_payload(self):
-        """Non-ASCII UTF-8 payloads must not raise UnicodeDecodeError and urlopen IS called.
-
-        urlopen is called twice: once for GET /config (semi-auto guard) and once
-        for POST /speak. Both calls must succeed for audio to play in auto mode.
-        """
+        """Non-ASCII UTF-8 payloads must not raise UnicodeDecodeError and the text IS posted."""
         stop_hook = _load_hook('stop_hook')
         payload = {
             'stop_hook_active': False,
@@ -100,61 +96,55 @@ class TestStopHook:
         mock_stdin = MagicMock()
         mock_stdin.buffer = _make_stdin_bytes(raw)
 
-        mock_response = MagicMock()
-        mock_response.__enter__ = lambda s: s
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_response.read.return_value = b'{"speech_mode": "auto"}'
-
         with patch.object(sys, 'stdin', mock_stdin), \
-             patch('urllib.request.urlopen', return_value=mock_response) as mock_urlopen:
+             patch('agenttalk.client.request', return_value=(202, {})) as mock_request:
             with pytest.raises(SystemExit) as exc_info:
                 stop_hook.main()
 
         assert exc_info.value.code == 0
-        # Called twice: GET /config (semi-auto guard) + POST /speak
-        assert mock_urlopen.call_count == 2
+        mock_request.assert_called_once()
+        assert mock_request.call_args.args[2]['text'] == 'café naïve résumé'
 
     def test_stop_hook_posts_correct_body(self):
-        """urlopen must be called with correct URL and body containing the message text.
+        """A single POST /speak carries the text, source tag and session ID.
 
-        The first call is GET /config (semi-auto guard, returns auto mode).
-        The second call is POST /speak with the message text as the body.
+        The semi-auto guard is applied by the service (source='auto-hook'), so the
+        hook neither reads config.json nor calls GET /config first.
         """
         stop_hook = _load_hook('stop_hook')
         payload = {
             'stop_hook_active': False,
             'last_assistant_message': 'Hello world.',
+            'session_id': 's1',
         }
 
         mock_stdin = MagicMock()
         mock_stdin.buffer = _make_stdin(payload)
 
-        captured_requests = []
+        with patch.object(sys, 'stdin', mock_stdin), \
+             patch('agenttalk.client.request', return_value=(202, {})) as mock_request:
+            with pytest.raises(SystemExit) as exc_info:
+                stop_hook.main()
 
-        def capture_urlopen(req, timeout=None):
-            mock_response = MagicMock()
-            mock_response.__enter__ = lambda s: s
-            mock_response.__exit__ = MagicMock(return_value=False)
-            # Return auto mode for GET /config so the hook proceeds to POST /speak
-            mock_response.read.return_value = b'{"speech_mode": "auto"}'
-            captured_requests.append(req)
-            return mock_response
+        assert exc_info.value.code == 0
+        mock_request.assert_called_once()
+        method, path, body = mock_request.call_args.args
+        assert (method, path) == ('POST', '/speak')
+        assert body == {'text': 'Hello world.', 'source': 'auto-hook', 'session_id': 's1'}
+
+    def test_stop_hook_semi_auto_skip_is_accepted(self, capsys):
+        """The service's 200 "skipped" answer in semi-auto mode is not reported as an error."""
+        stop_hook = _load_hook('stop_hook')
+        mock_stdin = MagicMock()
+        mock_stdin.buffer = _make_stdin({'stop_hook_active': False, 'last_assistant_message': 'Done.'})
 
         with patch.object(sys, 'stdin', mock_stdin), \
-             patch('urllib.request.urlopen', side_effect=capture_urlopen):
+             patch('agenttalk.client.request', return_value=(200, {'status': 'skipped'})):
             with pytest.raises(SystemExit) as exc_info:
                 stop_hook.main()
 
         assert exc_info.value.code == 0
-        # Two calls: GET /config then POST /speak
-        assert len(captured_requests) == 2
-        config_req = captured_requests[0]
-        assert config_req.full_url == 'http://localhost:5050/config'
-        assert config_req.method == 'GET'
-        speak_req = captured_requests[1]
-        assert speak_req.full_url == 'http://localhost:5050/speak'
-        body = json.loads(speak_req.data.decode('utf-8'))
-        assert body == {'text': 'Hello world.'}
+        assert capsys.readouterr().err == ''
 
 
 # ---------------------------------------------------------------------------
@@ -202,6 +192,48 @@ class TestSessionStartHook:
         assert exc_info.value.code == 0
         mock_popen.assert_not_called()
 
+    def test_session_start_hook_registers_transcript(self, tmp_path):
+        """On resume with the service running, the transcript is POSTed to /sessions once."""
+        session_hook = _load_hook('session_start_hook')
+        payload = {'source': 'resume', 'session_id': 's1', 'transcript_path': str(tmp_path / 't.jsonl')}
+
+        mock_stdin = MagicMock()
+        mock_stdin.buffer = _make_stdin(payload)
+
+        with patch.object(sys, 'stdin', mock_stdin), \
+             patch('subprocess.Popen') as mock_popen, \
+             patch('agenttalk.client.request', return_value=(201, {})) as mock_request:
+            with pytest.raises(SystemExit):
+                session_hook.main()
+
+        mock_popen.assert_not_called()
+        mock_request.assert_called_once()
+        method, path, body = mock_request.call_args[0]
+        assert (method, path) == ('POST', '/sessions')
+        assert body == {'session_id': 's1', 'transcript_path': payload['transcript_path']}
+
+    def test_session_registration_gives_up_within_the_hook_timeout(self):
+        """While a launched service is not yet listening, retries stop before setup's 10 s hook timeout."""
+        session_hook = _load_hook('session_start_hook')
+        clock = [0.0]
+        timeouts = []
+
+        def refused(*args, timeout):
+            timeouts.append(timeout)
+            clock[0] += timeout
+            raise ConnectionRefusedError()
+
+        def sleep(secs):
+            clock[0] += secs
+
+        with patch('agenttalk.client.request', side_effect=refused), \
+             patch.object(session_hook.time, 'monotonic', lambda: clock[0]), \
+             patch.object(session_hook.time, 'sleep', sleep):
+            session_hook._register_session('s1', 't.jsonl', session_hook.REGISTER_WAIT_SECS)
+
+        assert len(timeouts) > 1
+        assert clock[0] < 10
+
     def test_session_start_hook_launches_when_not_running(self, tmp_path):
         """When service is not running (ProcessLookupError), Popen IS called with DETACHED_PROCESS."""
         session_hook = _load_hook('session_start_hook')
@@ -244,3 +276,84 @@ class TestSessionStartHook:
         # Verify DETACHED_PROCESS flag is present in creationflags
         creationflags = call_kwargs.kwargs.get('creationflags', call_kwargs[1].get('creationflags', 0))
         assert creationflags & subprocess.DETACHED_PROCESS
+
+
+# ---------------------------------------------------------------------------
+# post_tool_use_hook transcript reader tests
+# ---------------------------------------------------------------------------
+
+def _jsonl(*entries) -> str:
+    return ''.join(json.dumps(e) + '\n' for e in entries)
+
+
+def _assistant(text: str) -> dict:
+    return {'type': 'message', 'message': {'role': 'assistant', 'content': [{'type': 'text', 'text': text}]}}
+
+
+def _user(text: str) -> dict:
+    return {'role': 'user', 'content': text}
+
+
+class TestPostToolUseTranscriptReader:
+
+    @pytest.fixture
+    def hook(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('APPDATA', str(tmp_path / 'appdata'))
+        monkeypatch.setenv('XDG_CONFIG_HOME', str(tmp_path / 'appdata'))
+        mod = _load_hook('post_tool_use_hook')
+        monkeypatch.setattr(mod, 'READ_BLOCK', 64)  # force many backwards steps
+        return mod
+
+    def test_finds_last_assistant_message_across_blocks(self, hook, tmp_path):
+        transcript = tmp_path / 't.jsonl'
+        filler = [_user('x' * 50) for _ in range(20)]
+        transcript.write_text(
+            _jsonl(_assistant('First answer.'), *filler, _assistant('Second answer.'), *filler),
+            encoding='utf-8',
+        )
+        assert hook._extract_assistant_text(str(transcript)) == 'Second answer.'
+
+    def test_repeat_call_scans_only_appended_bytes(self, hook, tmp_path):
+        transcript = tmp_path / 't.jsonl'
+        transcript.write_text(_jsonl(_assistant('Old answer.'), _user('go on')), encoding='utf-8')
+        assert hook._extract_assistant_text(str(transcript)) == 'Old answer.'
+
+        with open(transcript, 'a', encoding='utf-8') as fh:
+            fh.write(_jsonl(_user('tool output')))
+        scanned = []
+        real = hook._iter_lines_reversed
+
+        def spy(fh, start, end):
+            scanned.append((start, end))
+            return real(fh, start, end)
+
+        with patch.object(hook, '_iter_lines_reversed', side_effect=spy):
+            assert hook._extract_assistant_text(str(transcript)) == 'Old answer.'
+            with open(transcript, 'a', encoding='utf-8') as fh:
+                fh.write(_jsonl({'role': 'assistant', 'content': 'New answer.'}))
+            assert hook._extract_assistant_text(str(transcript)) == 'New answer.'
+
+        first_start = scanned[0][0]
+        assert first_start > 0  # started at the cached offset, not the beginning
+        assert scanned[1][0] == scanned[0][1]
+
+    def test_partial_last_line_is_rescanned_once_complete(self, hook, tmp_path):
+        transcript = tmp_path / 't.jsonl'
+        done = _jsonl(_assistant('Complete.'))
+        partial = json.dumps(_assistant('Still streaming.'))
+        transcript.write_text(done + partial[:20], encoding='utf-8')
+        assert hook._extract_assistant_text(str(transcript)) == 'Complete.'
+
+        transcript.write_text(done + partial + '\n', encoding='utf-8')
+        assert hook._extract_assistant_text(str(transcript)) == 'Still streaming.'
+
+    def test_truncated_transcript_is_rescanned(self, hook, tmp_path):
+        transcript = tmp_path / 't.jsonl'
+        transcript.write_text(_jsonl(_assistant('A long earlier answer.'), _user('y' * 200)), encoding='utf-8')
+        hook._extract_assistant_text(str(transcript))
+
+        transcript.write_text(_jsonl(_assistant('Fresh.')), encoding='utf-8')
+        assert hook._extract_assistant_text(str(transcript)) == 'Fresh.'
+
+    def test_missing_transcript_returns_empty(self, hook, tmp_path):
+        assert hook._extract_assistant_text(str(tmp_path / 'missing.jsonl')) == ''
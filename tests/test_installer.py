@@ -0,0 +1,44 @@
+"""
+Unit tests for agenttalk/installer.py download_model().
+
+requests.get is patched to serve a few bytes per file, and MODELS_DIR points
+at tmp_path — nothing is downloaded and the real config dir is not touched.
+"""
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+pytest.importorskip("tqdm")
+
+from agenttalk import installer  # noqa: E402
+
+
+def _download(tmp_path, *args):
+    requested = []
+
+    def fake_get(url, **kwargs):
+        requested.append(url.rsplit("/", 1)[-1])
+        response = MagicMock(headers={"content-length": "4"})
+        response.iter_content.return_value = [b"onnx"]
+        return response
+
+    with patch.object(installer, "MODELS_DIR", tmp_path), patch.object(installer.requests, "get", fake_get):
+        installer.download_model(*args)
+    return requested
+
+
+def test_download_model_fetches_fp32_and_int8_by_default(tmp_path):
+    assert _download(tmp_path) == ["kokoro-v1.0.onnx", "kokoro-v1.0.int8.onnx", "voices-v1.0.bin"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "kokoro-v1.0.int8.onnx", "kokoro-v1.0.onnx", "voices-v1.0.bin",
+    ]
+
+
+def test_download_model_fetches_only_the_requested_precision(tmp_path):
+    assert _download(tmp_path, ("int8",)) == ["kokoro-v1.0.int8.onnx", "voices-v1.0.bin"]
+    assert _download(tmp_path, ("fp32", "int8")) == ["kokoro-v1.0.onnx"]  # the rest already present
+
+
+def test_download_model_rejects_unknown_precision(tmp_path):
+    with pytest.raises(ValueError, match="fp16"):
+        _download(tmp_path, ("fp16",))
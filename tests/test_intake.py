@@ -0,0 +1,46 @@
+"""
+Unit tests for agenttalk/intake.py.
+"""
+from agenttalk import intake as intake_mod
+from agenttalk.intake import CLOSED, FULL, HELD, PendingIntake
+
+
+def test_held_requests_drain_in_order_then_intake_closes():
+    intake = PendingIntake(max_entries=5, max_age=60)
+    assert intake.offer(["a", "b"]) == HELD
+    assert intake.offer(["c"]) == HELD
+    assert intake.pending == 2
+    assert intake.pending_items == 3
+
+    assert intake.pop_or_close() == ["a", "b"]
+    assert intake.pop_or_close() == ["c"]
+    assert intake.pop_or_close() is None
+    assert intake.offer(["d"]) == CLOSED
+
+
+def test_full_intake_rejects_new_requests():
+    intake = PendingIntake(max_entries=1, max_age=60)
+    assert intake.offer(["a"]) == HELD
+    assert intake.offer(["b"]) == FULL
+    assert intake.pending == 1
+
+
+def test_expired_requests_are_dropped_at_drain(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(intake_mod.time, "monotonic", lambda: now[0])
+    intake = PendingIntake(max_entries=5, max_age=30)
+    intake.offer(["old"])
+    now[0] = 120.0
+    intake.offer(["new"])
+    now[0] = 140.0  # "old" is 40 s old, "new" is 20 s
+
+    assert intake.pop_or_close() == ["new"]
+    assert intake.expired == 1
+
+
+def test_close_discards_held_requests():
+    intake = PendingIntake(max_entries=5, max_age=60)
+    intake.offer(["a"])
+    assert intake.close() == 1
+    assert intake.offer(["b"]) == CLOSED
+    assert intake.pending == 0
@@ -0,0 +1,108 @@
+"""
+Unit tests for agenttalk/launcher.py.
+
+The handover test replaces the service with a stand-in module that accepts
+one connection on the inherited socket, answers it and exits — idle the first
+time, for good the second.
+"""
+import os
+import socket
+import sys
+import textwrap
+import threading
+from pathlib import Path
+
+import pytest
+
+from agenttalk import client, launcher
+
+pytestmark = pytest.mark.skipif(os.name == 'nt', reason='POSIX descriptor handover')
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_STANDIN = textwrap.dedent('''
+    import sys
+    from pathlib import Path
+    from agenttalk.launcher import IDLE_EXIT_CODE, inherited_sockets
+
+    runs = Path(__file__).with_name('runs')
+    count = int(runs.read_text()) + 1 if runs.exists() else 1
+    runs.write_text(str(count))
+    sockets = inherited_sockets()
+    conn, _addr = sockets[0].accept()
+    conn.recv(65536)
+    body = b'{"run": %d, "sockets": %d}' % (count, len(sockets))
+    conn.sendall(b'HTTP/1.1 200 OK\\r\\nContent-Length: %d\\r\\n\\r\\n' % len(body) + body)
+    conn.close()
+    sys.exit(IDLE_EXIT_CODE if count == 1 else 0)
+''')
+
+
+def _free_port() -> int:
+    probe = socket.socket()
+    probe.bind(('127.0.0.1', 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    return port
+
+
+def test_listen_sockets_binds_tcp_and_unix_socket(tmp_path):
+    path = tmp_path / 'agenttalk.sock'
+    sockets = launcher.listen_sockets(_free_port(), path)
+    try:
+        assert [s.family for s in sockets] == [socket.AF_INET, socket.AF_UNIX]
+        assert path.stat().st_mode & 0o777 == 0o600
+    finally:
+        for s in sockets:
+            s.close()
+
+
+def test_port_in_use_raises_and_keeps_socket_file(tmp_path):
+    port = _free_port()
+    path = tmp_path / 'agenttalk.sock'
+    owner = launcher.listen_sockets(port, path)
+    try:
+        with pytest.raises(OSError):
+            launcher.listen_sockets(port, path)
+        assert path.exists()
+    finally:
+        for s in owner:
+            s.close()
+
+
+def test_inherited_sockets_reads_and_clears_environment(monkeypatch):
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    listener.listen()
+    dup = os.dup(listener.fileno())
+    monkeypatch.setenv(launcher.LISTEN_FDS_ENV, str(dup))
+    inherited = launcher.inherited_sockets()
+    try:
+        assert [s.getsockname() for s in inherited] == [listener.getsockname()]
+        assert launcher.LISTEN_FDS_ENV not in os.environ
+        assert launcher.inherited_sockets() == []
+    finally:
+        for s in inherited:
+            s.close()
+        listener.close()
+
+
+def test_service_started_per_connection_until_non_idle_exit(tmp_path, monkeypatch):
+    (tmp_path / 'standin_service.py').write_text(_STANDIN, encoding='utf-8')
+    monkeypatch.setenv('PYTHONPATH', os.pathsep.join([str(tmp_path), str(ROOT)]))
+    monkeypatch.setattr(launcher, 'SERVICE_MODULE', 'standin_service')
+    monkeypatch.setattr(client, 'socket_path', lambda: tmp_path / 'missing.sock')
+    port = _free_port()
+    sockets = launcher.listen_sockets(port, tmp_path / 'agenttalk.sock')
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(code=launcher.serve(sockets)), daemon=True)
+    thread.start()
+    try:
+        assert client.request('GET', '/health', port=port, timeout=30) == (200, {'run': 1, 'sockets': 2})
+        # The first service exited idle; the launcher starts another for this connection.
+        assert client.request('GET', '/health', port=port, timeout=30) == (200, {'run': 2, 'sockets': 2})
+        thread.join(timeout=30)
+        assert result == {'code': 0}
+    finally:
+        for s in sockets:
+            s.close()
@@ -0,0 +1,59 @@
+"""
+Unit tests for agenttalk/model_fingerprint.py.
+"""
+import hashlib
+import json
+
+from agenttalk import model_fingerprint
+from agenttalk.model_fingerprint import FingerprintIndex
+
+
+def _count_hashes(monkeypatch) -> list:
+    hashed = []
+    real = model_fingerprint.sha256_file
+
+    def counting(path):
+        hashed.append(path)
+        return real(path)
+
+    monkeypatch.setattr(model_fingerprint, "sha256_file", counting)
+    return hashed
+
+
+def test_digest_is_recorded_and_reused_across_instances(tmp_path, monkeypatch):
+    hashed = _count_hashes(monkeypatch)
+    model = tmp_path / "model.onnx"
+    model.write_bytes(b"weights-v1")
+    index_path = tmp_path / "a" / "index.json"
+
+    digest, replaced = FingerprintIndex(index_path).digest(model)
+    assert digest == hashlib.sha256(b"weights-v1").hexdigest() and replaced is None
+    assert json.loads(index_path.read_text())[str(model)]["sha256"] == digest
+
+    model_fingerprint._hashed.clear()  # a new process: only the index remembers
+    assert FingerprintIndex(index_path).digest(model) == (digest, None)
+    assert len(hashed) == 1
+
+
+def test_two_indexes_share_one_hash_per_model_version(tmp_path, monkeypatch):
+    hashed = _count_hashes(monkeypatch)
+    model = tmp_path / "model.onnx"
+    model.write_bytes(b"weights-v1")
+    audio, graphs = FingerprintIndex(tmp_path / "a.json"), FingerprintIndex(tmp_path / "b.json")
+
+    assert audio.digest(model)[0] == graphs.digest(model)[0]
+    assert len(hashed) == 1
+
+
+def test_replaced_model_reports_the_previous_digest_to_each_index(tmp_path):
+    model = tmp_path / "model.onnx"
+    model.write_bytes(b"weights-v1")
+    audio, graphs = FingerprintIndex(tmp_path / "a.json"), FingerprintIndex(tmp_path / "b.json")
+    old, _ = audio.digest(model)
+    graphs.digest(model)
+
+    model.write_bytes(b"weights-v2-different-size")
+    new, replaced = audio.digest(model)
+    assert new != old and replaced == old
+    assert graphs.digest(model) == (new, old)  # each cache purges its own entries
+    assert audio.digest(model) == (new, None)
@@ -0,0 +1,122 @@
+"""
+Unit tests for agenttalk/ort_session.py.
+
+Sessions are created for a one-node ONNX model built in the test, so no TTS
+model is needed; skipped when onnx or onnxruntime is not installed.
+"""
+import pytest
+
+ort = pytest.importorskip("onnxruntime")
+onnx = pytest.importorskip("onnx")
+
+import numpy as np  # noqa: E402
+from onnx import TensorProto, helper  # noqa: E402
+
+from agenttalk import ort_session  # noqa: E402
+
+
+@pytest.fixture
+def relu_model(tmp_path):
+    x = helper.make_tensor_value_info("x", TensorProto.FLOAT, [None])
+    y = helper.make_tensor_value_info("y", TensorProto.FLOAT, [None])
+    graph = helper.make_graph([helper.make_node("Relu", ["x"], ["y"])], "relu", [x], [y])
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8  # loadable by older onnxruntime releases too
+    path = tmp_path / "relu.onnx"
+    onnx.save(model, str(path))
+    return path
+
+
+def test_settings_from_fills_defaults_and_accepts_pairs():
+    settings = ort_session.settings_from({"ort_intra_op_threads": 2, "ort_provider": None, "voice": "x"})
+    assert settings == {**ort_session.DEFAULTS, "ort_intra_op_threads": 2}
+    assert ort_session.settings_from(ort_session.fingerprint(settings)) == settings
+    hash(ort_session.fingerprint(settings))
+
+
+def test_session_options_map_every_setting():
+    opts = ort_session.session_options({
+        "ort_intra_op_threads": 2,
+        "ort_inter_op_threads": 1,
+        "ort_execution_mode": "parallel",
+        "ort_graph_optimization": "basic",
+        "ort_cpu_mem_arena": False,
+        "ort_mem_pattern": False,
+    })
+    assert opts.intra_op_num_threads == 2
+    assert opts.inter_op_num_threads == 1
+    assert opts.execution_mode == ort.ExecutionMode.ORT_PARALLEL
+    assert opts.graph_optimization_level == ort.GraphOptimizationLevel.ORT_ENABLE_BASIC
+    assert opts.enable_cpu_mem_arena is False
+    assert opts.enable_mem_pattern is False
+
+
+@pytest.mark.parametrize("key, value", [("ort_execution_mode", "fast"), ("ort_graph_optimization", "max")])
+def test_session_options_reject_unknown_values(key, value):
+    with pytest.raises(ValueError):
+        ort_session.session_options({key: value})
+
+
+def test_unavailable_provider_falls_back_to_cpu():
+    assert ort_session.providers({"ort_provider": "NoSuchExecutionProvider"}) == ["CPUExecutionProvider"]
+    assert ort_session.providers({}) == ["CPUExecutionProvider"]
+
+
+def test_create_session_applies_settings_and_runs(relu_model):
+    session = ort_session.create_session(relu_model, {"ort_intra_op_threads": 1, "ort_cpu_mem_arena": False})
+    assert session.get_session_options().intra_op_num_threads == 1
+    assert session.get_session_options().enable_cpu_mem_arena is False
+    assert session.get_providers() == ["CPUExecutionProvider"]
+    (out,) = session.run(None, {"x": np.array([-1.0, 2.0], dtype=np.float32)})
+    assert out.tolist() == [0.0, 2.0]
+
+
+def _graphs(cache):
+    return sorted(p.name for p in cache.glob(f"*{ort_session.GRAPH_SUFFIX}"))
+
+
+def test_graph_cache_saves_then_reuses_the_optimized_graph(relu_model, tmp_path):
+    cache = tmp_path / ".cache"
+    x = {"x": np.array([-1.0, 2.0], dtype=np.float32)}
+    first = ort_session.create_session(relu_model, {}, cache)
+    (saved,) = _graphs(cache)
+    assert "relu" in saved and f"ort{ort.__version__}" in saved and "-all-cpu-" in saved
+
+    second = ort_session.create_session(relu_model, {}, cache)
+    assert second.get_session_options().graph_optimization_level == ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+    assert _graphs(cache) == [saved]
+    assert second.run(None, x)[0].tolist() == first.run(None, x)[0].tolist() == [0.0, 2.0]
+
+
+def test_graph_cache_is_skipped_when_disabled(relu_model, tmp_path):
+    cache = tmp_path / ".cache"
+    ort_session.create_session(relu_model, {"ort_graph_optimization": "disabled"}, cache)
+    ort_session.create_session(relu_model, {"ort_graph_cache": False}, cache)
+    assert not cache.exists() or _graphs(cache) == []
+
+
+def test_graph_cache_drops_entries_of_a_replaced_model_or_other_onnxruntime(relu_model, tmp_path):
+    cache = tmp_path / ".cache"
+    ort_session.create_session(relu_model, {}, cache)
+    (old,) = _graphs(cache)
+    stale = cache / old.replace(f"ort{ort.__version__}", "ort0.0.1")
+    stale.write_bytes(b"")
+    ort_session.create_session(relu_model, {"ort_graph_optimization": "basic"}, cache)
+    assert not stale.exists() and len(_graphs(cache)) == 2
+
+    model = onnx.load(str(relu_model))
+    model.doc_string = "retrained"  # same graph, new hash
+    onnx.save(model, str(relu_model))
+    ort_session.create_session(relu_model, {}, cache)
+    (current,) = _graphs(cache)
+    assert current != old and current.split("-")[0] != old.split("-")[0]
+
+
+def test_corrupt_cached_graph_is_rebuilt(relu_model, tmp_path):
+    cache = tmp_path / ".cache"
+    ort_session.create_session(relu_model, {}, cache)
+    (saved,) = _graphs(cache)
+    (cache / saved).write_bytes(b"not a model")
+    session = ort_session.create_session(relu_model, {}, cache)
+    assert session.run(None, {"x": np.array([-3.0], dtype=np.float32)})[0].tolist() == [0.0]
+    assert _graphs(cache) == [saved] and (cache / saved).stat().st_size > len(b"not a model")
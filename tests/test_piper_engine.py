@@ -0,0 +1,96 @@
+"""
+Unit tests for agenttalk/piper_engine.py.
+
+A fake `piper` module stands in for piper-tts so no voice model is needed.
+It mirrors piper1-gpl's API: PiperVoice.synthesize() yields AudioChunk objects.
+"""
+import sys
+from types import ModuleType, SimpleNamespace
+
+import numpy as np
+import pytest
+
+from agenttalk.piper_engine import PiperEngine
+
+
+class _FakeVoice:
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self.configs = []
+
+    def synthesize(self, text, syn_config=None):
+        self.configs.append(syn_config)
+        for audio in self._chunks:
+            yield SimpleNamespace(
+                sample_rate=16000,
+                audio_float_array=audio,
+                audio_int16_array=(audio * 32767).astype(np.int16),
+            )
+
+
+@pytest.fixture
+def make_engine(monkeypatch):
+    def _make(chunks):
+        voice = _FakeVoice(chunks)
+        piper = ModuleType("piper")
+        piper.PiperVoice = SimpleNamespace(load=lambda path: voice)
+        piper.SynthesisConfig = lambda length_scale: SimpleNamespace(length_scale=length_scale)
+        monkeypatch.setitem(sys.modules, "piper", piper)
+        return PiperEngine("voice.onnx"), voice
+    return _make
+
+
+def test_stream_yields_each_chunk_without_conversion(make_engine):
+    a = np.full(3, 0.5, dtype=np.float32)
+    b = np.full(2, -0.25, dtype=np.float32)
+    engine, _voice = make_engine([a, b])
+
+    chunks = list(engine.stream("One. Two."))
+
+    assert [rate for _s, rate in chunks] == [16000, 16000]
+    assert chunks[0][0] is a and chunks[1][0] is b
+
+
+def test_stream_int16(make_engine):
+    engine, _voice = make_engine([np.full(2, 0.5, dtype=np.float32)])
+    samples, _rate = next(engine.stream("Hi.", dtype="int16"))
+    assert samples.dtype == np.int16
+    assert samples.tolist() == [16383, 16383]
+
+
+def test_create_concatenates_chunks_and_maps_speed(make_engine):
+    engine, voice = make_engine([np.ones(3, dtype=np.float32), np.zeros(2, dtype=np.float32)])
+
+    samples, rate = engine.create("One. Two.", speed=2.0)
+
+    assert rate == 16000
+    assert samples.tolist() == [1, 1, 1, 0, 0]
+    assert voice.configs[0].length_scale == 0.5
+
+
+def test_create_raises_on_empty_output(make_engine):
+    engine, _voice = make_engine([])
+    with pytest.raises(RuntimeError):
+        engine.create("...")
+
+
+def test_ort_settings_build_the_voice_on_a_configured_session(monkeypatch, tmp_path):
+    model = tmp_path / "voice.onnx"
+    (tmp_path / "voice.onnx.json").write_text('{"audio": {"sample_rate": 16000}}', encoding="utf-8")
+    sessions = []
+
+    def create_session(path, settings, graph_cache_dir):
+        sessions.append((path, dict(settings), graph_cache_dir))
+        return "session"
+
+    piper = ModuleType("piper")
+    piper.PiperVoice = lambda session, config: SimpleNamespace(session=session, config=config)
+    piper.PiperConfig = SimpleNamespace(from_dict=lambda data: ("config", data["audio"]["sample_rate"]))
+    monkeypatch.setitem(sys.modules, "piper", piper)
+    monkeypatch.setattr("agenttalk.ort_session.create_session", create_session)
+
+    engine = PiperEngine(str(model), (("ort_intra_op_threads", 2),), tmp_path / ".cache")
+
+    assert sessions == [(str(model), {"ort_intra_op_threads": 2}, tmp_path / ".cache")]
+    assert engine._voice.session == "session"
+    assert engine._voice.config == ("config", 16000)
@@ -244,3 +244,67 @@ def test_preprocess_sentences_have_no_trailing_whitespace():
     result = preprocess("Hello world.\n\nGoodbye world.")
     for s in result:
         assert s == s.strip(), f"Sentence has surrounding whitespace: {s!r}"
+
+
+# ---------------------------------------------------------------------------
+# Latency-oriented clause splitting
+# ---------------------------------------------------------------------------
+
+_LONG = (
+    "I looked through the configuration loader and the service module, "
+    "and the problem is that the worker reads the speed before the update lands; "
+    "moving the read fixes it, although we should add a test for the race as well."
+)
+
+
+def test_split_clauses_short_sentence_unchanged():
+    from agenttalk.preprocessor import split_clauses
+    assert split_clauses("All tests pass.", 40) == ["All tests pass."]
+
+
+def test_split_clauses_respects_budget_and_keeps_all_words():
+    from agenttalk.preprocessor import split_clauses
+    chunks = split_clauses(_LONG, 100)
+    assert len(chunks) > 1
+    assert all(len(c) <= 100 for c in chunks)
+    assert " ".join(chunks).split() == _LONG.split()
+
+
+def test_split_clauses_prefers_semicolon_over_comma():
+    from agenttalk.preprocessor import split_clauses
+    text = "The first clause runs long enough, with a comma; then the second clause follows here."
+    chunks = split_clauses(text, 60)
+    assert chunks[0].endswith(";")
+
+
+def test_split_clauses_never_cuts_without_a_boundary():
+    from agenttalk.preprocessor import split_clauses
+    text = "Supercalifragilisticexpialidocious words without any clause boundary at all here"
+    assert split_clauses(text, 20) == [text]
+
+
+def test_split_clauses_avoids_tiny_fragments():
+    from agenttalk.preprocessor import split_clauses
+    chunks = split_clauses("So, the migration finished and every table was copied over.", 30)
+    assert all(len(c) >= 12 for c in chunks)
+
+
+def test_split_for_latency_first_chunk_is_tighter():
+    from agenttalk.preprocessor import split_for_latency
+    chunks = split_for_latency([_LONG, _LONG], max_chars=120, first_max_chars=50)
+    assert len(chunks[0]) <= 50
+    assert all(len(c) <= 120 for c in chunks[1:])
+    assert " ".join(chunks).split() == (_LONG + " " + _LONG).split()
+
+
+def test_split_for_latency_disabled():
+    from agenttalk.preprocessor import split_for_latency
+    assert split_for_latency([_LONG], max_chars=0, first_max_chars=0) == [_LONG]
+
+
+def test_split_for_latency_groups_keep_each_sentences_chunks_together():
+    from agenttalk.preprocessor import split_for_latency, split_for_latency_groups
+    sentences = [_LONG, "Done."]
+    groups = split_for_latency_groups(sentences, max_chars=120, first_max_chars=50)
+    assert len(groups) == 2 and len(groups[0]) > 1 and groups[1] == ["Done."]
+    assert [c for g in groups for c in g] == split_for_latency(sentences, max_chars=120, first_max_chars=50)
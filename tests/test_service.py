@@ -0,0 +1,220 @@
+"""
+Tests for agenttalk/service.py — /speak gating, dedup, warmup intake and the startup engine.
+
+The app runs under FastAPI's TestClient without its lifespan, so no worker,
+engine or audio device is started: TTS_QUEUE is replaced by a fresh queue the
+tests read back, and engine loading is stubbed. Skipped where sounddevice
+(PortAudio) cannot be imported, since service.py imports it at module level.
+"""
+import contextlib
+import os
+import queue
+import threading
+
+import pytest
+
+os.environ.setdefault("PYSTRAY_BACKEND", "dummy")  # tray.py imports pystray; no display here
+try:
+    import sounddevice  # noqa: F401
+except (ImportError, OSError):  # OSError: the PortAudio library is missing
+    pytest.skip("sounddevice / PortAudio not available", allow_module_level=True)
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from agenttalk import service  # noqa: E402
+from agenttalk.dedup import SentenceDedup  # noqa: E402
+from agenttalk.intake import PendingIntake  # noqa: E402
+
+
+@pytest.fixture
+def speech(monkeypatch):
+    """A ready service whose queued sentences land in the returned queue."""
+    tts_queue = queue.Queue(maxsize=50)
+    monkeypatch.setattr(service, "TTS_QUEUE", tts_queue)
+    monkeypatch.setattr(service, "prefetch_engine", lambda sentences=(): False)
+    monkeypatch.setattr(service, "_dedup", SentenceDedup(ttl=300))
+    monkeypatch.setattr(service, "_intake", PendingIntake(max_entries=5, max_age=60))
+    monkeypatch.setattr(service, "is_ready", True)
+    service._intake.close()  # the worker is running
+    for key, value in {
+        "speech_mode": "semi-auto", "muted": False, "dedup_ttl_s": 300,
+        "pre_cue_path": None, "post_cue_path": None, "clause_max_chars": 0, "first_chunk_max_chars": 0,
+    }.items():
+        monkeypatch.setitem(service.STATE, key, value)
+    return tts_queue
+
+
+@pytest.fixture
+def client():
+    return TestClient(service.app)
+
+
+def _queued(tts_queue: queue.Queue) -> list:
+    items = []
+    while not tts_queue.empty():
+        items.append(tts_queue.get_nowait())
+    return items
+
+
+# ---------------------------------------------------------------------------
+# /speak source gating
+# ---------------------------------------------------------------------------
+
+def test_auto_hook_is_skipped_in_semi_auto_mode(client, speech):
+    r = client.post("/speak", json={"text": "The build passed.", "source": "auto-hook"})
+    assert r.status_code == 200
+    assert r.json() == {"status": "skipped", "reason": "semi-auto mode"}
+    assert _queued(speech) == []
+
+
+def test_auto_hook_is_queued_in_auto_mode(client, speech, monkeypatch):
+    monkeypatch.setitem(service.STATE, "speech_mode", "auto")
+    r = client.post("/speak", json={"text": "The build passed.", "source": "auto-hook"})
+    assert r.status_code == 202
+    assert _queued(speech) == ["The build passed."]
+
+
+@pytest.mark.parametrize("source", [None, "manual", "pipe"])
+def test_manual_and_pipe_speak_in_semi_auto_mode(client, speech, source):
+    body = {"text": "The build passed."}
+    if source is not None:
+        body["source"] = source
+    r = client.post("/speak", json=body)
+    assert r.status_code == 202
+    assert r.json()["status"] == "queued"
+    assert _queued(speech) == ["The build passed."]
+
+
+@pytest.mark.parametrize("mode, speculated", [("semi-auto", []), ("auto", [["The build passed."]])])
+def test_speculation_only_runs_in_auto_mode(client, speech, monkeypatch, mode, speculated):
+    monkeypatch.setitem(service.STATE, "speech_mode", mode)
+    monkeypatch.setitem(service.STATE, "speculative", True)
+    calls = []
+    monkeypatch.setattr(service, "speculate", lambda sentences: calls.append(sentences) or len(sentences))
+    r = client.post("/speak", json={"text": "The build passed.", "speculative": True})
+    assert r.json()["status"] == ("speculating" if speculated else "skipped")
+    assert calls == speculated
+    assert _queued(speech) == []
+
+
+# ---------------------------------------------------------------------------
+# Dedup across the hook and the transcript watcher
+# ---------------------------------------------------------------------------
+
+def test_watcher_then_stop_hook_speaks_only_the_new_sentence(client, speech, monkeypatch):
+    monkeypatch.setitem(service.STATE, "speech_mode", "auto")
+    service._speak_from_transcript("s1", "I fixed the parser.")
+    assert _queued(speech) == ["I fixed the parser."]
+
+    r = client.post("/speak", json={
+        "text": "I fixed the parser. All tests pass.", "session_id": "s1", "source": "auto-hook",
+    })
+    assert r.json() == {"status": "queued", "sentences": 1, "dropped": 0, "duplicates": 1}
+    assert _queued(speech) == ["All tests pass."]
+
+
+def test_hook_then_watcher_repeat_is_dropped(client, speech, monkeypatch):
+    monkeypatch.setitem(service.STATE, "speech_mode", "auto")
+    r = client.post("/speak", json={"text": "I fixed the parser.", "session_id": "s1", "source": "auto-hook"})
+    assert r.status_code == 202
+    service._speak_from_transcript("s1", "I fixed the parser.")
+    assert _queued(speech) == ["I fixed the parser."]
+
+    service._speak_from_transcript("s2", "I fixed the parser.")  # another session is not suppressed
+    assert _queued(speech) == ["I fixed the parser."]
+
+
+def test_sentences_dropped_on_a_full_queue_are_spoken_on_retry(client, speech, monkeypatch):
+    tts_queue = queue.Queue(maxsize=1)
+    monkeypatch.setattr(service, "TTS_QUEUE", tts_queue)
+    body = {"text": "I fixed the parser. All tests pass.", "session_id": "s1"}
+
+    r = client.post("/speak", json=body)
+    assert r.json() == {"status": "queued", "sentences": 1, "dropped": 1, "duplicates": 0}
+    assert _queued(tts_queue) == ["I fixed the parser."]
+
+    r = client.post("/speak", json=body)  # the client retries once the queue has room
+    assert r.json() == {"status": "queued", "sentences": 1, "dropped": 0, "duplicates": 1}
+    assert _queued(tts_queue) == ["All tests pass."]
+
+
+# ---------------------------------------------------------------------------
+# Warmup intake
+# ---------------------------------------------------------------------------
+
+def test_speech_during_engine_load_is_held_then_drained_in_order(client, speech, monkeypatch):
+    monkeypatch.setattr(service, "is_ready", False)
+    monkeypatch.setattr(service, "_intake", PendingIntake(max_entries=5, max_age=60))
+    monkeypatch.setattr(service, "_configure_audio", lambda: None)
+    monkeypatch.setattr(service, "start_tts_worker", lambda **kwargs: None)
+    loaded = threading.Event()
+    monkeypatch.setattr(service, "_load_startup_engine", lambda: loaded.wait(5) and "kokoro")
+    startup = threading.Thread(target=service._startup)
+    startup.start()
+
+    first = client.post("/speak", json={"text": "First message."})
+    second = client.post("/speak", json={"text": "Second message. Third message."})
+    assert first.status_code == second.status_code == 202
+    assert second.json() == {"status": "buffered", "sentences": 2, "pending": 2}
+    assert _queued(speech) == []
+
+    loaded.set()
+    startup.join(5)
+    assert service.is_ready
+    assert _queued(speech) == ["First message.", "Second message.", "Third message."]
+    assert client.post("/speak", json={"text": "Fourth message."}).json()["status"] == "queued"
+
+
+# ---------------------------------------------------------------------------
+# Startup engine
+# ---------------------------------------------------------------------------
+
+class _Leases(list):
+    """Models passed to the stubbed engine_lease(), in order; models in .failing raise."""
+
+    def __init__(self):
+        super().__init__()
+        self.failing = set()
+
+
+@pytest.fixture
+def leases(monkeypatch):
+    leased = _Leases()
+
+    @contextlib.contextmanager
+    def fake_lease(model=None):
+        leased.append(model)
+        if model in leased.failing:
+            raise FileNotFoundError(f"{model} model missing")
+        yield object()
+
+    monkeypatch.setattr(service, "engine_lease", fake_lease)
+    return leased
+
+
+def test_startup_loads_the_configured_piper_voice(leases, monkeypatch):
+    monkeypatch.setitem(service.STATE, "model", "piper")
+    assert service._load_startup_engine() == "piper"
+    assert leases == ["piper"]
+
+
+def test_startup_falls_back_to_kokoro_when_piper_fails(leases, monkeypatch):
+    monkeypatch.setitem(service.STATE, "model", "piper")
+    leases.failing.add("piper")
+    assert service._load_startup_engine() == "kokoro"
+    assert leases == ["piper", "kokoro"]
+    assert service.STATE["model"] == "piper"  # the selection is kept; synthesis reports the error
+
+
+def test_startup_loads_kokoro_when_configured(leases, monkeypatch):
+    monkeypatch.setitem(service.STATE, "model", "kokoro")
+    assert service._load_startup_engine() == "kokoro"
+    assert leases == ["kokoro"]
+
+
+def test_startup_kokoro_failure_is_raised(leases, monkeypatch):
+    monkeypatch.setitem(service.STATE, "model", "kokoro")
+    leases.failing.add("kokoro")
+    with pytest.raises(FileNotFoundError):
+        service._load_startup_engine()
+    assert leases == ["kokoro"]
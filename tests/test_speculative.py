@@ -0,0 +1,70 @@
+"""
+Unit tests for agenttalk/speculative.py.
+
+The synthesize callback is a fake that records calls; no engine is loaded.
+"""
+import threading
+import time
+
+from agenttalk.speculative import Preempted, SpeculativeLane
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_results_are_counted_used_or_wasted():
+    lane = SpeculativeLane(lambda s, stop: ("key", s), busy=lambda: False, ttl=0.2)
+    lane.submit(["One.", "Two."])
+    _wait_for(lambda: lane.stats()["synthesized"] == 2)
+
+    assert lane.note_hit(("key", "One.")) is True
+    assert lane.note_hit(("key", "One.")) is False  # counted once
+    time.sleep(0.3)
+    stats = lane.stats()
+    assert (stats["used"], stats["wasted"], stats["unused"]) == (1, 1, 0)
+
+
+def test_waits_while_foreground_is_busy():
+    busy = threading.Event()
+    busy.set()
+    calls = []
+    lane = SpeculativeLane(lambda s, stop: calls.append(s) or s, busy=busy.is_set)
+    lane.submit(["One."])
+    time.sleep(0.2)
+    assert calls == []
+    busy.clear()
+    _wait_for(lambda: calls == ["One."])
+
+
+def test_preempted_sentence_is_retried_first():
+    attempts = []
+    busy = threading.Event()
+
+    def synthesize(sentence, should_stop):
+        attempts.append(sentence)
+        if len(attempts) == 1:
+            busy.set()
+            threading.Timer(0.1, busy.clear).start()
+            raise Preempted
+        return sentence
+
+    lane = SpeculativeLane(synthesize, busy=busy.is_set)
+    lane.submit(["One.", "Two."])
+    _wait_for(lambda: lane.stats()["synthesized"] == 2)
+    assert attempts == ["One.", "One.", "Two."]
+    assert lane.stats()["preempted"] == 1
+
+
+def test_skipped_duplicates_and_overflow():
+    gate = threading.Event()
+    lane = SpeculativeLane(lambda s, stop: None, busy=lambda: not gate.is_set(), max_pending=2)
+    assert lane.submit(["A.", "A.", "B."]) == 2
+    lane.submit(["C."])
+    stats = lane.stats()
+    assert (stats["pending"], stats["dropped"]) == (2, 1)
+    gate.set()
+    _wait_for(lambda: lane.stats()["skipped"] == 2)
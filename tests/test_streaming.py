@@ -0,0 +1,63 @@
+"""
+Unit tests for agenttalk/streaming.py.
+
+Uses small fake engines for each dispatch path — no ONNX model is loaded.
+"""
+import asyncio
+
+import numpy as np
+
+from agenttalk.streaming import iter_audio_chunks
+
+
+class _BlockingEngine:
+    def create(self, text, voice, speed, lang):
+        return np.ones(4, dtype=np.float32), 24000
+
+
+class _AsyncStreamEngine(_BlockingEngine):
+    """Mimics kokoro-onnx: create_stream() is an async generator that needs a live loop."""
+
+    def __init__(self):
+        self.closed = False
+
+    async def create_stream(self, text, voice, speed, lang):
+        try:
+            for i, word in enumerate(text.split()):
+                await asyncio.sleep(0)
+                yield np.full(3, float(i), dtype=np.float32), 24000
+        finally:
+            self.closed = True
+
+
+class _SyncStreamEngine(_BlockingEngine):
+    def stream(self, text, voice, speed, lang):
+        for word in text.split():
+            yield np.zeros(len(word), dtype=np.float32), 22050
+
+
+def test_blocking_engine_yields_single_chunk():
+    chunks = list(iter_audio_chunks(_BlockingEngine(), "Hello there.", "af_heart", 1.0))
+    assert len(chunks) == 1
+    assert chunks[0][1] == 24000
+
+
+def test_async_create_stream_is_driven_chunk_by_chunk():
+    engine = _AsyncStreamEngine()
+    chunks = list(iter_audio_chunks(engine, "one two three", "af_heart", 1.0))
+    assert [c[0][0] for c in chunks] == [0.0, 1.0, 2.0]
+    assert engine.closed
+
+
+def test_abandoned_async_stream_is_closed():
+    engine = _AsyncStreamEngine()
+    gen = iter_audio_chunks(engine, "one two three", "af_heart", 1.0)
+    next(gen)
+    gen.close()
+    assert engine.closed
+
+
+def test_sync_stream_preferred_over_create():
+    chunks = list(iter_audio_chunks(_SyncStreamEngine(), "ab cde", None, 1.0))
+    assert [len(c[0]) for c in chunks] == [2, 3]
+    assert all(rate == 22050 for _samples, rate in chunks)
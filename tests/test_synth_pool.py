@@ -0,0 +1,49 @@
+"""
+Unit tests for agenttalk/synth_pool.py.
+"""
+import threading
+import time
+
+from agenttalk.synth_pool import SynthJob, SynthPool, auto_pool_size
+
+
+def test_auto_pool_size_scales_with_rtf_and_caps_at_half_the_cores():
+    assert auto_pool_size(8, 0.0) == 2      # not measured yet
+    assert auto_pool_size(8, 0.3) == 2      # faster than real time: one extra for lookahead
+    assert auto_pool_size(8, 1.5) == 3
+    assert auto_pool_size(8, 9.0) == 4      # capped at cores // 2
+    assert auto_pool_size(1, 2.0) == 1
+    assert auto_pool_size(None, 0.0) == 1
+
+
+def test_pool_respects_limit():
+    pool = SynthPool(max_threads=8)
+    gate = threading.Event()
+    pool.submit(gate.wait, limit=2)
+    pool.submit(gate.wait, limit=2)
+    assert pool.active == 2
+
+    blocked = threading.Thread(target=pool.submit, args=(gate.wait,), kwargs={"limit": 2})
+    blocked.start()
+    time.sleep(0.05)
+    assert blocked.is_alive()  # third submit waits for a free slot
+
+    gate.set()
+    blocked.join(1)
+    assert not blocked.is_alive()
+    assert pool.peak_active == 2
+
+
+def test_jobs_are_read_in_submission_order_even_when_finished_out_of_order():
+    pool = SynthPool(max_threads=4)
+    jobs = [SynthJob() for _ in range(4)]
+
+    def _work(job, value, delay):
+        time.sleep(delay)
+        job.put(value)
+        job.close()
+
+    for i, job in enumerate(jobs):
+        pool.submit(_work, job, i, 0.05 * (4 - i), limit=4)  # later jobs finish first
+
+    assert [item for job in jobs for item in job] == [0, 1, 2, 3]
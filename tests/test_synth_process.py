@@ -0,0 +1,104 @@
+"""
+Unit tests for agenttalk/synth_process.py.
+
+Spawns real child processes running a tiny fake engine (defined below and
+imported by the child via its "module:attr" spec) — no ONNX model is loaded.
+"""
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from agenttalk.synth_process import ProcessSynthPool, shared_weights_model
+
+_SPEC = ("tests.test_synth_process:FakeEngine", ())
+_KWARGS = {"voice": None, "speed": 1.0, "lang": "en-us"}
+
+
+class FakeEngine:
+    """Returns a ramp whose length is the integer in text; 'fail' raises."""
+
+    def create(self, text, voice=None, speed=1.0, lang="en-us"):
+        if text == "fail":
+            raise RuntimeError("engine misconfigured")
+        return np.arange(int(text), dtype=np.float32), 16000
+
+    def stream(self, text, voice=None, speed=1.0, lang="en-us"):
+        for n in text.split():
+            yield np.full(int(n), float(n), dtype=np.float32), 16000
+
+
+@pytest.fixture(scope="module")
+def pool():
+    p = ProcessSynthPool(ring_seconds=0.01)  # 240-frame ring: forces wraparound and splitting
+    yield p
+    p.close()
+
+
+def _collect(pool, text, streaming=False):
+    return list(pool.stream(_SPEC, text, _KWARGS, streaming=streaming))
+
+
+def test_round_trip_through_shared_memory(pool):
+    chunks = _collect(pool, "100")
+    assert chunks[0][1] == 16000
+    assert np.concatenate([c for c, _ in chunks]).tolist() == list(range(100))
+
+
+def test_chunk_larger_than_ring_is_split_and_wraps(pool):
+    for _ in range(3):  # repeated requests walk the write position around the ring
+        chunks = _collect(pool, "1000")
+        assert len(chunks) > 1
+        assert np.array_equal(np.concatenate([c for c, _ in chunks]), np.arange(1000, dtype=np.float32))
+
+
+def test_streaming_chunks_arrive_in_order(pool):
+    chunks = _collect(pool, "3 5 2", streaming=True)
+    assert [c.tolist() for c, _ in chunks] == [[3.0] * 3, [5.0] * 5, [2.0] * 2]
+
+
+def test_child_errors_are_re_raised_by_type(pool):
+    with pytest.raises(RuntimeError, match="misconfigured"):
+        _collect(pool, "fail")
+    assert _collect(pool, "4")[0][0].tolist() == [0, 1, 2, 3]  # child still usable
+
+
+def test_abandoned_stream_does_not_leak_into_next_request(pool):
+    gen = pool.stream(_SPEC, "50 60 70", _KWARGS, streaming=True)
+    next(gen)
+    gen.close()
+    assert _collect(pool, "5")[0][0].tolist() == [0, 1, 2, 3, 4]
+    assert pool.stats()["processes"] == 1
+
+
+def test_shared_weights_model_aligns_external_data(tmp_path: Path):
+    onnx = pytest.importorskip("onnx")
+    ort = pytest.importorskip("onnxruntime")
+    from onnx import TensorProto, helper, numpy_helper
+
+    weights = np.random.default_rng(0).standard_normal((256, 256)).astype(np.float32)
+    bias = np.ones(256, dtype=np.float32)
+    graph = helper.make_graph(
+        [helper.make_node("MatMul", ["x", "w"], ["y0"]), helper.make_node("Add", ["y0", "b"], ["y"])],
+        "g",
+        [helper.make_tensor_value_info("x", TensorProto.FLOAT, [1, 256])],
+        [helper.make_tensor_value_info("y", TensorProto.FLOAT, [1, 256])],
+        [numpy_helper.from_array(weights, "w"), numpy_helper.from_array(bias, "b")],
+    )
+    src = tmp_path / "model.onnx"
+    model = helper.make_model(graph, ir_version=8, opset_imports=[helper.make_opsetid("", 17)])
+    onnx.save_model(model, str(src))
+
+    out = shared_weights_model(str(src), tmp_path / ".cache")
+    assert out != str(src)
+    assert shared_weights_model(str(src), tmp_path / ".cache") == out  # reused, not rewritten
+
+    rewritten = onnx.load(out, load_external_data=False)
+    w = next(t for t in rewritten.graph.initializer if t.name == "w")
+    offset = int(next(e.value for e in w.external_data if e.key == "offset"))
+    assert offset % (64 * 1024) == 0
+
+    x = np.ones((1, 256), dtype=np.float32)
+    expected = ort.InferenceSession(str(src)).run(None, {"x": x})[0]
+    actual = ort.InferenceSession(out).run(None, {"x": x})[0]
+    assert np.allclose(actual, expected)
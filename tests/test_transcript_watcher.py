@@ -0,0 +1,141 @@
+"""
+Unit tests for agenttalk/transcript_watcher.py.
+
+poll_once() is called directly; the watcher thread register() starts waits
+a full poll_interval (60 s here) before its first poll, so it never runs.
+"""
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from agenttalk.transcript_watcher import TranscriptWatcher
+
+LONG = "I have read the configuration loader and the fix belongs in the save path, not in load."
+
+
+def _assistant(text: str, tool: bool = False) -> dict:
+    content = [{'type': 'text', 'text': text}]
+    if tool:
+        content.append({'type': 'tool_use', 'id': 't1', 'name': 'Read', 'input': {}})
+    return {'type': 'assistant', 'message': {'role': 'assistant', 'content': content}}
+
+
+def _tool_result() -> dict:
+    return {'type': 'user', 'message': {'role': 'user', 'content': [{'type': 'tool_result', 'tool_use_id': 't1'}]}}
+
+
+def _append(path: Path, *entries, raw: str = '') -> None:
+    with open(path, 'a', encoding='utf-8') as fh:
+        fh.write(''.join(json.dumps(e) + '\n' for e in entries) + raw)
+
+
+@pytest.fixture
+def watcher():
+    spoken, candidates = [], []
+    w = TranscriptWatcher(
+        on_text=lambda sid, text: spoken.append((sid, text)),
+        poll_interval=60,
+        on_candidate=lambda sid, text: candidates.append(text),
+    )
+    w.spoken, w.candidates = spoken, candidates
+    yield w
+    w.stop()
+
+
+def test_message_followed_by_tool_call_is_spoken_once(tmp_path, watcher):
+    transcript = tmp_path / 's.jsonl'
+    _append(transcript, _assistant("Old history that must not be replayed. " * 3), _tool_result())
+    watcher.register('s1', str(transcript))
+
+    _append(transcript, _assistant(LONG))
+    watcher.poll_once()
+    assert watcher.spoken == []  # may be the final answer — left to the Stop hook
+
+    _append(transcript, _assistant('', tool=True), _tool_result())
+    watcher.poll_once()
+    watcher.poll_once()
+    assert watcher.spoken == [('s1', LONG)]
+
+
+def test_text_and_tool_use_in_one_message(tmp_path, watcher):
+    transcript = tmp_path / 's.jsonl'
+    transcript.touch()
+    watcher.register('s1', str(transcript))
+    _append(transcript, _assistant(LONG, tool=True))
+    watcher.poll_once()
+    assert [t for _s, t in watcher.spoken] == [LONG]
+
+
+def test_short_messages_are_filtered(tmp_path, watcher):
+    transcript = tmp_path / 's.jsonl'
+    transcript.touch()
+    watcher.register('s1', str(transcript))
+    _append(transcript, _assistant('Reading file...', tool=True))
+    watcher.poll_once()
+    assert watcher.spoken == []
+    assert watcher.sessions()[0]['filtered'] == 1
+
+
+def test_partial_line_waits_for_its_newline(tmp_path, watcher):
+    transcript = tmp_path / 's.jsonl'
+    transcript.touch()
+    watcher.register('s1', str(transcript))
+    line = json.dumps(_assistant(LONG, tool=True))
+    _append(transcript, raw=line[:40])
+    watcher.poll_once()
+    _append(transcript, raw=line[40:] + '\n')
+    watcher.poll_once()
+    assert [t for _s, t in watcher.spoken] == [LONG]
+
+
+def test_transcript_created_after_registration_is_read_from_start(tmp_path, watcher):
+    transcript = tmp_path / 'later.jsonl'
+    watcher.register('s1', str(transcript))
+    watcher.poll_once()
+    _append(transcript, _assistant(LONG, tool=True))
+    watcher.poll_once()
+    assert len(watcher.spoken) == 1
+
+
+def test_replaced_transcript_is_followed_from_its_end(tmp_path, watcher):
+    transcript = tmp_path / 's.jsonl'
+    transcript.touch()
+    watcher.register('s1', str(transcript))
+    replacement = tmp_path / 'new.jsonl'
+    _append(replacement, _assistant(LONG, tool=True))
+    os.replace(replacement, transcript)
+    watcher.poll_once()
+    assert watcher.spoken == []
+    _append(transcript, _assistant(LONG + ' Again.', tool=True))
+    watcher.poll_once()
+    assert len(watcher.spoken) == 1
+
+
+def test_unregister(tmp_path, watcher):
+    transcript = tmp_path / 's.jsonl'
+    transcript.touch()
+    assert watcher.register('s1', str(transcript)) is True
+    assert watcher.register('s1', str(transcript)) is False
+    assert watcher.unregister('s1') is True
+    assert watcher.unregister('s1') is False
+    _append(transcript, _assistant(LONG, tool=True))
+    watcher.poll_once()
+    assert watcher.spoken == []
+
+
+def test_held_and_filtered_text_are_offered_once_as_candidates(tmp_path, watcher):
+    transcript = tmp_path / 's.jsonl'
+    transcript.touch()
+    watcher.register('s1', str(transcript))
+    _append(transcript, _assistant('Reading file...', tool=True), _assistant(LONG))
+    watcher.poll_once()
+    _append(transcript, {'type': 'system', 'content': 'progress'})
+    watcher.poll_once()
+    assert watcher.candidates == ['Reading file...', LONG]
+
+    _append(transcript, _tool_result())
+    watcher.poll_once()
+    assert [t for _s, t in watcher.spoken] == [LONG]
+    assert watcher.candidates == ['Reading file...', LONG]
@@ -0,0 +1,212 @@
+"""
+Pipeline tests for agenttalk/tts_worker.py — dispatch, pool, forward and playback.
+
+The real threads run against a fake engine (per-sentence synthesis delays, so
+sentences can finish out of order) and a real AudioOutput whose PortAudio
+stream is replaced by a fake that drains the ring buffer in real time. Each
+clip's samples carry its sentence number, so the output records what it
+played and in which order. No engine, model file or audio device is needed.
+"""
+import os
+import re
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+os.environ.setdefault("PYSTRAY_BACKEND", "dummy")  # tray.py imports pystray; no display here
+pytest.importorskip("pystray")
+
+from agenttalk import tts_worker  # noqa: E402
+from agenttalk.audio_output import AudioOutput  # noqa: E402
+
+RATE = 24000
+CLIP_SECONDS = 0.05
+WORKERS = 2
+LOOKAHEAD = 1
+
+
+class _FakeStream:
+    """sounddevice.OutputStream stand-in: calls the callback at the real block rate."""
+
+    underflow = False  # reported to the callback as status.output_underflow
+
+    def __init__(self, samplerate, blocksize, callback, **kwargs):
+        self._rate, self._blocksize, self._callback = samplerate, blocksize, callback
+        self._running = False
+
+    def start(self):
+        self._running = True
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        while self._running:
+            outdata = np.zeros((self._blocksize, 1), dtype=np.float32)
+            self._callback(outdata, self._blocksize, None, SimpleNamespace(output_underflow=_FakeStream.underflow))
+            time.sleep(self._blocksize / self._rate)
+
+    def stop(self):
+        self._running = False
+
+    def close(self):
+        pass
+
+
+class _RecordingOutput(AudioOutput):
+    """AudioOutput that records the sentence number of every clip and can hold playback."""
+
+    def __init__(self):
+        super().__init__(blocksize=240)
+        self.played = []
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def play(self, samples, rate):
+        self.gate.wait()
+        self.played.append(round(float(samples[0]) * 100))
+        return super().play(samples, rate)
+
+
+class _FakeEngine:
+    """Returns CLIP_SECONDS of audio whose value encodes the sentence number."""
+
+    tokenizer = SimpleNamespace(phonemize=lambda text, lang: text)
+
+    def __init__(self):
+        self.delays = {}
+        self.failing = set()
+        self.finished = []
+        self.calls = 0
+
+    def create(self, text, **kwargs):
+        n = int(re.search(r"\d+", text).group())
+        self.calls += 1
+        time.sleep(self.delays.get(n, 0.0))
+        if n in self.failing:
+            raise ValueError(f"cannot synthesize sentence {n}")
+        self.finished.append(n)
+        return np.full(int(RATE * CLIP_SECONDS), n / 100, dtype=np.float32), RATE
+
+
+@pytest.fixture(scope="module")
+def pipeline():
+    engine = _FakeEngine()
+    output = _RecordingOutput()
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setitem(sys.modules, "sounddevice", SimpleNamespace(OutputStream=_FakeStream))
+        mp.setattr(tts_worker, "_active_engine", lambda model=None: (("fake", "fake.onnx", ()), lambda: engine))
+        mp.setattr(tts_worker, "_output", output)
+        for key, value in {
+            "synth_workers": WORKERS, "lookahead": LOOKAHEAD, "streaming": False, "muted": False,
+            "volume": 1.0, "sentence_gap_ms": 0, "audio_cache_mb": 0, "disk_cache_mb": 0,
+            "synth_isolation": "thread", "speculative": False,
+        }.items():
+            mp.setitem(tts_worker.STATE, key, value)
+        tts_worker.start_tts_worker()
+        yield SimpleNamespace(engine=engine, output=output)
+        _drain()
+    output.close()
+
+
+@pytest.fixture
+def fresh(pipeline):
+    pipeline.engine.delays.clear()
+    pipeline.engine.failing.clear()
+    pipeline.engine.finished.clear()
+    pipeline.engine.calls = 0
+    pipeline.output.played.clear()
+    return pipeline
+
+
+def _speak(*numbers):
+    for n in numbers:
+        tts_worker.TTS_QUEUE.put(f"Sentence {n}.")
+
+
+def _drain(timeout=5.0):
+    """Wait until every stage is idle and the output has played everything."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if (
+            tts_worker.TTS_QUEUE.unfinished_tasks == 0
+            and tts_worker._jobs_outstanding == 0
+            and tts_worker._AUDIO_BUFFER.unfinished_tasks == 0
+            and not tts_worker._playback_active.is_set()
+        ):
+            tts_worker.get_audio_output().wait()
+            return
+        time.sleep(0.01)
+    raise AssertionError("pipeline did not drain")
+
+
+def test_plays_in_queue_order_when_synthesis_finishes_out_of_order(fresh):
+    fresh.engine.delays[1] = 0.3  # the first sentence is the slowest
+    _speak(1, 2, 3)
+    _drain()
+    assert fresh.engine.finished.index(2) < fresh.engine.finished.index(1)
+    assert fresh.output.played == [1, 2, 3]
+
+
+def test_synthesis_blocks_at_the_lookahead_limit(fresh):
+    fresh.output.gate.clear()  # hold playback inside the first clip
+    try:
+        _speak(*range(1, 9))
+        time.sleep(0.3)
+        calls = fresh.engine.calls
+        time.sleep(0.2)
+        assert fresh.engine.calls == calls  # dispatch is waiting, not synthesizing
+        assert calls < 8
+        assert tts_worker._jobs_outstanding == WORKERS + LOOKAHEAD
+        assert not tts_worker.TTS_QUEUE.empty()
+    finally:
+        fresh.output.gate.set()
+    _drain()
+    assert fresh.output.played == list(range(1, 9))
+
+
+def test_mid_response_wait_is_a_stall_not_an_underrun(fresh):
+    stalls = tts_worker.PIPELINE_STATS["playback_stalls"]
+    stall_seconds = tts_worker.PIPELINE_STATS["stall_seconds"]
+    underruns = fresh.output.underruns
+    fresh.engine.delays[2] = 0.3  # the second sentence arrives after the first has played
+    _speak(1, 2)
+    _drain()
+    assert tts_worker.PIPELINE_STATS["playback_stalls"] == stalls + 1
+    assert tts_worker.PIPELINE_STATS["stall_seconds"] - stall_seconds >= 0.15
+    assert fresh.output.underruns == underruns  # playback was waiting, not writing
+
+    _speak(3)  # a new response after idle is not a stall
+    _drain()
+    assert tts_worker.PIPELINE_STATS["playback_stalls"] == stalls + 1
+    assert fresh.output.played == [1, 2, 3]
+
+
+def test_device_underflow_is_reported_in_output_stats(fresh):
+    underruns = fresh.output.underruns
+    _FakeStream.underflow = True
+    try:
+        _speak(1)
+        _drain()
+    finally:
+        _FakeStream.underflow = False
+    assert fresh.output.stats()["underruns"] > underruns
+    assert fresh.output.played == [1]
+
+
+def test_concurrent_failures_are_all_counted_and_reset_by_a_success(fresh, monkeypatch):
+    monkeypatch.setitem(tts_worker.STATE, "synth_workers", 4)
+    fresh.engine.failing.update(range(1, 9))
+    for n in range(1, 9):
+        fresh.engine.delays[n] = 0.05  # keep several workers failing at once
+    _speak(*range(1, 9))
+    _drain()
+    assert tts_worker._consecutive_failures == 8
+    assert fresh.output.played == []
+
+    _speak(9)
+    _drain()
+    assert tts_worker._consecutive_failures == 0
+    assert fresh.output.played == [9]